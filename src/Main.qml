@@ -48,6 +48,41 @@ ApplicationWindow {
             }
         }
 
+        TextField {
+            id: searchField
+            Layout.fillWidth: true
+            placeholderText: "Поиск по всем фразам"
+            onTextChanged: tts.search(text)
+        }
+
+        ListView {
+            id: searchResults
+            Layout.fillWidth: true
+            Layout.preferredHeight: 110
+            visible: searchField.text.length > 0
+            clip: true
+            model: tts.searchModel
+
+            delegate: ItemDelegate {
+                width: searchResults.width
+                text: model.display
+                rightPadding: searchCountLabel.width + 16
+                onClicked: {
+                    inputText.text = model.display
+                    searchField.text = ""
+                }
+
+                Label {
+                    id: searchCountLabel
+                    anchors.right: parent.right
+                    anchors.rightMargin: 8
+                    anchors.verticalCenter: parent.verticalCenter
+                    text: model.sayCount > 0 ? "×" + model.sayCount : ""
+                    opacity: 0.6
+                }
+            }
+        }
+
         ComboBox {
             id: phrasePicker
             Layout.fillWidth: true
@@ -88,6 +123,14 @@ ApplicationWindow {
                         window.selectedFavorite = ""
                     }
                 }
+
+                Button {
+                    text: tts.exporting
+                        ? "Экспорт " + tts.exportProgress + " / " + tts.exportTotal
+                        : "Экспорт избранного"
+                    enabled: tts.exporting || favoritesList.count > 0
+                    onClicked: tts.exporting ? tts.cancelExport() : tts.exportFavorites()
+                }
             }
 
             ListView {
@@ -101,6 +144,16 @@ ApplicationWindow {
                     width: favoritesList.width
                     text: model.display
                     highlighted: ListView.isCurrentItem
+                    rightPadding: sayCountLabel.width + 16
+
+                    Label {
+                        id: sayCountLabel
+                        anchors.right: parent.right
+                        anchors.rightMargin: 8
+                        anchors.verticalCenter: parent.verticalCenter
+                        text: model.sayCount > 0 ? "×" + model.sayCount : ""
+                        opacity: 0.6
+                    }
                     onClicked: {
                         favoritesList.currentIndex = index
                         window.selectedFavorite = model.display
@@ -139,6 +192,279 @@ ApplicationWindow {
                 enabled: categoryPicker.currentText.length > 0
                 onClicked: tts.removeCategory(categoryPicker.currentText)
             }
+
+            Button {
+                text: tts.exporting
+                    ? "Экспорт " + tts.exportProgress + " / " + tts.exportTotal
+                    : "Экспорт в " + tts.audioFormat.toUpperCase()
+                enabled: tts.exporting || categoryPicker.currentText.length > 0
+                onClicked: tts.exporting
+                    ? tts.cancelExport()
+                    : tts.exportCategory(categoryPicker.currentText)
+            }
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+            visible: editModeToggle.checked
+
+            Label {
+                text: "Произношение"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            ComboBox {
+                id: lexiconPicker
+                Layout.preferredWidth: 140
+                model: tts.lexiconModel
+                textRole: "display"
+                editable: false
+                onActivated: {
+                    lexiconTerm.text = currentText
+                    lexiconReplacement.text = tts.lexiconReplacement(currentText)
+                }
+            }
+
+            TextField {
+                id: lexiconTerm
+                Layout.fillWidth: true
+                placeholderText: "Слово"
+            }
+
+            TextField {
+                id: lexiconReplacement
+                Layout.fillWidth: true
+                placeholderText: "Как читать"
+            }
+
+            CheckBox {
+                id: lexiconAbbreviation
+                text: "Аббревиатура"
+            }
+
+            CheckBox {
+                id: lexiconCategoryOnly
+                text: "Только в категории"
+            }
+
+            Button {
+                text: "Сохранить"
+                enabled: lexiconTerm.text.length > 0 && lexiconReplacement.text.length > 0
+                onClicked: tts.addLexiconEntry(
+                    lexiconTerm.text,
+                    lexiconReplacement.text,
+                    lexiconAbbreviation.checked,
+                    lexiconCategoryOnly.checked
+                )
+            }
+
+            Button {
+                text: "Удалить"
+                enabled: lexiconTerm.text.length > 0
+                onClicked: tts.removeLexiconEntry(lexiconTerm.text, lexiconCategoryOnly.checked)
+            }
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+            visible: editModeToggle.checked
+
+            Label {
+                text: "Потоки"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: 0
+                to: tts.maxThreads
+                value: tts.intraOpThreads
+                textFromValue: function(value) { return value === 0 ? "авто" : value.toString() }
+                onValueModified: tts.intraOpThreads = value
+            }
+
+            Label {
+                text: "Inter-op"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: 0
+                to: tts.maxThreads
+                value: tts.interOpThreads
+                textFromValue: function(value) { return value === 0 ? "авто" : value.toString() }
+                onValueModified: tts.interOpThreads = value
+            }
+
+            Label {
+                text: "Экспорт"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: 1
+                to: tts.maxThreads
+                value: tts.exportWorkers
+                onValueModified: tts.exportWorkers = value
+            }
+
+            CheckBox {
+                text: "Прогрев"
+                checked: tts.warmUp
+                onToggled: tts.warmUp = checked
+            }
+
+            CheckBox {
+                text: "int8"
+                checked: tts.quantizeModel
+                onToggled: tts.quantizeModel = checked
+            }
+
+            CheckBox {
+                text: "Замеры"
+                checked: tts.perfTracing
+                onToggled: tts.perfTracing = checked
+            }
+
+            Item {
+                Layout.fillWidth: true
+            }
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+            visible: editModeToggle.checked
+
+            Label {
+                text: "Модели"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            Repeater {
+                model: tts.models
+
+                CheckBox {
+                    // ● — модель в памяти, ! — не загрузилась (текст ошибки в подсказке).
+                    text: modelData.language
+                        + (modelData.loaded ? " ● " + modelData.memoryMb + " МБ" : "")
+                        + (modelData.error ? " !" : "")
+                    checked: modelData.enabled
+                    enabled: modelData.name !== "v3_1_ru"
+                    ToolTip.visible: hovered && modelData.error.length > 0
+                    ToolTip.text: modelData.error
+                    onToggled: tts.setModelEnabled(modelData.name, checked)
+                }
+            }
+
+            Label {
+                text: "Память, МБ"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: 0
+                to: 16384
+                stepSize: 256
+                value: tts.modelBudgetMb
+                textFromValue: function(value) { return value === 0 ? "без предела" : value.toString() }
+                onValueModified: tts.modelBudgetMb = value
+            }
+
+            Item {
+                Layout.fillWidth: true
+            }
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+            visible: editModeToggle.checked
+
+            // Склейка кусков длинного текста при записи в файл, мс.
+            Label {
+                text: "Паузы: предложение"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: 0
+                to: 2000
+                stepSize: 50
+                value: tts.sentencePauseMs
+                onValueModified: tts.sentencePauseMs = value
+            }
+
+            Label {
+                text: "часть"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: 0
+                to: 2000
+                stepSize: 50
+                value: tts.clausePauseMs
+                onValueModified: tts.clausePauseMs = value
+            }
+
+            Label {
+                text: "Перекрытие"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: 0
+                to: 100
+                stepSize: 5
+                value: tts.crossfadeMs
+                onValueModified: tts.crossfadeMs = value
+            }
+
+            Item {
+                Layout.fillWidth: true
+            }
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+            visible: editModeToggle.checked
+
+            Label {
+                text: "Обработка"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            CheckBox {
+                text: "Обрезать тишину"
+                checked: tts.trimSilence
+                onToggled: tts.trimSilence = checked
+            }
+
+            CheckBox {
+                text: "Темп без смены высоты"
+                checked: tts.timeStretch
+                onToggled: tts.timeStretch = checked
+            }
+
+            Label {
+                text: "Громкость, LUFS"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            SpinBox {
+                from: -40
+                to: 0
+                value: tts.loudnessLufs
+                textFromValue: function(value) { return value === 0 ? "как есть" : value.toString() }
+                onValueModified: tts.loudnessLufs = value
+            }
+
+            Item {
+                Layout.fillWidth: true
+            }
         }
 
         RowLayout {
@@ -189,6 +515,32 @@ ApplicationWindow {
             Layout.fillWidth: true
             spacing: 8
 
+            Label {
+                text: "Загрузка модели..."
+                visible: tts.modelLoading
+                color: window.statusColor
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            Label {
+                text: "Ошибка модели: " + tts.modelError
+                visible: tts.modelError.length > 0
+                color: "red"
+                Layout.alignment: Qt.AlignVCenter
+            }
+
+            Label {
+                text: "Ошибка базы: " + tts.storageError + " (скрыть)"
+                visible: tts.storageError.length > 0
+                color: "red"
+                Layout.alignment: Qt.AlignVCenter
+
+                MouseArea {
+                    anchors.fill: parent
+                    onClicked: tts.dismissStorageError()
+                }
+            }
+
             Label {
                 text: "Preparing..."
                 visible: tts.preparing
@@ -209,6 +561,12 @@ ApplicationWindow {
                 Layout.alignment: Qt.AlignVCenter
             }
 
+            Label {
+                text: "Очередь: " + tts.queueDepth
+                visible: tts.queueDepth > 0
+                Layout.alignment: Qt.AlignVCenter
+            }
+
             Item {
                 Layout.fillWidth: true
             }
@@ -219,6 +577,12 @@ ApplicationWindow {
                 onToggled: tts.autosave = checked
             }
 
+            CheckBox {
+                text: "Stream"
+                checked: tts.streaming
+                onToggled: tts.streaming = checked
+            }
+
             CheckBox {
                 id: editModeToggle
                 text: "Edit Mode"
@@ -241,6 +605,36 @@ ApplicationWindow {
                 onClicked: tts.say(inputText.text)
             }
 
+            Button {
+                text: "Стоп"
+                enabled: tts.playing || tts.preparing
+                onClicked: tts.stop()
+            }
+
+            Button {
+                text: "Пропустить"
+                enabled: tts.playing
+                onClicked: tts.skip()
+            }
+
+            ComboBox {
+                id: formatPicker
+                Layout.preferredWidth: 90
+                model: tts.audioFormats
+                currentIndex: tts.audioFormats.indexOf(tts.audioFormat)
+                onActivated: tts.audioFormat = currentText
+            }
+
+            ComboBox {
+                id: sampleRatePicker
+                Layout.preferredWidth: 110
+                model: tts.audioSampleRates.map(function(rate) {
+                    return rate === 0 ? "Исходная" : rate / 1000 + " кГц"
+                })
+                currentIndex: tts.audioSampleRates.indexOf(tts.audioSampleRate)
+                onActivated: tts.audioSampleRate = tts.audioSampleRates[index]
+            }
+
             Button {
                 text: "В файл"
                 onClicked: tts.saveAudio(inputText.text)
@@ -268,6 +662,65 @@ ApplicationWindow {
         }
     }
 
+    // Панель замеров: p50/p95/p99 по участкам, пока включены «Замеры».
+    Rectangle {
+        anchors.top: parent.top
+        anchors.right: parent.right
+        anchors.margins: 8
+        z: 10
+        visible: tts.perfTracing
+        width: perfColumn.implicitWidth + 16
+        height: perfColumn.implicitHeight + 16
+        radius: 4
+        color: "#e0202020"
+
+        ColumnLayout {
+            id: perfColumn
+            anchors.centerIn: parent
+            spacing: 2
+
+            Label {
+                color: "white"
+                font.family: "monospace"
+                text: "участок         p50     p95     p99  мс"
+            }
+
+            Repeater {
+                model: tts.perfStats
+
+                Label {
+                    color: "white"
+                    font.family: "monospace"
+                    text: modelData.name.padEnd(12)
+                        + modelData.p50.toFixed(1).padStart(8)
+                        + modelData.p95.toFixed(1).padStart(8)
+                        + modelData.p99.toFixed(1).padStart(8)
+                        + "  ×" + modelData.count
+                }
+            }
+
+            RowLayout {
+                spacing: 4
+
+                Button {
+                    text: "В файл"
+                    onClicked: perfDumpLabel.text = tts.dumpPerfStats()
+                }
+
+                Button {
+                    text: "Сбросить"
+                    onClicked: tts.resetPerfStats()
+                }
+            }
+
+            Label {
+                id: perfDumpLabel
+                color: "white"
+                visible: text.length > 0
+            }
+        }
+    }
+
     Dialog {
         id: addCategoryDialog
         title: "Новая категория"
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+class AudioCache:
+    _MAGIC = b"TLKA"
+    _HEADER = struct.Struct("<4sI")
+    _SUFFIX = ".pcm"
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(
+        text: str,
+        speaker: str,
+        speed: float,
+        sample_rate: int,
+        variant: str = "",
+        model: str = "",
+    ) -> str:
+        fields = (text, speaker, repr(float(speed)), str(sample_rate))
+        # Вариант (например, другие паузы) добавляется, не меняя старые ключи.
+        if variant:
+            fields += (variant,)
+        # Модель (пакет, int8) — отдельным полем с меткой, чтобы не совпасть
+        # с вариантом.
+        if model:
+            fields += ("model:" + model,)
+        payload = "\x1f".join(fields)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple[np.ndarray, int] | None:
+        with self._lock:
+            entries = self._load_index()
+            if key not in entries:
+                self._misses += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as file:
+                    magic, sample_rate = self._HEADER.unpack(
+                        file.read(self._HEADER.size)
+                    )
+                    if magic != self._MAGIC:
+                        raise ValueError("bad cache entry header")
+                    audio = np.fromfile(file, dtype="<f4")
+                os.utime(path)
+            except (OSError, ValueError, struct.error):
+                self._drop(key)
+                self._misses += 1
+                return None
+            entries.move_to_end(key)
+            self._hits += 1
+            return audio, sample_rate
+
+    def put(self, key: str, audio: np.ndarray, sample_rate: int) -> None:
+        data = np.ascontiguousarray(audio, dtype="<f4")
+        size = self._HEADER.size + data.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            entries = self._load_index()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as file:
+                file.write(self._HEADER.pack(self._MAGIC, sample_rate))
+                data.tofile(file)
+            os.replace(tmp_path, path)
+            self._total_bytes -= entries.pop(key, 0)
+            entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._load_index()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._drop(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries = self._load_index()
+            return {
+                "entries": len(entries),
+                "bytes": self._total_bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self._SUFFIX}"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._entries is not None:
+            return self._entries
+        found: list[tuple[float, str, int]] = []
+        if self.cache_dir.is_dir():
+            for path in self.cache_dir.glob(f"*{self._SUFFIX}"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, path.stem, stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._total_bytes = sum(size for _, _, size in found)
+        self._evict()
+        return self._entries
+
+    def _evict(self) -> None:
+        assert self._entries is not None
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._drop(key)
+            self._evictions += 1
+
+    def _drop(self, key: str) -> None:
+        assert self._entries is not None
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from audio_io import open_wav, pcm16_view
+from resampler import Resampler
+
+try:
+    import soundfile
+except (ImportError, OSError):
+    # Без soundfile/libsndfile остаётся только WAV.
+    soundfile = None
+
+# 0 — частота модели без пересчёта; 16 и 8 кГц — для телефонии.
+SAMPLE_RATES = (0, 24000, 16000, 8000)
+
+
+class OutputFormat:
+    def __init__(
+        self,
+        name: str,
+        suffix: str,
+        container: str | None = None,
+        subtype: str | None = None,
+        rates: tuple[int, ...] = (),
+    ) -> None:
+        self.name = name
+        self.suffix = suffix
+        # container None — WAV через модуль wave, иначе формат libsndfile.
+        self.container = container
+        self.subtype = subtype
+        self.rates = rates
+
+    def available(self) -> bool:
+        if self.container is None:
+            return True
+        if soundfile is None:
+            return False
+        return (
+            self.container in soundfile.available_formats()
+            and self.subtype in soundfile.available_subtypes(self.container)
+        )
+
+    def output_rate(self, source_rate: int, sample_rate: int = 0) -> int:
+        rate = sample_rate or source_rate
+        if self.rates and rate not in self.rates:
+            # Opus умеет только фиксированный набор частот: берём ближайшую не ниже.
+            rate = min((r for r in self.rates if r >= rate), default=max(self.rates))
+        return rate
+
+    def file_suffix(self, sample_rate: int = 0) -> str:
+        # Разные частоты — разные файлы: экспорт не пропустит файл другой частоты.
+        if sample_rate:
+            return f"_{sample_rate // 1000}k{self.suffix}"
+        return self.suffix
+
+    def open(self, path: Path, source_rate: int, sample_rate: int = 0) -> AudioWriter:
+        return AudioWriter(self, path, source_rate, self.output_rate(source_rate, sample_rate))
+
+
+FORMATS = {
+    fmt.name: fmt
+    for fmt in (
+        OutputFormat("wav", ".wav"),
+        OutputFormat("flac", ".flac", "FLAC", "PCM_16"),
+        OutputFormat("opus", ".opus", "OGG", "OPUS", (8000, 12000, 16000, 24000, 48000)),
+    )
+}
+
+
+def available_formats() -> list[str]:
+    return [name for name, fmt in FORMATS.items() if fmt.available()]
+
+
+class AudioWriter:
+    # Пишет звук кусками по мере синтеза: в памяти только текущий кусок.
+    def __init__(
+        self, fmt: OutputFormat, path: Path, source_rate: int, sample_rate: int
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.sample_rate = sample_rate
+        self._resampler = (
+            Resampler(source_rate, sample_rate) if source_rate != sample_rate else None
+        )
+        self._wave = None
+        self._sound = None
+        if fmt.container is None:
+            self._wave = open_wav(path, sample_rate)
+        else:
+            if not fmt.available():
+                raise RuntimeError(f"{fmt.name} encoder is not available")
+            self._sound = soundfile.SoundFile(
+                str(path),
+                "w",
+                samplerate=sample_rate,
+                channels=1,
+                format=fmt.container,
+                subtype=fmt.subtype,
+            )
+
+    def __enter__(self) -> AudioWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, audio: np.ndarray) -> None:
+        if self._resampler is not None:
+            audio = self._resampler.process(audio)
+        self._write(audio)
+
+    def close(self) -> None:
+        if self._resampler is not None:
+            self._write(self._resampler.flush())
+            self._resampler = None
+        if self._wave is not None:
+            self._wave.close()
+            self._wave = None
+        if self._sound is not None:
+            self._sound.close()
+            self._sound = None
+
+    def _write(self, audio: np.ndarray) -> None:
+        if not audio.size:
+            return
+        if self._wave is not None:
+            self._wave.writeframes(pcm16_view(audio))
+        else:
+            self._sound.write(np.clip(audio, -1.0, 1.0))
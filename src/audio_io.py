@@ -0,0 +1,66 @@
+import hashlib
+import io
+import re
+import threading
+import wave
+from pathlib import Path
+
+import numpy as np
+
+_UNSAFE_RE = re.compile(r"[^\w\-]+")
+_scratch = threading.local()
+
+
+def _buffer(name: str, size: int, dtype: str) -> np.ndarray:
+    # Буферы на поток растут до самой длинной фразы и дальше переиспользуются.
+    buffer = getattr(_scratch, name, None)
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(size, dtype=dtype)
+        setattr(_scratch, name, buffer)
+    return buffer[:size]
+
+
+def pcm16_view(audio: np.ndarray) -> np.ndarray:
+    # Вид на буфер потока: действителен до следующего вызова в этом же потоке.
+    scaled = _buffer("scaled", audio.size, "<f4")
+    np.multiply(audio.reshape(-1), 32767, out=scaled)
+    np.clip(scaled, -32767, 32767, out=scaled)
+    pcm = _buffer("pcm", audio.size, "<i2")
+    np.copyto(pcm, scaled, casting="unsafe")
+    return pcm
+
+
+def to_pcm16(audio: np.ndarray) -> bytes:
+    return pcm16_view(audio).tobytes()
+
+
+def open_wav(path: Path, sample_rate: int) -> wave.Wave_write:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wave_file = wave.open(str(path), "wb")
+    wave_file.setnchannels(1)
+    wave_file.setsampwidth(2)
+    wave_file.setframerate(sample_rate)
+    return wave_file
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wave_file:
+        wave_file.setnchannels(1)
+        wave_file.setsampwidth(2)
+        wave_file.setframerate(sample_rate)
+        wave_file.writeframes(pcm16_view(audio))
+    return buffer.getvalue()
+
+
+def safe_name(text: str, max_length: int = 40) -> str:
+    name = _UNSAFE_RE.sub("_", text.strip()).strip("_")
+    return name[:max_length] or "phrase"
+
+
+def phrase_file_name(text: str, speaker: str, speed: float, suffix: str = ".wav") -> str:
+    # Имя не зависит от времени: повторный экспорт попадает в тот же файл.
+    digest = hashlib.sha1(
+        "\x1f".join((text, speaker, repr(float(speed)))).encode("utf-8")
+    ).hexdigest()[:10]
+    return f"{safe_name(text)}_{digest}{suffix}"
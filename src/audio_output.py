@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+# callback(out, delay): заполнить out (mono float32); delay — сколько секунд
+# пройдёт, пока первый отсчёт out дойдёт до динамика.
+Callback = Callable[[np.ndarray, float], None]
+
+
+class SoundDeviceOutput:
+    # Один поток PortAudio на всё время работы: открытие устройства не
+    # повторяется на каждую фразу, звук тянет callback.
+    def __init__(self) -> None:
+        self._stream = None
+
+    def start(self, callback: Callback) -> int:
+        import sounddevice as sd
+
+        device = sd.query_devices(kind="output")
+        sample_rate = int(device["default_samplerate"])
+
+        def pull(outdata, frames, timing, status) -> None:
+            delay = timing.outputBufferDacTime - timing.currentTime
+            callback(outdata[:, 0], delay if delay > 0 else self._stream.latency)
+
+        self._stream = sd.OutputStream(
+            samplerate=sample_rate,
+            channels=1,
+            dtype="float32",
+            latency="low",
+            callback=pull,
+        )
+        self._stream.start()
+        return sample_rate
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class NullOutput:
+    # Без звуковой карты: поток забирает звук блоками в темпе реального
+    # времени (или быстрее при speed > 1). Для серверов, CI и замеров задержки.
+    def __init__(
+        self, sample_rate: int = 48000, block_seconds: float = 0.01, speed: float = 1.0
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.block = max(1, int(sample_rate * block_seconds))
+        self.speed = speed
+        self.frames_played = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, callback: Callback) -> int:
+        self._thread = threading.Thread(target=self._run, args=(callback,), daemon=True)
+        self._thread.start()
+        return self.sample_rate
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, callback: Callback) -> None:
+        out = np.zeros(self.block, dtype=np.float32)
+        interval = self.block / self.sample_rate / self.speed
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            callback(out, 0.0)
+            self.frames_played += self.block
+            deadline += interval
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def default_output() -> SoundDeviceOutput | NullOutput:
+    if os.environ.get("TALKER_AUDIO") == "null":
+        return NullOutput()
+    return SoundDeviceOutput()
+
+
+def start_output(output, callback: Callback) -> tuple[object, int]:
+    # Нет устройства — играем «в никуда», чтобы синтез не встал на backpressure.
+    try:
+        return output, output.start(callback)
+    except Exception as exc:
+        print(f"audio output unavailable, using null output: {exc}", file=sys.stderr)
+        output = NullOutput()
+        return output, output.start(callback)
@@ -0,0 +1,257 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from PySide6 import QtCore
+
+from audio_output import default_output, start_output
+from resampler import Resampler
+from ring_buffer import RingBuffer
+from tracing import tracer
+
+
+class AudioPlayer(QtCore.QObject):
+    # id фразы и perf_counter-время, когда её первый отсчёт дошёл до динамика.
+    started = QtCore.Signal(int, float)
+    finished = QtCore.Signal(int)
+
+    BUFFER_ITEMS = 8
+    RING_SECONDS = 4.0
+    # Как часто поток _dispatch сверяет позицию чтения с границами фраз.
+    POLL_SECONDS = 0.005
+    # Сколько последних вызовов callback помнить: какие отсчёты когда зазвучали.
+    CLOCK_HISTORY = 64
+
+    def __init__(self, output=None) -> None:
+        super().__init__()
+        self._buffer: queue.Queue = queue.Queue(maxsize=self.BUFFER_ITEMS)
+        self._ids = itertools.count(1)
+        self._lock = threading.Condition()
+        self._cancelled: set[int] = set()
+        self._last_finished = 0
+        self._current = 0
+        # Фразы в порядке следования в кольце: [id, начало, конец или None, начата ли,
+        # когда первый кусок лёг в кольцо].
+        self._segments: deque[list] = deque()
+        self._resamplers: dict[int, Resampler] = {}
+        self._ring: RingBuffer | None = None
+        # Общее с callback состояние — целые, которые пишутся одним
+        # присваиванием: до какой позиции пропустить отменённое и где началась
+        # ещё не закрытая фраза (-1 — такой нет). Плюс заранее выделенная
+        # история вызовов: прочитанный отрезок кольца и когда он зазвучит.
+        self._skip_to = 0
+        self._open_start = -1
+        self._clock_start = np.zeros(self.CLOCK_HISTORY, dtype=np.int64)
+        self._clock_end = np.zeros(self.CLOCK_HISTORY, dtype=np.int64)
+        self._clock_time = np.zeros(self.CLOCK_HISTORY, dtype=np.float64)
+        self._clock_count = 0
+        self._wake = threading.Event()
+        self._stopping = False
+        self.sample_rate = 0
+        self.underrun_frames = 0
+        self._output = output or default_output()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    @property
+    def current(self) -> int:
+        return self._current
+
+    def begin(self) -> int:
+        return next(self._ids)
+
+    def feed(self, utterance_id: int, audio: np.ndarray, sample_rate: int) -> bool:
+        # Блокирует поток синтеза, пока в буфере нет места (backpressure).
+        while not self.is_cancelled(utterance_id):
+            try:
+                self._buffer.put((utterance_id, audio, sample_rate), timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def end(self, utterance_id: int) -> None:
+        self._buffer.put((utterance_id, None, 0))
+
+    def cancel(self, utterance_id: int) -> None:
+        # Уже отданный в кольцо звук выбрасывается на следующем callback.
+        with self._lock:
+            if utterance_id > self._last_finished:
+                self._cancelled.add(utterance_id)
+                if self._segments and self._segments[-1][0] == utterance_id:
+                    self._open_start = -1
+                self._skip_cancelled()
+            self._lock.notify_all()
+        self._wake.set()
+
+    def skip(self) -> None:
+        if self._current:
+            self.cancel(self._current)
+
+    def is_cancelled(self, utterance_id: int) -> bool:
+        with self._lock:
+            return utterance_id in self._cancelled
+
+    def shutdown(self) -> None:
+        self._buffer.put(None)
+        self._thread.join()
+        self._stopping = True
+        self._wake.set()
+        self._dispatcher.join()
+
+    def _run(self) -> None:
+        with tracer.span("device_open"):
+            self._output, self.sample_rate = start_output(self._output, self._pull)
+        self._ring = RingBuffer(int(self.sample_rate * self.RING_SECONDS))
+        try:
+            while True:
+                item = self._buffer.get()
+                if item is None:
+                    break
+                utterance_id, audio, sample_rate = item
+                if audio is None:
+                    self._close_segment(utterance_id)
+                elif not self.is_cancelled(utterance_id):
+                    resampler = self._resamplers.get(utterance_id)
+                    if resampler is None or resampler.source_rate != sample_rate:
+                        resampler = Resampler(sample_rate, self.sample_rate)
+                        self._resamplers[utterance_id] = resampler
+                    self._push(utterance_id, resampler.process(audio))
+        finally:
+            self._output.close()
+
+    def _push(self, utterance_id: int, samples: np.ndarray) -> None:
+        with self._lock:
+            if not self._segments or self._segments[-1][0] != utterance_id:
+                self._open_segment(utterance_id)
+            while len(samples) and utterance_id not in self._cancelled:
+                written = self._ring.write(samples)
+                samples = samples[written:]
+                if len(samples):
+                    # Callback никого не будит: места в кольце ждём опросом.
+                    self._lock.wait(self.POLL_SECONDS)
+
+    def _open_segment(self, utterance_id: int) -> None:
+        self._segments.append(
+            [utterance_id, self._ring.write_pos, None, False, time.perf_counter()]
+        )
+        self._open_start = self._ring.write_pos
+        self._wake.set()
+
+    def _close_segment(self, utterance_id: int) -> None:
+        resampler = self._resamplers.pop(utterance_id, None)
+        if resampler is not None and not self.is_cancelled(utterance_id):
+            self._push(utterance_id, resampler.flush())
+        with self._lock:
+            if not self._segments or self._segments[-1][0] != utterance_id:
+                # Фраза без звука: пустой отрезок, чтобы finished пришёл по порядку.
+                self._open_segment(utterance_id)
+            self._segments[-1][2] = self._ring.write_pos
+            self._open_start = -1
+            self._skip_cancelled()
+        self._wake.set()
+
+    def _pull(self, out: np.ndarray, delay: float) -> None:
+        # Callback звукового потока: без замков, очередей и ожиданий — только
+        # копия из кольца и запись в заранее выделенные массивы. Кольцо — один
+        # писатель и один читатель, каждый двигает только свою позицию. Python
+        # всё же создаёт мелкие объекты (float времени, срезы), но не ждёт
+        # других потоков.
+        now = time.perf_counter()
+        ring = self._ring
+        if ring is None:
+            # Кольцо ещё не создано (поток только открылся) — тишина.
+            out[:] = 0.0
+            return
+        if self._skip_to > ring.read_pos:
+            ring.skip_to(self._skip_to)
+        position = ring.read_pos
+        filled = ring.read_into(out, len(out))
+        index = self._clock_count % self.CLOCK_HISTORY
+        self._clock_start[index] = position
+        self._clock_end[index] = ring.read_pos
+        self._clock_time[index] = now + delay
+        self._clock_count += 1
+        if filled < len(out):
+            # Начатая фраза ещё не закрыта, а следующий кусок не готов — разрыв.
+            if 0 <= self._open_start < ring.read_pos:
+                self.underrun_frames += len(out) - filled
+            out[filled:] = 0.0
+
+    def _skip_cancelled(self) -> None:
+        # Под self._lock: отменённые фразы в голове очереди callback пропустит.
+        for utterance_id, _, end, _, _ in self._segments:
+            if utterance_id not in self._cancelled:
+                return
+            self._skip_to = max(self._skip_to, self._ring.write_pos if end is None else end)
+            if end is None:
+                return
+
+    def _dispatch(self) -> None:
+        # Сигналы Qt — из отдельного потока, а не из callback звуковой карты:
+        # начало и конец фраз видны по позиции чтения кольца.
+        while not self._stopping:
+            with self._lock:
+                idle = not self._segments
+            self._wake.wait(None if idle else self.POLL_SECONDS)
+            self._wake.clear()
+            for name, utterance_id, played_at, queued_at in self._collect_events():
+                if name == "started":
+                    # Сколько звук ждал в кольце до динамика, с учётом задержки устройства.
+                    tracer.record("playback", (played_at - queued_at) * 1000)
+                    self._current = utterance_id
+                    self.started.emit(utterance_id, played_at)
+                else:
+                    self._finish(utterance_id)
+
+    def _collect_events(self) -> list[tuple[str, int, float, float]]:
+        ring = self._ring
+        if ring is None:
+            return []
+        events = []
+        with self._lock:
+            read_pos = ring.read_pos
+            segments = self._segments
+            while segments:
+                segment = segments[0]
+                utterance_id, start, end, playing, queued_at = segment
+                if utterance_id in self._cancelled:
+                    self._skip_cancelled()
+                    if end is None:
+                        break
+                    segments.popleft()
+                    events.append(("finished", utterance_id, 0.0, 0.0))
+                    continue
+                if not playing and read_pos > start:
+                    segment[3] = True
+                    played_at = self._played_at(start)
+                    events.append(("started", utterance_id, played_at, queued_at))
+                if end is None or read_pos < end:
+                    break
+                segments.popleft()
+                events.append(("finished", utterance_id, 0.0, 0.0))
+        return events
+
+    def _played_at(self, position: int) -> float:
+        # Ищем вызов callback, который прочитал этот отсчёт. Слот, который
+        # callback может писать прямо сейчас, не смотрим.
+        count = self._clock_count
+        for back in range(1, min(count, self.CLOCK_HISTORY - 1) + 1):
+            index = (count - back) % self.CLOCK_HISTORY
+            start = int(self._clock_start[index])
+            if start <= position < int(self._clock_end[index]):
+                return float(self._clock_time[index]) + (position - start) / self.sample_rate
+        return time.perf_counter()
+
+    def _finish(self, utterance_id: int) -> None:
+        with self._lock:
+            self._cancelled.discard(utterance_id)
+            self._last_finished = max(self._last_finished, utterance_id)
+        if self._current == utterance_id:
+            self._current = 0
+        self.finished.emit(utterance_id)
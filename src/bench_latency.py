@@ -0,0 +1,85 @@
+import argparse
+import statistics
+import time
+
+from PySide6 import QtCore
+
+from audio_output import NullOutput
+from audio_player import AudioPlayer
+from fake_model import FakeTtsModel
+from synthesis import SynthesisEngine
+from tts_task import TtsTask
+
+
+def wait_for(app: QtCore.QCoreApplication, condition, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Задержка от запроса до звука, разрывы и остановка без звуковой карты."
+    )
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--chars", type=int, default=40)
+    parser.add_argument(
+        "--speed", type=float, default=4.0, help="во сколько раз быстрее реального времени"
+    )
+    args = parser.parse_args(argv)
+    app = QtCore.QCoreApplication([])
+    output = NullOutput(speed=args.speed)
+    player = AudioPlayer(output)
+    engine = SynthesisEngine(FakeTtsModel(samples_per_char=1200))
+    pool = QtCore.QThreadPool()
+    # Как у интерактивной очереди: одна фраза синтезируется за раз.
+    pool.setMaxThreadCount(1)
+    requested: dict[int, float] = {}
+    played: dict[int, float] = {}
+    finished: dict[int, float] = {}
+    player.started.connect(lambda utterance_id, at: played.__setitem__(utterance_id, at))
+    player.finished.connect(
+        lambda utterance_id: finished.__setitem__(utterance_id, time.perf_counter())
+    )
+    wait_for(app, lambda: player.sample_rate)
+
+    # Одиночные фразы на простаивающем потоке: чистая задержка до первого звука.
+    for i in range(args.count):
+        task = TtsTask(engine, f"{i} " + "а" * args.chars, "aidar", 1.0, player, streaming=True)
+        requested[task.utterance_id] = task.requested_at
+        pool.start(task)
+        wait_for(app, lambda: task.utterance_id in finished)
+    latencies = [(played[u] - requested[u]) * 1000 for u in requested if u in played]
+
+    # Очередь подряд: между фразами не должно быть провалов.
+    underruns = player.underrun_frames
+    tasks = [
+        TtsTask(engine, f"{i} " + "а" * args.chars, "aidar", 1.0, player, streaming=True)
+        for i in range(args.count)
+    ]
+    for task in tasks:
+        pool.start(task)
+    wait_for(app, lambda: all(task.utterance_id in finished for task in tasks))
+    gap_ms = (player.underrun_frames - underruns) / player.sample_rate * 1000
+
+    # Остановка посреди фразы: сколько ещё звучит после cancel.
+    task = TtsTask(engine, "а" * args.chars * 4, "aidar", 1.0, player)
+    pool.start(task)
+    wait_for(app, lambda: task.utterance_id in played)
+    cancelled_at = time.perf_counter()
+    task.cancel()
+    wait_for(app, lambda: task.utterance_id in finished)
+    stop_ms = (finished[task.utterance_id] - cancelled_at) * 1000
+
+    player.shutdown()
+    print(
+        f"first audio  p50 {statistics.median(latencies):7.2f} ms  max {max(latencies):7.2f} ms\n"
+        f"queued gaps  {gap_ms:7.2f} ms total over {args.count} utterances\n"
+        f"stop         {stop_ms:7.2f} ms to silence"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+import argparse
+import random
+import time
+
+from latin_transliterator import LatinTransliterator
+from number_normalizer import NumberNormalizer
+from text_normalizer import TextNormalizer
+
+_CYRILLIC_WORDS = (
+    "перевод", "карта", "счёт", "банк", "оплата", "кредит", "вклад",
+    "справка", "выписка", "платёж", "остаток", "договор", "процент",
+)
+_LATIN_WORDS = (
+    "Sberbank", "Visa", "MasterCard", "PIN", "SMS", "email", "online",
+    "shchedro", "Zhukov", "Yakutsk", "Khabarovsk", "Tsvetaeva",
+)
+
+
+def make_corpus(size: int, unique: int, seed: int = 0) -> list[str]:
+    # Смешанные фразы: кириллица, латиница и числа разной длины.
+    rng = random.Random(seed)
+    phrases = []
+    for _ in range(unique):
+        words = []
+        for _ in range(rng.randint(4, 14)):
+            kind = rng.random()
+            if kind < 0.6:
+                words.append(rng.choice(_CYRILLIC_WORDS))
+            elif kind < 0.85:
+                words.append(rng.choice(_LATIN_WORDS))
+            else:
+                words.append(str(rng.randint(0, 10 ** rng.randint(1, 9))))
+        phrases.append(" ".join(words) + rng.choice((".", "!", "?", ",")))
+    return [rng.choice(phrases) for _ in range(size)]
+
+
+def make_lexicon(size: int, seed: int = 1) -> list[dict]:
+    # Термины, которых нет в корпусе: меряем цену словаря без совпадений.
+    rng = random.Random(seed)
+    letters = "bdfgjkqvwxz"
+    return [
+        {
+            "term": "".join(rng.choice(letters) for _ in range(rng.randint(3, 8))).title(),
+            "replacement": "слово",
+            "abbreviation": rng.random() < 0.3,
+            "category_id": None,
+        }
+        for _ in range(size)
+    ]
+
+
+def run(name: str, normalize, corpus: list[str]) -> float:
+    started = time.perf_counter()
+    for text in corpus:
+        normalize(text)
+    elapsed = time.perf_counter() - started
+    chars = sum(len(text) for text in corpus)
+    print(
+        f"{name:<22} {elapsed * 1000:9.1f} ms"
+        f" {len(corpus) / elapsed:12.0f} phrases/s"
+        f" {chars / elapsed / 1e6:8.2f} Mchar/s"
+    )
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Скорость нормализации текста.")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--unique", type=int, default=5_000)
+    parser.add_argument("--lexicon", type=int, default=500)
+    args = parser.parse_args(argv)
+    corpus = make_corpus(args.size, args.unique)
+
+    latin = LatinTransliterator()
+    numbers = NumberNormalizer()
+    baseline = run("two passes", lambda text: numbers.normalize(latin.normalize(text)), corpus)
+    cold = run("single pass, no cache", TextNormalizer(cache_size=0).normalize, corpus)
+    with_lexicon = TextNormalizer(cache_size=0)
+    with_lexicon.set_lexicon(make_lexicon(args.lexicon))
+    run(f"lexicon {args.lexicon}, no cache", with_lexicon.normalize, corpus)
+    # Все фразы разные: работает только кэш слов и чисел.
+    distinct = list(dict.fromkeys(corpus))
+    run("single pass, distinct", TextNormalizer().normalize, distinct)
+    memo = TextNormalizer()
+    cached = run("single pass, LRU", memo.normalize, corpus)
+    info = memo.normalize.cache_info()
+    print(
+        f"speedup: {baseline / cold:.2f}x cold, {baseline / cached:.2f}x cached"
+        f" (hits {info.hits}, misses {info.misses})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
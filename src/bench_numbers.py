@@ -0,0 +1,169 @@
+import argparse
+import sys
+import time
+
+from number_normalizer import NumberNormalizer
+from text_normalizer import TextNormalizer
+
+# Эталонные чтения: вход -> ожидаемый текст.
+CORPUS = (
+    ("0", "ноль"),
+    ("7", "семь"),
+    ("11", "одиннадцать"),
+    ("21", "двадцать один"),
+    ("101", "сто один"),
+    ("1000", "одна тысяча"),
+    ("2024", "две тысячи двадцать четыре"),
+    ("1000000", "один миллион"),
+    ("1000000000", "один миллиард"),
+    ("007", "ноль ноль семь"),
+    # Десятичные дроби
+    ("12.5", "двенадцать целых пять десятых"),
+    ("3,75", "три целых семьдесят пять сотых"),
+    ("0,5", "ноль целых пять десятых"),
+    ("1,05", "одна целая пять сотых"),
+    ("2,001", "две целых одна тысячная"),
+    ("3,14159", "три запятая четырнадцать тысяч сто пятьдесят девять"),
+    ("1.2.3", "один.два.три"),
+    # Время
+    ("14:30", "четырнадцать часов тридцать минут"),
+    ("9:05", "девять часов пять минут"),
+    ("00:00", "ноль часов"),
+    ("21:01", "двадцать один час одна минута"),
+    ("23:59", "двадцать три часа пятьдесят девять минут"),
+    ("25:61", "двадцать пять:шестьдесят один"),
+    # Даты
+    ("01.02.2026", "первое февраля две тысячи двадцать шестого года"),
+    ("31.12.1999", "тридцать первое декабря тысяча девятьсот девяносто девятого года"),
+    ("1.5.2000", "первое мая двухтысячного года"),
+    ("32.01.2026", "тридцать два.ноль один.две тысячи двадцать шесть"),
+    ("2026-02-01", "первое февраля две тысячи двадцать шестого года"),
+    ("от 01.02.2026", "от первого февраля две тысячи двадцать шестого года"),
+    ("к 2026-02-01", "к первому февраля две тысячи двадцать шестого года"),
+    ("о 03.03.2026", "о третьем марта две тысячи двадцать шестого года"),
+    ("перед 2.5.2026", "перед вторым мая две тысячи двадцать шестого года"),
+    ("на 01.02.2026", "на первое февраля две тысячи двадцать шестого года"),
+    ("по 31.12.1999", "по тридцать первое декабря тысяча девятьсот девяносто девятого года"),
+    ("в 2026 году", "в две тысячи двадцать шестом году"),
+    ("2026 года", "две тысячи двадцать шестого года"),
+    # Телефоны
+    (
+        "+7 999 123-45-67",
+        "плюс семь, девятьсот девяносто девять, сто двадцать три, сорок пять, шестьдесят семь",
+    ),
+    (
+        "+7 (495) 123-45-67",
+        "плюс семь, четыреста девяносто пять, сто двадцать три, сорок пять, шестьдесят семь",
+    ),
+    (
+        "8 800 555-35-35",
+        "восемь, восемьсот, пятьсот пятьдесят пять, тридцать пять, тридцать пять",
+    ),
+    (
+        "89991234567",
+        "восемь, девятьсот девяносто девять, сто двадцать три, сорок пять, шестьдесят семь",
+    ),
+    # Деньги
+    ("1 500 ₽", "одна тысяча пятьсот рублей"),
+    ("1 ₽", "один рубль"),
+    ("2 ₽", "два рубля"),
+    ("5 ₽", "пять рублей"),
+    ("21 ₽", "двадцать один рубль"),
+    ("12,50 ₽", "двенадцать рублей пятьдесят копеек"),
+    ("0,99 ₽", "ноль рублей девяносто девять копеек"),
+    ("1 000 000 ₽", "один миллион рублей"),
+    ("100 руб.", "сто рублей"),
+    ("100 р.", "сто рублей"),
+    ("50 коп.", "пятьдесят копеек"),
+    ("1 коп.", "одна копейка"),
+    ("$1", "один доллар"),
+    ("$3.99", "три доллара девяносто девять центов"),
+    ("$1,000.50", "одна тысяча долларов пятьдесят центов"),
+    ("$2,500,000", "два миллиона пятьсот тысяч долларов"),
+    ("1,000 USD", "одна тысяча долларов"),
+    ("5 USD", "пять долларов"),
+    ("1 €", "одно евро"),
+    ("250 000 €", "двести пятьдесят тысяч евро"),
+    ("3,5 EUR", "три евро пятьдесят центов"),
+    ("1 500 рублей", "одна тысяча пятьсот рублей"),
+    # Порядковые
+    ("1-й", "первый"),
+    ("2-я", "вторая"),
+    ("3-е", "третье"),
+    ("3-ей", "третьей"),
+    ("5-го", "пятого"),
+    ("10-му", "десятому"),
+    ("21-ым", "двадцать первым"),
+    ("1-ую", "первую"),
+    ("40-х", "сороковых"),
+    ("90-ые", "девяностые"),
+    ("100-й", "сотый"),
+    ("1000-й", "тысячный"),
+    ("2000-го", "двухтысячного"),
+    ("1990-х", "тысяча девятьсот девяностых"),
+    # Согласование с существительным
+    ("1 карта", "одна карта"),
+    ("1 карту", "одну карту"),
+    ("2 карты", "две карты"),
+    ("21 минута", "двадцать одна минута"),
+    ("1 окно", "одно окно"),
+    ("1 сообщение", "одно сообщение"),
+    ("1 рубль", "один рубль"),
+    ("1 пользователь", "один пользователь"),
+    ("21 получатель", "двадцать один получатель"),
+    ("1 полис", "один полис"),
+    ("1 пол", "один пол"),
+    ("1 поле", "одно поле"),
+    ("1 картридж", "один картридж"),
+    ("2 недели", "две недели"),
+    ("1 операцию", "одну операцию"),
+    # Целые фразы
+    (
+        "Перевод 1 500 ₽ на Visa до 14:30",
+        "Перевод одна тысяча пятьсот рублей на виса до четырнадцать часов тридцать минут",
+    ),
+    (
+        "Платёж от 01.02.2026 на 3,5 EUR",
+        "Платёж от первого февраля две тысячи двадцать шестого года на три евро пятьдесят центов",
+    ),
+)
+
+
+def check(normalizer: TextNormalizer) -> int:
+    failures = 0
+    for text, expected in CORPUS:
+        actual = normalizer.normalize(text)
+        if actual != expected:
+            failures += 1
+            print(f"FAIL {text!r}\n  expected {expected!r}\n  actual   {actual!r}")
+    print(f"{len(CORPUS) - failures}/{len(CORPUS)} cases passed")
+    return failures
+
+
+def timing(normalizer: NumberNormalizer, repeat: int) -> None:
+    # Время на символ не должно расти с длиной входа.
+    sample = " ".join(text for text, _ in CORPUS) + " "
+    for scale in (1, 4, 16):
+        text = sample * (repeat * scale)
+        started = time.perf_counter()
+        normalizer.normalize(text)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{len(text):>10} chars {elapsed * 1000:9.1f} ms"
+            f" {elapsed / len(text) * 1e9:7.1f} ns/char"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Проверка и скорость чтения чисел, дат, сумм и телефонов."
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+    failures = check(TextNormalizer(cache_size=0))
+    timing(NumberNormalizer(), args.repeat)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import argparse
+import time
+
+import numpy as np
+
+from postprocess import PostConfig, normalize_loudness, time_stretch, trim_silence
+from resampler import resample
+from synthesis import SAMPLE_RATE
+
+
+def speech_like(seconds: float, seed: int = 0) -> np.ndarray:
+    # Похоже на речь по нагрузке: гласные с плавающим тоном, шумные согласные,
+    # паузы между словами и тишина по краям, как у модели.
+    rng = np.random.default_rng(seed)
+    size = int(SAMPLE_RATE * seconds)
+    t = np.arange(size) / SAMPLE_RATE
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.maximum(0.0, np.sin(2 * np.pi * 4 * t)) ** 2
+    audio = 0.2 * voiced * syllables + 0.02 * rng.standard_normal(size) * (syllables < 0.1)
+    margin = SAMPLE_RATE // 5
+    audio[:margin] = 0.0
+    audio[-margin:] = 0.0
+    return audio.astype(np.float32)
+
+
+def timed_ms(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def measure(seconds: float, repeat: int) -> dict[str, float]:
+    # Миллисекунды обработки на секунду звука.
+    audio = speech_like(seconds)
+    chain = PostConfig(trim_silence=True, loudness_lufs=-18)
+    stages = {
+        "trim": lambda: trim_silence(audio, SAMPLE_RATE, -50.0, 0.02),
+        "loudness": lambda: normalize_loudness(audio, SAMPLE_RATE, -18, -1.0),
+        "stretch_0.75": lambda: time_stretch(audio, 0.75, SAMPLE_RATE),
+        "stretch_1.5": lambda: time_stretch(audio, 1.5, SAMPLE_RATE),
+        "chain": lambda: chain.process(audio, SAMPLE_RATE),
+        "chain_stretch_1.25": lambda: chain.process(audio, SAMPLE_RATE, 1.25),
+        "resample_16k": lambda: resample(audio, SAMPLE_RATE, 16000),
+        "resample_44k1": lambda: resample(audio, SAMPLE_RATE, 44100),
+    }
+    return {name: timed_ms(fn, repeat) / seconds for name, fn in stages.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Стоимость обработки после синтеза.")
+    parser.add_argument(
+        "--seconds",
+        type=lambda value: [float(s) for s in value.split(",")],
+        default=[1.0, 10.0, 60.0],
+        help="длительности звука через запятую",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    results = {seconds: measure(seconds, args.repeat) for seconds in args.seconds}
+    print(f"{'ms per second of audio':<22}" + "".join(f"{s:>10g}s" for s in args.seconds))
+    for name in next(iter(results.values())):
+        print(f"{name:<22}" + "".join(f"{results[s][name]:11.3f}" for s in args.seconds))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
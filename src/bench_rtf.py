@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from engine_config import EngineConfig
+
+_PHRASES = (
+    "Здравствуйте, я хотел бы узнать остаток по счёту.",
+    "Переведите, пожалуйста, пять тысяч рублей на карту.",
+    "Спасибо, до свидания.",
+    "Подскажите, когда придёт выписка за прошлый месяц?",
+)
+
+
+def measure(config: EngineConfig, repeat: int) -> dict:
+    # RTF = время синтеза / длительность звука: меньше единицы — быстрее реального времени.
+    from model_loader import load_model
+    from synthesis import SynthesisEngine
+
+    started = time.perf_counter()
+    engine = SynthesisEngine(config.prepare(load_model()))
+    load_s = time.perf_counter() - started
+    if config.warmup:
+        engine.warm_up(config.WARMUP_TEXT)
+    started = time.perf_counter()
+    first_audio, first_rate = engine.synthesize(_PHRASES[0], "aidar", 1.0)
+    first_s = time.perf_counter() - started
+    synth_s = 0.0
+    audio_s = 0.0
+    for _ in range(repeat):
+        for text in _PHRASES:
+            started = time.perf_counter()
+            audio, sample_rate = engine.synthesize(text, "aidar", 1.0)
+            synth_s += time.perf_counter() - started
+            audio_s += audio.size / sample_rate
+    return {
+        "config": config.label(),
+        "load_s": round(load_s, 3),
+        "first_rtf": round(first_s / (first_audio.size / first_rate), 3),
+        "rtf": round(synth_s / audio_s, 3),
+    }
+
+
+def configurations(quantize: bool) -> list[EngineConfig]:
+    cores = os.cpu_count() or 1
+    threads = sorted(n for n in {1, 2, cores // 2, cores} if 1 <= n <= cores)
+    configs = [EngineConfig(intra_threads=n, interop_threads=1) for n in threads]
+    configs.append(EngineConfig())
+    if quantize:
+        configs += [
+            EngineConfig(c.intra_threads, c.interop_threads, quantize=True) for c in configs
+        ]
+    # Без прогрева: видно, во сколько обходится первая фраза.
+    configs.append(EngineConfig(warmup=False))
+    return configs
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Real-time factor синтеза для разных настроек потоков и квантования."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-quantize", action="store_true", help="не мерить int8-модель")
+    parser.add_argument("--one", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.one is not None:
+        config = EngineConfig.from_settings(json.loads(args.one))
+        print(json.dumps(measure(config, args.repeat)))
+        return 0
+    # Каждая конфигурация — в отдельном процессе: inter-op пул torch
+    # задаётся только один раз, а квантованная модель не должна делить кэши.
+    for config in configurations(not args.no_quantize):
+        result = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--repeat",
+                str(args.repeat),
+                "--one",
+                json.dumps(config.to_settings()),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            print(f"{config.label():<36} failed: {result.stderr.strip()}", file=sys.stderr)
+            continue
+        row = json.loads(result.stdout.splitlines()[-1])
+        print(
+            f"{row['config']:<36} load {row['load_s']:7.2f} s"
+            f"  first RTF {row['first_rtf']:6.3f}  RTF {row['rtf']:6.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
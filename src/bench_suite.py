@@ -0,0 +1,250 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from audio_output import NullOutput
+from bench_normalizer import make_corpus
+from phrase_store import PhraseStore
+from text_normalizer import TextNormalizer
+
+SECTIONS = ("normalize", "audio", "export", "db", "post")
+_WORDS = (
+    "перевод", "карта", "счёт", "банк", "оплата", "кредит", "вклад", "справка",
+    "выписка", "платёж", "остаток", "договор", "процент", "заявка", "лимит",
+)
+
+
+class Results:
+    # Метрика: значение, единица и направление «лучше» — для сравнения прогонов.
+    def __init__(self) -> None:
+        self.metrics: dict[str, dict] = {}
+
+    def add(self, name: str, value: float, unit: str, better: str = "lower") -> None:
+        self.metrics[name] = {"value": round(value, 4), "unit": unit, "better": better}
+        print(f"{name:<40} {value:12.3f} {unit}", flush=True)
+
+    def add_samples(self, name: str, samples: list[float], unit: str) -> None:
+        samples = sorted(samples)
+        self.add(f"{name}.p50", statistics.median(samples), unit)
+        self.add(f"{name}.p95", samples[min(len(samples) - 1, int(len(samples) * 0.95))], unit)
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def make_model(args: argparse.Namespace):
+    if args.model == "silero":
+        from model_loader import load_model
+
+        return load_model()
+    from fake_model import FakeTtsModel
+
+    return FakeTtsModel(ms_per_char=args.ms_per_char)
+
+
+def bench_normalize(results: Results, args: argparse.Namespace) -> None:
+    corpus = make_corpus(args.phrases * 20, args.phrases * 5)
+    chars = sum(len(text) for text in corpus)
+    for name, normalizer in (
+        ("normalize.cold", TextNormalizer(cache_size=0)),
+        ("normalize.cached", TextNormalizer()),
+    ):
+        started = time.perf_counter()
+        for text in corpus:
+            normalizer.normalize(text)
+        elapsed = time.perf_counter() - started
+        results.add(f"{name}.throughput", len(corpus) / elapsed, "phrases/s", "higher")
+        results.add(f"{name}.chars", chars / elapsed / 1e6, "Mchar/s", "higher")
+
+
+def wait_for(app: QtCore.QCoreApplication, condition, timeout: float = 300.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark step did not finish")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def bench_bridge(results: Results, args: argparse.Namespace, sections: set[str]) -> None:
+    from tts_bridge import TtsBridge
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    with tempfile.TemporaryDirectory() as data_dir:
+        bridge = TtsBridge(
+            make_model(args), NullOutput(speed=args.playback_speed), Path(data_dir)
+        )
+        idle = lambda: not bridge.playing and not bridge.preparing  # noqa: E731
+        measured = []
+        bridge.timeToFirstAudioChanged.connect(
+            lambda: measured.append(bridge.timeToFirstAudio)
+        )
+        try:
+            if "audio" in sections:
+                texts = [f"Фраза номер {i} для замера задержки." for i in range(args.phrases)]
+                # Второй проход по тем же фразам идёт из кэша.
+                for name in ("first_audio.cold", "first_audio.cached"):
+                    measured.clear()
+                    for text in texts:
+                        bridge.say(text)
+                        wait_for(app, idle)
+                    results.add_samples(name, measured, "ms")
+                # Пачка фраз сразу: пропускная способность очереди синтеза.
+                started = time.perf_counter()
+                for i in range(args.phrases):
+                    bridge.say(f"Очередь, фраза {i}.")
+                wait_for(app, idle)
+                elapsed = time.perf_counter() - started
+                results.add("queue.throughput", args.phrases / elapsed, "utterances/s", "higher")
+            if "export" in sections:
+                for i in range(args.phrases):
+                    bridge.save(f"Экспорт, фраза номер {i}.")
+                bridge._persistence.flush()
+                started = time.perf_counter()
+                bridge.exportCategory(bridge.currentCategory)
+                wait_for(app, lambda: not bridge.exporting)
+                elapsed = time.perf_counter() - started
+                results.add("export.throughput", args.phrases / elapsed, "phrases/s", "higher")
+        finally:
+            bridge.shutdown()
+
+
+def fill_store(store: PhraseStore, size: int) -> list[str]:
+    rng = random.Random(size)
+    for name in ("Дом", "Работа", "Врач", "Магазин"):
+        store.add_category(name)
+    category_ids = [row[0] for row in store.categories()]
+    texts = []
+    with store.batch():
+        for i in range(size):
+            text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 6))) + f" {i}"
+            store.save_phrase(text, category_ids[i % len(category_ids)])
+            if i % 100 == 0:
+                store.favorite_phrase(text, category_ids[i % len(category_ids)])
+            if i % 7 == 0:
+                store.increment_say_count(text, rng.randint(1, 50))
+            texts.append(text)
+    return texts
+
+
+def bench_db(results: Results, args: argparse.Namespace) -> None:
+    for size in args.db_sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = PhraseStore(Path(data_dir) / "phrases.sqlite3")
+            started = time.perf_counter()
+            texts = fill_store(store, size)
+            results.add(f"db.{size}.fill", (time.perf_counter() - started) * 1000, "ms")
+            category_id = store.categories()[0][0]
+            middle = sorted(texts)[len(texts) // 2]
+            counter = iter(range(10 ** 9))
+            operations = {
+                "first_page": lambda: store.phrase_page(category_id, None, 200),
+                "deep_page": lambda: store.phrase_page(category_id, middle, 200),
+                "favorites_page": lambda: store.phrase_page(None, None, 200),
+                "search_common": lambda: store.search_phrases("банк"),
+                "search_rare": lambda: store.search_phrases(texts[-1]),
+                "save_phrase": lambda: store.save_phrase(
+                    f"новая фраза {next(counter)}", category_id
+                ),
+                "increment": lambda: store.increment_say_count(middle),
+                "phrase_row": lambda: store.phrase_row(middle),
+            }
+            for name, operation in operations.items():
+                operation()
+                results.add_samples(f"db.{size}.{name}", timed(operation, args.repeat), "ms")
+            store.close()
+
+
+def bench_post(results: Results, args: argparse.Namespace) -> None:
+    from bench_postprocess import measure
+
+    for name, value in measure(10.0, max(1, args.repeat // 6)).items():
+        results.add(f"post.{name}", value, "ms/s")
+
+
+def compare(current: dict, baseline_path: Path, tolerance: float) -> int:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    regressions = 0
+    print(f"\ncompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for name, metric in current.items():
+        before = baseline.get(name)
+        if before is None or not before["value"]:
+            continue
+        change = metric["value"] / before["value"] - 1
+        worse = change > tolerance if metric["better"] == "lower" else change < -tolerance
+        regressions += worse
+        mark = "REGRESSION" if worse else ""
+        print(f"{name:<40} {before['value']:12.3f} -> {metric['value']:12.3f} {change:+7.1%} {mark}")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Набор замеров без GUI и звуковой карты.")
+    parser.add_argument("--model", choices=("fake", "silero"), default="fake")
+    parser.add_argument(
+        "--ms-per-char", type=float, default=0.5, help="задержка фейковой модели на символ"
+    )
+    parser.add_argument("--phrases", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument(
+        "--db-sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[1_000, 10_000, 100_000],
+    )
+    parser.add_argument(
+        "--playback-speed",
+        type=float,
+        default=50.0,
+        help="во сколько раз быстрее реального времени играет нулевой вывод",
+    )
+    parser.add_argument("--only", default=",".join(SECTIONS), help="разделы через запятую")
+    parser.add_argument("--json", type=Path, help="куда записать результаты")
+    parser.add_argument("--compare", type=Path, help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    sections = set(args.only.split(","))
+
+    results = Results()
+    if "normalize" in sections:
+        bench_normalize(results, args)
+    if sections & {"audio", "export"}:
+        bench_bridge(results, args, sections)
+    if "db" in sections:
+        bench_db(results, args)
+    if "post" in sections:
+        bench_post(results, args)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": args.model,
+            "ms_per_char": args.ms_per_char,
+            "phrases": args.phrases,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results.metrics,
+    }
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.compare is not None:
+        return compare(results.metrics, args.compare, args.tolerance)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import argparse
+import inspect
+import time
+import tracemalloc
+
+import numpy as np
+
+from audio_io import pcm16_view
+from fake_model import FakeTtsModel
+from synthesis import SAMPLE_RATE, SynthesisEngine
+
+
+def baseline(tts_model, text: str, speaker: str, speed: float) -> bytes:
+    # Прежний путь: сигнатура на каждый вызов, копия astype, concatenate, clip.
+    apply_tts = tts_model.apply_tts
+    kwargs = {"text": text, "speaker": speaker, "sample_rate": SAMPLE_RATE}
+    if "speed" in inspect.signature(apply_tts).parameters:
+        kwargs["speed"] = speed
+    audio = apply_tts(**kwargs).numpy().astype(np.float32)
+    audio = np.concatenate([audio, np.zeros(int(SAMPLE_RATE * 0.05), dtype=np.float32)])
+    audio = np.clip(audio, -1.0, 1.0)
+    return (audio * 32767).astype("<i2").tobytes()
+
+
+def engine_path(engine: SynthesisEngine, text: str, speaker: str, speed: float) -> np.ndarray:
+    audio, _ = engine.synthesize(text, speaker, speed)
+    return pcm16_view(audio)
+
+
+def run(name: str, render, texts: list[str]) -> float:
+    # Прогрев самой длинной фразой: буферы потока уже выросли до нужного размера.
+    render(max(texts, key=len))
+    tracemalloc.start()
+    started = time.perf_counter()
+    for text in texts:
+        render(text)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<10} {elapsed * 1000 / len(texts):8.3f} ms/utterance"
+        f" {peak / 2 ** 20:8.1f} MiB peak"
+    )
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Накладные расходы вокруг синтеза.")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=80)
+    args = parser.parse_args(argv)
+    model = FakeTtsModel()
+    texts = [f"{i} " + "а" * args.chars for i in range(args.count)]
+    engine = SynthesisEngine(model)
+    before = run("baseline", lambda text: baseline(model, text, "aidar", 1.0), texts)
+    after = run("engine", lambda text: engine_path(engine, text, "aidar", 1.0), texts)
+    print(f"speedup: {before / after:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
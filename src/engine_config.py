@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import torch
+
+
+def default_intra_threads() -> int:
+    # Одно ядро оставляем GUI и звуку, иначе интерфейс подтормаживает при синтезе.
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+class EngineConfig:
+    # 0 потоков — значение по умолчанию: для intra-op см. default_intra_threads,
+    # для inter-op — как решит torch.
+    DEFAULTS = {
+        "intra_threads": 0,
+        "interop_threads": 0,
+        "warmup": True,
+        "quantize": False,
+        "extra_models": "",
+        "model_budget_mb": 1024,
+        "export_workers": 1,
+    }
+    WARMUP_TEXT = "Проверка связи."
+
+    def __init__(
+        self,
+        intra_threads: int = 0,
+        interop_threads: int = 0,
+        warmup: bool = True,
+        quantize: bool = False,
+        extra_models: str = "",
+        model_budget_mb: int = 1024,
+        export_workers: int = 1,
+    ) -> None:
+        self.intra_threads = max(0, intra_threads)
+        self.interop_threads = max(0, interop_threads)
+        self.warmup = warmup
+        self.quantize = quantize
+        # Пакеты Silero сверх основной русской модели, через запятую.
+        self.extra_models = extra_models
+        # Сколько памяти занимают загруженные модели, МБ; 0 — без предела.
+        self.model_budget_mb = max(0, model_budget_mb)
+        # Сколько фраз экспорт и запись в файл синтезируют одновременно.
+        self.export_workers = max(1, export_workers)
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, str]) -> EngineConfig:
+        values = {}
+        for name, default in cls.DEFAULTS.items():
+            raw = settings.get(f"engine.{name}")
+            if raw is None:
+                continue
+            if isinstance(default, str):
+                values[name] = raw
+                continue
+            try:
+                values[name] = bool(int(raw)) if isinstance(default, bool) else int(raw)
+            except ValueError:
+                continue
+        return cls(**values)
+
+    def to_settings(self) -> dict[str, str]:
+        return {
+            f"engine.{name}": value if isinstance(value, str) else str(int(value))
+            for name, value in ((name, getattr(self, name)) for name in self.DEFAULTS)
+        }
+
+    def label(self) -> str:
+        interop = self.interop_threads or "auto"
+        return (
+            f"threads={self.effective_intra_threads()}/{interop}"
+            f" int8={'on' if self.quantize else 'off'}"
+            f" warmup={'on' if self.warmup else 'off'}"
+        )
+
+    def effective_intra_threads(self) -> int:
+        # Число потоков torch общее на процесс. В режиме «авто» свободные ядра
+        # делятся поровну между рабочими экспорта, чтобы они шли параллельно.
+        if self.intra_threads:
+            return self.intra_threads
+        return max(1, default_intra_threads() // self.export_workers)
+
+    def render_workers(self) -> int:
+        # Фоновые рендеры не трогают потоки torch, а ограничиваются числом,
+        # при котором каждому хватает своих intra-op потоков.
+        cores = os.cpu_count() or 1
+        return max(1, min(self.export_workers, cores // self.effective_intra_threads()))
+
+    def apply_threads(self) -> None:
+        import torch
+
+        torch.set_num_threads(self.effective_intra_threads())
+        if self.interop_threads:
+            # Inter-op пул задаётся один раз до первой параллельной работы.
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError:
+                pass
+
+    def prepare(self, tts_model: torch.nn.Module) -> torch.nn.Module:
+        self.apply_threads()
+        if self.quantize:
+            tts_model = quantize_model(tts_model)
+        return tts_model
+
+
+def quantize_model(tts_model: torch.nn.Module) -> torch.nn.Module:
+    # Динамическое int8-квантование линейных слоёв. TorchScript-модели
+    # и пакеты без nn.Linear остаются как есть.
+    import torch
+
+    try:
+        return torch.ao.quantization.quantize_dynamic(
+            tts_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    except Exception:
+        return tts_model
+
+
+def is_quantized(tts_model: torch.nn.Module) -> bool:
+    # Смотрим на сами слои, а не на настройку: quantize_model может вернуть
+    # модель как есть, а переключатель действует только со следующего запуска.
+    for module in (tts_model, getattr(tts_model, "model", None)):
+        try:
+            modules = list(module.modules())
+        except Exception:
+            continue
+        return any("quantized" in type(layer).__module__ for layer in modules)
+    return False
@@ -0,0 +1,26 @@
+import time
+
+import numpy as np
+
+
+class FakeTtsModel:
+    # Детерминированная замена Silero для замеров: длина звука и время
+    # «инференса» зависят только от длины текста.
+    speakers = ["aidar", "baya", "eugene", "kseniya", "xenia"]
+
+    def __init__(self, ms_per_char: float = 0.0, samples_per_char: int = 2400) -> None:
+        import torch
+
+        self._torch = torch
+        self.ms_per_char = ms_per_char
+        self.samples_per_char = samples_per_char
+        self._tone = np.zeros(0, dtype=np.float32)
+
+    def apply_tts(self, text: str, speaker: str, sample_rate: int, speed: float = 1.0):
+        if self.ms_per_char:
+            time.sleep(len(text) * self.ms_per_char / 1000)
+        size = int(len(text) * self.samples_per_char * sample_rate / 48000 / speed)
+        if self._tone.size < size:
+            self._tone = 0.5 * np.sin(np.arange(size, dtype=np.float32) * np.float32(0.05))
+        # Как и настоящая модель, каждый раз отдаёт новый тензор.
+        return self._torch.from_numpy(self._tone[:size].copy())
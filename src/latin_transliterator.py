@@ -61,25 +61,19 @@ class LatinTransliterator:
 
     def __init__(self) -> None:
         self._latin_re = re.compile(r"[A-Za-z]+")
+        # Одна альтернация вместо перебора _MULTI_KEYS на каждой позиции:
+        # порядок ветвей тот же, так что shch побеждает sch и ch.
+        self._letters_re = re.compile("|".join(self._MULTI_KEYS) + "|[a-z]")
+        self._letters_map = {**self._SINGLE_MAP, **self._MULTI_MAP}
 
     def normalize(self, text: str) -> str:
         return self._latin_re.sub(self._replace, text)
 
+    def transliterate(self, text: str) -> str:
+        return self._letters_re.sub(self._replace_letters, text.lower())
+
     def _replace(self, match: re.Match[str]) -> str:
-        return self._transliterate(match.group(0))
+        return self.transliterate(match.group(0))
 
-    def _transliterate(self, text: str) -> str:
-        lowered = text.lower()
-        result: list[str] = []
-        idx = 0
-        while idx < len(lowered):
-            for key in self._MULTI_KEYS:
-                if lowered.startswith(key, idx):
-                    result.append(self._MULTI_MAP[key])
-                    idx += len(key)
-                    break
-            else:
-                ch = lowered[idx]
-                result.append(self._SINGLE_MAP.get(ch, ch))
-                idx += 1
-        return "".join(result)
+    def _replace_letters(self, match: re.Match[str]) -> str:
+        return self._letters_map[match.group(0)]
@@ -0,0 +1,74 @@
+import re
+
+
+def _trie_pattern(terms: list[str]) -> str:
+    # Префиксное дерево, развёрнутое в регулярное выражение: общие начала
+    # проверяются один раз, а более длинные термины выигрывают у коротких.
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict) -> str:
+    branches = []
+    optional = False
+    for ch in sorted(node, reverse=True):
+        if ch == "":
+            optional = True
+            continue
+        atom = r"\s+" if ch == " " else re.escape(ch)
+        branches.append(atom + _node_pattern(node[ch]))
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if optional:
+        pattern = "(?:" + pattern + ")?"
+    return pattern
+
+
+class Lexicon:
+    # Сокращения («SMS») сравниваются с учётом регистра, обычные слова — без.
+    def __init__(self, entries: list[dict]) -> None:
+        self._exact: dict[str, str] = {}
+        self._folded: dict[str, str] = {}
+        for entry in entries:
+            term = " ".join(entry["term"].split())
+            if not term:
+                continue
+            if entry["abbreviation"]:
+                self._exact[term] = entry["replacement"]
+            else:
+                self._folded[term.lower()] = entry["replacement"]
+        self._pattern = self._compile()
+
+    def apply(self, text: str) -> str:
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+    def _compile(self) -> re.Pattern[str] | None:
+        alternatives = []
+        if self._exact:
+            alternatives.append(_trie_pattern(list(self._exact)))
+        if self._folded:
+            alternatives.append("(?i:" + _trie_pattern(list(self._folded)) + ")")
+        if not alternatives:
+            return None
+        terms = [*self._exact, *self._folded]
+        # Как и в NumberNormalizer: без подходящей первой буквы позиция
+        # отбрасывается сразу, поэтому текст без совпадений почти не замедляется.
+        first = "".join(sorted({ch for term in terms for ch in (term[0], term[0].upper())}))
+        return re.compile(
+            rf"(?=[{re.escape(first)}])(?<!\w)(?:{'|'.join(alternatives)})(?!\w)"
+        )
+
+    def _replace(self, match: re.Match[str]) -> str:
+        found = " ".join(match.group(0).split())
+        replacement = self._exact.get(found)
+        if replacement is None:
+            replacement = self._folded.get(found.lower(), match.group(0))
+        return replacement
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from engine_config import EngineConfig
+from model_loader import load_model
+from synthesis import SynthesisEngine
+
+
+class ModelLoadTask(QtCore.QObject, QtCore.QRunnable):
+    loaded = QtCore.Signal(object, float)
+    # Фаза старта и её длительность, мс — до loaded.
+    phaseTimed = QtCore.Signal(str, float)
+    failed = QtCore.Signal(str)
+
+    def __init__(
+        self, model_path: Path | None = None, config: EngineConfig | None = None
+    ) -> None:
+        QtCore.QObject.__init__(self)
+        QtCore.QRunnable.__init__(self)
+        self.model_path = model_path
+        self.config = config or EngineConfig()
+
+    def run(self) -> None:
+        started_at = time.perf_counter()
+        try:
+            model = self.config.prepare(load_model(self.model_path))
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        load_ms = (time.perf_counter() - started_at) * 1000
+        if self.config.warmup:
+            # Первый прогон самый медленный (аллокации, ленивая инициализация
+            # графа) — пусть он случится до первой фразы пользователя.
+            started_at = time.perf_counter()
+            try:
+                SynthesisEngine(model).warm_up(self.config.WARMUP_TEXT)
+            except Exception as exc:
+                # Модель при этом рабочая — грузим её, а причину пишем в лог.
+                print(f"model warm-up failed: {exc}", file=sys.stderr)
+            else:
+                self.phaseTimed.emit("warmup", (time.perf_counter() - started_at) * 1000)
+        self.loaded.emit(model, load_ms)
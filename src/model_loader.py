@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import torch
+
+MODEL_URL = "https://models.silero.ai/models/tts/ru/v3_1_ru.pt"
+DEFAULT_PACKAGE = "v3_1_ru"
+
+
+def default_model_path(package: str = DEFAULT_PACKAGE) -> Path:
+    # TALKER_MODEL_PATH подменяет только основную русскую модель.
+    env_path = os.environ.get("TALKER_MODEL_PATH")
+    if env_path and package == DEFAULT_PACKAGE:
+        return Path(env_path)
+    return Path(__file__).resolve().parent / "models" / f"{package}.pt"
+
+
+def load_model(
+    model_path: Path | None = None,
+    language: str = "ru",
+    speaker: str = DEFAULT_PACKAGE,
+) -> torch.nn.Module:
+    # torch импортируем здесь: это самая долгая часть старта.
+    import torch
+
+    model_path = model_path or default_model_path(speaker)
+    if model_path.is_file():
+        return _load_local(torch, model_path)
+    # 1) Грузим из torch.hub (первый запуск скачает репозиторий/модели)
+    loaded = torch.hub.load(
+        repo_or_dir="snakers4/silero-models",
+        model="silero_tts",
+        language=language,
+        speaker=speaker,
+        trust_repo=True,  # чтобы не спрашивал в будущем
+    )
+    # 2) torch.hub иногда возвращает tuple: (model, example_text, ...)
+    #    Приводим к "model"
+    return loaded[0] if isinstance(loaded, (tuple, list)) else loaded
+
+
+def _load_local(torch, model_path: Path) -> torch.nn.Module:
+    # Файлы Silero v3 — это torch.package; обычный TorchScript тоже поддерживаем.
+    try:
+        importer = torch.package.PackageImporter(str(model_path))
+    except RuntimeError:
+        return torch.jit.load(str(model_path), map_location="cpu")
+    model = importer.load_pickle("tts_models", "model")
+    model.to(torch.device("cpu"))
+    return model
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore
+
+from engine_config import EngineConfig
+from model_loader import DEFAULT_PACKAGE, default_model_path, load_model
+from postprocess import PostConfig
+from synthesis import SynthesisEngine
+from tracing import tracer
+
+if TYPE_CHECKING:
+    import torch
+
+
+class ModelSpec:
+    def __init__(
+        self,
+        package: str,
+        language: str,
+        script: str,
+        speakers: tuple[str, ...],
+        size_mb: int,
+        markers: str = "",
+    ) -> None:
+        self.package = package
+        self.language = language
+        # Письменность, по которой на эту модель уходит текст без явного голоса.
+        self.script = script
+        # Голоса до загрузки модели; после загрузки берём model.speakers.
+        self.speakers = speakers
+        self.default_speaker = speakers[0]
+        # Оценка памяти, если у модели не посчитать параметры.
+        self.size_mb = size_mb
+        # Буквы, которые однозначно выдают язык (у украинского — і, ї, є, ґ).
+        self.markers = markers
+
+
+MODELS = {
+    spec.package: spec
+    for spec in (
+        ModelSpec(
+            DEFAULT_PACKAGE, "ru", "cyrillic", ("aidar", "baya", "kseniya", "xenia", "eugene"), 250
+        ),
+        ModelSpec("v3_en", "en", "latin", tuple(f"en_{i}" for i in range(118)), 250),
+        ModelSpec("v3_ua", "ua", "cyrillic", ("mykyta",), 250, "іїєґ"),
+    )
+}
+
+
+def detect_script(text: str) -> str:
+    cyrillic = latin = 0
+    for char in text:
+        if "а" <= char.lower() <= "я" or char in "ёЁіІїЇєЄґҐ":
+            cyrillic += 1
+        elif "a" <= char.lower() <= "z":
+            latin += 1
+    if not cyrillic and not latin:
+        return ""
+    return "cyrillic" if cyrillic >= latin else "latin"
+
+
+def model_bytes(tts_model: torch.nn.Module) -> int:
+    # Silero-пакет хранит сеть в .model, TorchScript — прямо в объекте.
+    for module in (tts_model, getattr(tts_model, "model", None)):
+        try:
+            tensors = list(module.parameters()) + list(module.buffers())
+        except Exception:
+            continue
+        total = sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+        if total:
+            return total
+    return 0
+
+
+class LazyEngine:
+    # Ставится в задачи вместо SynthesisEngine: модель грузится при первом
+    # синтезе в рабочем потоке, а не в GUI, и заново — если её вытеснили.
+    def __init__(self, registry: ModelRegistry, package: str) -> None:
+        self._registry = registry
+        self.package = package
+
+    def sample_rate(self, speed: float) -> int:
+        return self._registry.engine(self.package).sample_rate(speed)
+
+    def cache_key(self, *args, **kwargs) -> str:
+        return self._registry.engine(self.package).cache_key(*args, **kwargs)
+
+    def synthesize(self, *args, **kwargs):
+        return self._registry.engine(self.package).synthesize(*args, **kwargs)
+
+    def synthesize_chunked(self, *args, **kwargs):
+        return self._registry.engine(self.package).synthesize_chunked(*args, **kwargs)
+
+    def synthesize_into(self, *args, **kwargs) -> None:
+        self._registry.engine(self.package).synthesize_into(*args, **kwargs)
+
+
+class ModelRegistry(QtCore.QObject):
+    # Модель загрузилась, вытеснена или не загрузилась.
+    changed = QtCore.Signal()
+
+    def __init__(
+        self,
+        config: EngineConfig,
+        loader: Callable[[ModelSpec], torch.nn.Module] | None = None,
+    ) -> None:
+        super().__init__()
+        self.config = config
+        self._loader = loader or self._load
+        self._lock = threading.Lock()
+        # Загрузка долгая — отдельный замок, чтобы не держать им готовые модели.
+        self._load_lock = threading.Lock()
+        # Порядок — от давно не использованной к последней (LRU).
+        self._engines: OrderedDict[str, SynthesisEngine] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._errors: dict[str, str] = {}
+        self._handles = {package: LazyEngine(self, package) for package in MODELS}
+        self.post = PostConfig()
+
+    def enabled(self) -> list[ModelSpec]:
+        # Основная русская модель есть всегда, остальные — по настройке.
+        extra = {name.strip() for name in self.config.extra_models.split(",")}
+        return [
+            spec for spec in MODELS.values()
+            if spec.package == DEFAULT_PACKAGE or spec.package in extra
+        ]
+
+    def set_post(self, post: PostConfig) -> None:
+        with self._lock:
+            self.post = post
+            for engine in self._engines.values():
+                engine.post = post
+
+    def add(self, package: str, tts_model: torch.nn.Module) -> SynthesisEngine:
+        engine = SynthesisEngine(tts_model, self.post, package)
+        size = model_bytes(tts_model) or MODELS[package].size_mb << 20
+        with self._lock:
+            self._engines[package] = engine
+            self._engines.move_to_end(package)
+            self._sizes[package] = size
+            self._errors.pop(package, None)
+        self.evict()
+        self.changed.emit()
+        return engine
+
+    def engine(self, package: str) -> SynthesisEngine:
+        with self._lock:
+            engine = self._engines.get(package)
+            if engine is not None:
+                self._engines.move_to_end(package)
+                return engine
+        with self._load_lock:
+            with self._lock:
+                engine = self._engines.get(package)
+            if engine is not None:
+                return engine
+            try:
+                with tracer.span("model_load"):
+                    tts_model = self._loader(MODELS[package])
+            except Exception as exc:
+                with self._lock:
+                    self._errors[package] = str(exc)
+                self.changed.emit()
+                raise
+            return self.add(package, tts_model)
+
+    def retry(self, package: str) -> None:
+        # После ошибки модель не участвует в выборе, пока её не включат заново.
+        with self._lock:
+            self._errors.pop(package, None)
+
+    def handle(self, package: str) -> LazyEngine:
+        return self._handles[package]
+
+    def evict(self) -> None:
+        budget = self.config.model_budget_mb << 20
+        evicted = False
+        with self._lock:
+            # Основная модель не вытесняется: она нужна почти каждой фразе.
+            while budget and sum(self._sizes.values()) > budget:
+                # Только что загруженную не трогаем — иначе она не успеет сработать.
+                newest = next(reversed(self._engines))
+                victims = [p for p in self._engines if p not in (DEFAULT_PACKAGE, newest)]
+                if not victims:
+                    break
+                del self._engines[victims[0]]
+                del self._sizes[victims[0]]
+                evicted = True
+            # Отключённые в настройках выгружаем сразу.
+            enabled = {spec.package for spec in self.enabled()}
+            for package in [p for p in self._engines if p not in enabled]:
+                del self._engines[package]
+                del self._sizes[package]
+                evicted = True
+        if evicted:
+            self.changed.emit()
+
+    def speakers(self, package: str) -> list[str]:
+        with self._lock:
+            engine = self._engines.get(package)
+        speakers = getattr(engine.tts_model, "speakers", None) if engine else None
+        return list(speakers or MODELS[package].speakers)
+
+    def all_speakers(self) -> list[str]:
+        result: list[str] = []
+        for spec in self.enabled():
+            result += [s for s in sorted(self.speakers(spec.package)) if s not in result]
+        return result
+
+    def route(self, text: str, speaker: str) -> tuple[ModelSpec, str]:
+        # Голос выбирает модель; текст другой письменности уходит модели
+        # этой письменности с её голосом по умолчанию.
+        with self._lock:
+            failed = set(self._errors)
+        specs = [spec for spec in self.enabled() if spec.package not in failed]
+        owner = next((spec for spec in specs if speaker in self.speakers(spec.package)), None)
+        if owner is None:
+            owner = MODELS[DEFAULT_PACKAGE]
+            speaker = owner.default_speaker
+        script = detect_script(text)
+        candidates = [spec for spec in specs if spec.script == script]
+        lowered = text.lower()
+        marked = [
+            spec for spec in candidates
+            if spec.markers and any(char in lowered for char in spec.markers)
+        ]
+        if marked:
+            target = marked[0]
+        elif owner in candidates or not candidates:
+            target = owner
+        else:
+            target = candidates[0]
+        if target is owner:
+            return owner, speaker
+        return target, target.default_speaker
+
+    def status(self) -> list[dict]:
+        enabled = {spec.package for spec in self.enabled()}
+        with self._lock:
+            loaded = dict(self._sizes)
+            errors = dict(self._errors)
+        return [
+            {
+                "name": spec.package,
+                "language": spec.language,
+                "enabled": spec.package in enabled,
+                "loaded": spec.package in loaded,
+                "memoryMb": loaded.get(spec.package, 0) >> 20,
+                "error": errors.get(spec.package, ""),
+            }
+            for spec in MODELS.values()
+        ]
+
+    def _load(self, spec: ModelSpec) -> torch.nn.Module:
+        return self.config.prepare(
+            load_model(default_model_path(spec.package), spec.language, spec.package)
+        )
@@ -82,14 +82,250 @@ class NumberNormalizer:
         (("триллион", "триллиона", "триллионов"), False),
     ]
 
+    _ONES_NEUT = (
+        "",
+        "одно",
+        "два",
+        "три",
+        "четыре",
+        "пять",
+        "шесть",
+        "семь",
+        "восемь",
+        "девять",
+    )
+    _ONES_BY_GENDER = {"m": _ONES, "f": _ONES_FEM, "n": _ONES_NEUT}
+    # Порядковые: основа и тип окончаний. Склоняется только последнее слово.
+    _ORDINAL_ONES = (
+        ("нулев", "stressed"),
+        ("перв", "hard"),
+        ("втор", "stressed"),
+        ("трет", "soft"),
+        ("четвёрт", "hard"),
+        ("пят", "hard"),
+        ("шест", "stressed"),
+        ("седьм", "stressed"),
+        ("восьм", "stressed"),
+        ("девят", "hard"),
+    )
+    _ORDINAL_TEENS = (
+        "десят",
+        "одиннадцат",
+        "двенадцат",
+        "тринадцат",
+        "четырнадцат",
+        "пятнадцат",
+        "шестнадцат",
+        "семнадцат",
+        "восемнадцат",
+        "девятнадцат",
+    )
+    _ORDINAL_TENS = (
+        ("", "hard"),
+        ("", "hard"),
+        ("двадцат", "hard"),
+        ("тридцат", "hard"),
+        ("сороков", "stressed"),
+        ("пятидесят", "hard"),
+        ("шестидесят", "hard"),
+        ("семидесят", "hard"),
+        ("восьмидесят", "hard"),
+        ("девяност", "hard"),
+    )
+    _ORDINAL_GROUPS = ("", "тысячн", "миллионн", "миллиардн", "триллионн")
+    # Родительный падеж для сложных слов: «двухтысячный», «пятисотый».
+    _GENITIVE_ONES = (
+        "",
+        "одно",
+        "двух",
+        "трёх",
+        "четырёх",
+        "пяти",
+        "шести",
+        "семи",
+        "восьми",
+        "девяти",
+    )
+    _GENITIVE_TEENS = (
+        "десяти",
+        "одиннадцати",
+        "двенадцати",
+        "тринадцати",
+        "четырнадцати",
+        "пятнадцати",
+        "шестнадцати",
+        "семнадцати",
+        "восемнадцати",
+        "девятнадцати",
+    )
+    _GENITIVE_TENS = (
+        "",
+        "",
+        "двадцати",
+        "тридцати",
+        "сорока",
+        "пятидесяти",
+        "шестидесяти",
+        "семидесяти",
+        "восьмидесяти",
+        "девяноста",
+    )
+    _GENITIVE_HUNDREDS = (
+        "",
+        "сто",
+        "двухсот",
+        "трёхсот",
+        "четырёхсот",
+        "пятисот",
+        "шестисот",
+        "семисот",
+        "восьмисот",
+        "девятисот",
+    )
+    _ORDINAL_ENDINGS = {
+        "hard": {
+            "m_nom": "ый", "f_nom": "ая", "n_nom": "ое", "gen": "ого",
+            "dat": "ому", "prep": "ом", "ins": "ым", "f_obl": "ой",
+            "f_acc": "ую", "pl_nom": "ые", "pl_gen": "ых", "pl_ins": "ыми",
+        },
+        "stressed": {
+            "m_nom": "ой", "f_nom": "ая", "n_nom": "ое", "gen": "ого",
+            "dat": "ому", "prep": "ом", "ins": "ым", "f_obl": "ой",
+            "f_acc": "ую", "pl_nom": "ые", "pl_gen": "ых", "pl_ins": "ыми",
+        },
+        "soft": {
+            "m_nom": "ий", "f_nom": "ья", "n_nom": "ье", "gen": "ьего",
+            "dat": "ьему", "prep": "ьем", "ins": "ьим", "f_obl": "ьей",
+            "f_acc": "ью", "pl_nom": "ьи", "pl_gen": "ьих", "pl_ins": "ьими",
+        },
+    }
+    # Окончание после дефиса («5-го», «21-я») -> форма порядкового.
+    _ORDINAL_SUFFIXES = {
+        "й": "m_nom", "ый": "m_nom", "ий": "m_nom",
+        "я": "f_nom", "ая": "f_nom", "ья": "f_nom",
+        "е": "n_nom", "ое": "n_nom", "ье": "n_nom",
+        "го": "gen", "ого": "gen", "его": "gen", "ьего": "gen",
+        "му": "dat", "ому": "dat", "ему": "dat",
+        "м": "prep", "ом": "prep", "ем": "prep",
+        "ым": "ins", "им": "ins",
+        "ой": "f_obl", "ей": "f_obl", "ьей": "f_obl",
+        "ю": "f_acc", "ую": "f_acc", "ью": "f_acc",
+        "и": "pl_nom", "ые": "pl_nom", "ие": "pl_nom",
+        "х": "pl_gen", "ых": "pl_gen", "их": "pl_gen",
+        "ми": "pl_ins", "ыми": "pl_ins", "ими": "pl_ins",
+    }
+    # Падеж дня в дате по предлогу перед ней: «от первого февраля», «к первому».
+    _DATE_CASES = {
+        "от": "gen", "до": "gen", "с": "gen", "со": "gen", "после": "gen",
+        "около": "gen", "для": "gen", "из": "gen", "без": "gen", "кроме": "gen",
+        "к": "dat", "ко": "dat",
+        "о": "prep", "об": "prep", "при": "prep",
+        "перед": "ins", "между": "ins", "под": "ins", "над": "ins",
+    }
+    _MONTHS = (
+        "января",
+        "февраля",
+        "марта",
+        "апреля",
+        "мая",
+        "июня",
+        "июля",
+        "августа",
+        "сентября",
+        "октября",
+        "ноября",
+        "декабря",
+    )
+    _HOURS = ("час", "часа", "часов")
+    _MINUTES = ("минута", "минуты", "минут")
+    _INTEGER_PARTS = ("целая", "целых", "целых")
+    _FRACTION_PARTS = (
+        ("десятая", "десятых", "десятых"),
+        ("сотая", "сотых", "сотых"),
+        ("тысячная", "тысячных", "тысячных"),
+    )
+    # Код валюты -> (формы, род) для целой части и для копеек/центов.
+    _CURRENCIES = {
+        "RUB": ((("рубль", "рубля", "рублей"), "m"), (("копейка", "копейки", "копеек"), "f")),
+        "USD": ((("доллар", "доллара", "долларов"), "m"), (("цент", "цента", "центов"), "m")),
+        "EUR": ((("евро", "евро", "евро"), "n"), (("цент", "цента", "центов"), "m")),
+    }
+    _CURRENCY_UNITS = {
+        "₽": "RUB", "rub": "RUB", "руб": "RUB", "руб.": "RUB", "р.": "RUB",
+        "$": "USD", "usd": "USD", "долл.": "USD",
+        "€": "EUR", "eur": "EUR",
+    }
+    # Существительные, с которыми число согласуется в роде («одна минута», «одно окно»):
+    # основа плюс падежное окончание, слово целиком — «карту», но не «картридж».
+    _NOUN_ENDINGS = "(?:|а|я|ы|и|у|ю|е|о|й|ь|ой|ей|ом|ем|ам|ям|ами|ями|ах|ях)"
+    _FEMININE_NOUNS = (
+        "копейк", "копеек", "тысяч", "минут", "секунд", "недел", "карт", "операци",
+        "выписк", "выписок", "справк", "справок", "заявк", "заявок", "строк", "сотн",
+        "сотен", "цифр", "штук", "попытк", "попыток", "ставк", "ставок", "сумм",
+        "категори", "фраз",
+    )
+    # «Пол» мужского рода, поэтому «поле» — только целыми формами.
+    _NEUTER_NOUNS = (
+        "евро", "сообщени", "окн", "окон", "мест", "числ", "чисел", "письм", "писем",
+        "поле", "поля", "полю", "полем", "полей",
+    )
+    _YEAR_NOUNS = {"год": "m_nom", "года": "gen", "году": "prep", "годом": "ins", "г.": "gen"}
+
+    _SPACE = "[   ]"
+    # «$1,000.50» — запятая между тройками цифр; дробная часть с запятой не длиннее двух цифр.
+    _COMMA_THOUSANDS = r"\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?(?![\d,])"
+    _AMOUNT = (
+        rf"(?:{_COMMA_THOUSANDS}|(?:\d{{1,3}}(?:{_SPACE}\d{{3}})+|\d+)(?:[.,]\d{{1,2}})?(?!\d))"
+    )
+    _UNIT = r"(?:₽|\$|€|(?i:usd|eur|rub)\b|руб\.?(?![а-яё])|р\.|коп\.?(?![а-яё])|долл\.)"
+    # Порядок ветвей — приоритет: телефон раньше числа, дата раньше дроби.
+    # В ветвях нет вложенных неограниченных повторов, так что разбор линейный.
+    ALTERNATIVES = "|".join(
+        (
+            rf"(?P<phone>\+\d[\d  ()-]{{6,18}}\d|(?<!\d)[78]{_SPACE}?\(?\d{{3}}\)?[  -]?\d{{3}}[  -]?\d{{2}}[  -]?\d{{2}}(?!\d))",
+            r"(?P<date>(?<![\d.])(?P<date_day>0?[1-9]|[12]\d|3[01])\.(?P<date_month>0?[1-9]|1[0-2])\.(?P<date_year>\d{4})(?!\d))",
+            r"(?P<iso_date>(?<!\d)(?P<iso_year>\d{4})-(?P<iso_month>0[1-9]|1[0-2])-(?P<iso_day>0[1-9]|[12]\d|3[01])(?!\d))",
+            r"(?P<time>(?<![\d:])(?P<time_hours>[01]?\d|2[0-3]):(?P<time_minutes>[0-5]\d)(?![\d:]))",
+            rf"(?P<money_before>(?P<money_symbol>[$€₽]){_SPACE}?(?P<money_amount>{_AMOUNT}))",
+            rf"(?P<money_after>(?P<money_value>{_AMOUNT}){_SPACE}?(?P<money_unit>{_UNIT}))",
+            r"(?P<decimal>(?<![\d.,])(?P<decimal_int>\d+)[.,](?P<decimal_frac>\d+)(?![.,]?\d))",
+            r"(?P<ordinal>(?P<ordinal_value>\d+)-(?P<ordinal_suffix>ьего|ьей|ыми|ими|ого|его|ому|ему|ый|ий|ой|ая|ья|ое|ье|ую|ью|ые|ие|ых|их|ым|им|ом|ем|ей|ми|го|му|й|я|е|м|х|ю|и)(?![а-яё]))",
+            rf"(?P<integer>\d{{1,3}}(?:{_SPACE}\d{{3}})+(?!\d)|\d+)",
+        )
+    )
+    # С этих символов начинается любая ветвь. Проверка заранее избавляет
+    # от перебора всех ветвей на каждой позиции обычного текста.
+    FIRST_CHARS = r"\d+$€₽"
+    PATTERN = rf"(?=[{FIRST_CHARS}])(?:{ALTERNATIVES})"
+
     def __init__(self) -> None:
-        self._digit_re = re.compile(r"\d+")
+        self._number_re = re.compile(self.PATTERN)
+        self._space_re = re.compile(self._SPACE)
+        self._next_word_re = re.compile(r"[  ]+([а-яёА-ЯЁ]+\.?)")
+        self._previous_word_re = re.compile(rf"(?<![а-яёА-ЯЁ])([а-яёА-ЯЁ]+){self._SPACE}+$")
+        self._comma_thousands_re = re.compile(self._COMMA_THOUSANDS)
+        self._feminine_re = re.compile(
+            f"(?:{'|'.join(self._FEMININE_NOUNS)}){self._NOUN_ENDINGS}"
+        )
+        self._neuter_re = re.compile(f"(?:{'|'.join(self._NEUTER_NOUNS)}){self._NOUN_ENDINGS}")
+        self._handlers = {
+            "phone": self._phone,
+            "date": self._date,
+            "iso_date": self._iso_date,
+            "time": self._time,
+            "money_before": self._money_before,
+            "money_after": self._money_after,
+            "decimal": self._decimal,
+            "ordinal": self._ordinal,
+            "integer": self._integer,
+        }
 
     def normalize(self, text: str) -> str:
-        return self._digit_re.sub(self._replace, text)
+        return self._number_re.sub(self.verbalize, text)
 
-    def _replace(self, match: re.Match[str]) -> str:
-        return self._number_to_words(match.group(0))
+    def verbalize(self, match: re.Match[str]) -> str:
+        # match может прийти и из чужого регулярного выражения с теми же ветвями ALTERNATIVES.
+        return self._handlers[match.lastgroup](match)
 
     def _plural_form(self, value: int, forms: tuple[str, str, str]) -> str:
         value %= 100
@@ -102,7 +338,7 @@ class NumberNormalizer:
             return forms[1]
         return forms[2]
 
-    def _triplet_to_words(self, value: int, feminine: bool) -> list[str]:
+    def _triplet_to_words(self, value: int, gender: str) -> list[str]:
         words: list[str] = []
         hundreds = value // 100
         tens = (value // 10) % 10
@@ -115,14 +351,13 @@ class NumberNormalizer:
         if tens:
             words.append(self._TENS[tens])
         if ones:
-            ones_words = self._ONES_FEM if feminine else self._ONES
-            words.append(ones_words[ones])
+            words.append(self._ONES_BY_GENDER[gender][ones])
         return words
 
     def _spell_digits(self, number: str) -> str:
         return " ".join(self._DIGIT_WORDS[int(ch)] for ch in number)
 
-    def _number_to_words(self, number: str) -> str:
+    def number_to_words(self, number: str, gender: str = "m") -> str:
         if len(number) > 1 and number.startswith("0"):
             return self._spell_digits(number)
         try:
@@ -143,7 +378,168 @@ class NumberNormalizer:
             if group_value == 0:
                 continue
             group_name, feminine = self._GROUPS[idx]
-            words.extend(self._triplet_to_words(group_value, feminine))
+            group_gender = gender if idx == 0 else "f" if feminine else "m"
+            words.extend(self._triplet_to_words(group_value, group_gender))
             if group_name:
                 words.append(self._plural_form(group_value, group_name))
         return " ".join(words)
+
+    def ordinal_to_words(self, value: int, form: str = "m_nom") -> str:
+        if value >= 1000 ** len(self._ORDINAL_GROUPS):
+            return self.number_to_words(str(value))
+        if value == 0:
+            stem, kind = self._ORDINAL_ONES[0]
+            return stem + self._ORDINAL_ENDINGS[kind][form]
+        # Младшая ненулевая тройка становится порядковой, всё старше — количественное.
+        group = 0
+        while value % 1000 ** (group + 1) == 0:
+            group += 1
+        scale = 1000 ** group
+        count = (value // scale) % 1000
+        prefix = value - count * scale
+        words = [self.number_to_words(str(prefix))] if prefix else []
+        # Годы говорят «тысяча девятьсот девяностый», без «одна».
+        if words and words[0].startswith("одна тысяча"):
+            words[0] = words[0][len("одна ") :]
+        if group:
+            words.append(
+                self._genitive_compound(count) + self._ORDINAL_GROUPS[group]
+                + self._ORDINAL_ENDINGS["hard"][form]
+            )
+            return " ".join(words)
+        hundreds, rest = divmod(count, 100)
+        if not rest:
+            stem = self._GENITIVE_HUNDREDS[hundreds] if hundreds > 1 else ""
+            words.append(stem + "сот" + self._ORDINAL_ENDINGS["hard"][form])
+            return " ".join(words)
+        if hundreds:
+            words.append(self._HUNDREDS[hundreds])
+        tens, ones = divmod(rest, 10)
+        if tens == 1:
+            stem, kind = self._ORDINAL_TEENS[ones], "hard"
+        elif ones:
+            if tens:
+                words.append(self._TENS[tens])
+            stem, kind = self._ORDINAL_ONES[ones]
+        else:
+            stem, kind = self._ORDINAL_TENS[tens]
+        words.append(stem + self._ORDINAL_ENDINGS[kind][form])
+        return " ".join(words)
+
+    def _genitive_compound(self, count: int) -> str:
+        if count == 1:
+            return ""
+        hundreds, rest = divmod(count, 100)
+        tens, ones = divmod(rest, 10)
+        parts = [self._GENITIVE_HUNDREDS[hundreds]]
+        if tens == 1:
+            parts.append(self._GENITIVE_TEENS[ones])
+        else:
+            parts.extend((self._GENITIVE_TENS[tens], self._GENITIVE_ONES[ones]))
+        return "".join(parts)
+
+    def _counted(self, value: int, forms: tuple[str, str, str], gender: str) -> str:
+        return f"{self.number_to_words(str(value), gender)} {self._plural_form(value, forms)}"
+
+    def _phone(self, match: re.Match[str]) -> str:
+        phone = match.group("phone")
+        groups = re.findall(r"\d+", phone)
+        if len(groups) == 1 and len(groups[0]) == 11:
+            digits = groups[0]
+            groups = [digits[0], digits[1:4], digits[4:7], digits[7:9], digits[9:]]
+        words = [self.number_to_words(group) for group in groups]
+        if phone.startswith("+"):
+            words[0] = "плюс " + words[0]
+        return ", ".join(words)
+
+    def _date_words(self, match: re.Match[str], day: str, month: str, year: str) -> str:
+        # Предлог ищется в нескольких символах перед датой.
+        before = match.string[max(0, match.start() - 16) : match.start()]
+        preposition = self._previous_word_re.search(before)
+        form = "n_nom"
+        if preposition is not None:
+            form = self._DATE_CASES.get(preposition.group(1).lower(), form)
+        return " ".join(
+            (
+                self.ordinal_to_words(int(day), form),
+                self._MONTHS[int(month) - 1],
+                self.ordinal_to_words(int(year), "gen"),
+                "года",
+            )
+        )
+
+    def _date(self, match: re.Match[str]) -> str:
+        return self._date_words(
+            match, match.group("date_day"), match.group("date_month"), match.group("date_year")
+        )
+
+    def _iso_date(self, match: re.Match[str]) -> str:
+        return self._date_words(
+            match, match.group("iso_day"), match.group("iso_month"), match.group("iso_year")
+        )
+
+    def _time(self, match: re.Match[str]) -> str:
+        hours = int(match.group("time_hours"))
+        minutes = int(match.group("time_minutes"))
+        words = self._counted(hours, self._HOURS, "m")
+        if minutes:
+            words += " " + self._counted(minutes, self._MINUTES, "f")
+        return words
+
+    def _money(self, amount: str, unit: str) -> str:
+        unit = unit.lower()
+        if self._comma_thousands_re.fullmatch(amount):
+            amount = amount.replace(",", "")
+        amount = self._space_re.sub("", amount).replace(",", ".")
+        major, _, minor = amount.partition(".")
+        if unit.startswith("коп"):
+            forms, gender = self._CURRENCIES["RUB"][1]
+            return self._counted(int(major), forms, gender)
+        (major_forms, major_gender), (minor_forms, minor_gender) = self._CURRENCIES[
+            self._CURRENCY_UNITS[unit]
+        ]
+        words = self._counted(int(major), major_forms, major_gender)
+        if minor and int(minor):
+            cents = int(minor.ljust(2, "0"))
+            words += " " + self._counted(cents, minor_forms, minor_gender)
+        return words
+
+    def _money_before(self, match: re.Match[str]) -> str:
+        return self._money(match.group("money_amount"), match.group("money_symbol"))
+
+    def _money_after(self, match: re.Match[str]) -> str:
+        return self._money(match.group("money_value"), match.group("money_unit"))
+
+    def _decimal(self, match: re.Match[str]) -> str:
+        integer = match.group("decimal_int")
+        fraction = match.group("decimal_frac")
+        if len(fraction) > len(self._FRACTION_PARTS) or integer.startswith("0") and len(integer) > 1:
+            return f"{self.number_to_words(integer)} запятая {self.number_to_words(fraction)}"
+        words = self._counted(int(integer), self._INTEGER_PARTS, "f")
+        forms = self._FRACTION_PARTS[len(fraction) - 1]
+        return f"{words} {self._counted(int(fraction), forms, 'f')}"
+
+    def _ordinal(self, match: re.Match[str]) -> str:
+        form = self._ORDINAL_SUFFIXES[match.group("ordinal_suffix")]
+        return self.ordinal_to_words(int(match.group("ordinal_value")), form)
+
+    def _integer(self, match: re.Match[str]) -> str:
+        number = match.group("integer")
+        if not number.isdigit():
+            number = self._space_re.sub("", number)
+        following = self._next_word_re.match(match.string, match.end())
+        if following is None:
+            return self.number_to_words(number)
+        noun = following.group(1).lower()
+        # «2026 года» — год читается порядковым в падеже существительного.
+        if len(number) == 4 and noun in self._YEAR_NOUNS:
+            return self.ordinal_to_words(int(number), self._YEAR_NOUNS[noun])
+        if self._feminine_re.fullmatch(noun):
+            words = self.number_to_words(number, "f")
+            # Винительный падеж: «одну карту».
+            if noun.endswith(("у", "ю")) and words.endswith("одна"):
+                words = words[: -len("одна")] + "одну"
+            return words
+        if self._neuter_re.fullmatch(noun):
+            return self.number_to_words(number, "n")
+        return self.number_to_words(number)
@@ -0,0 +1,197 @@
+import queue
+import threading
+import time
+from collections import Counter
+
+from PySide6 import QtCore
+
+from phrase_store import PhraseStore
+from tracing import tracer
+
+
+class PersistenceWorker(QtCore.QObject):
+    # Имя списка, generation, строки, есть ли ещё.
+    pageLoaded = QtCore.Signal(str, int, list, bool)
+    phraseChanged = QtCore.Signal(dict)
+    phraseDeleted = QtCore.Signal(str)
+    sayCountsChanged = QtCore.Signal(dict)
+    phrasesInvalidated = QtCore.Signal()
+    searchResults = QtCore.Signal(int, list)
+    lexiconLoaded = QtCore.Signal(list)
+    categoriesLoaded = QtCore.Signal(list)
+    prewarmPhrasesLoaded = QtCore.Signal(list)
+    failed = QtCore.Signal(str)
+
+    # Сколько ждать следующих команд, чтобы записать их одной транзакцией.
+    COALESCE_SECONDS = 0.05
+    BATCH_LIMIT = 500
+
+    def __init__(self, store: PhraseStore) -> None:
+        super().__init__()
+        self.store = store
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def save_lexicon_entry(
+        self, term: str, replacement: str, abbreviation: bool, category_id: int | None
+    ) -> None:
+        self._queue.put(("save_lexicon", (term, replacement, abbreviation, category_id)))
+
+    def delete_lexicon_entry(self, term: str, category_id: int | None) -> None:
+        self._queue.put(("delete_lexicon", (term, category_id)))
+
+    def save_settings(self, values: dict[str, str]) -> None:
+        self._queue.put(("save_settings", (values,)))
+
+    def load_page(
+        self,
+        name: str,
+        generation: int,
+        category_id: int | None,
+        after: str | None,
+        limit: int,
+    ) -> None:
+        self._queue.put(("load_page", (name, generation, category_id, after, limit)))
+
+    def save_phrase(self, text: str, category_id: int) -> None:
+        self._queue.put(("save_phrase", (text, category_id)))
+
+    def increment_say_count(self, text: str) -> None:
+        self._queue.put(("increment", (text,)))
+
+    def delete_phrase(self, text: str) -> None:
+        self._queue.put(("delete_phrase", (text,)))
+
+    def favorite_phrase(self, text: str, category_id: int) -> None:
+        self._queue.put(("favorite_phrase", (text, category_id)))
+
+    def unfavorite_phrase(self, text: str) -> None:
+        self._queue.put(("unfavorite_phrase", (text,)))
+
+    def add_category(self, name: str) -> None:
+        self._queue.put(("add_category", (name,)))
+
+    def delete_category(self, category_id: int) -> None:
+        self._queue.put(("delete_category", (category_id,)))
+
+    def search(self, generation: int, query: str, limit: int) -> None:
+        self._queue.put(("search", (generation, query, limit)))
+
+    def load_prewarm_phrases(self, limit: int) -> None:
+        self._queue.put(("load_prewarm", (limit,)))
+
+    def flush(self) -> None:
+        done = threading.Event()
+        self._queue.put(("flush", (done,)))
+        done.wait()
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            command = self._queue.get()
+            if command is None:
+                return
+            batch = [command]
+            deadline = time.monotonic() + self.COALESCE_SECONDS
+            stop = False
+            while len(batch) < self.BATCH_LIMIT:
+                timeout = deadline - time.monotonic()
+                try:
+                    command = self._queue.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+                if command is None:
+                    stop = True
+                    break
+                batch.append(command)
+            try:
+                self._apply(batch)
+            except Exception as exc:
+                self.failed.emit(str(exc))
+            finally:
+                for name, args in batch:
+                    if name == "flush":
+                        args[0].set()
+            if stop:
+                return
+
+    def _apply(self, batch: list[tuple[str, tuple]]) -> None:
+        increments: Counter[str] = Counter()
+        changed: dict[str, None] = {}
+        pages: list[tuple] = []
+        search: tuple | None = None
+        reload_categories = False
+        reload_lexicon = False
+        invalidate = False
+        prewarm_limit = 0
+        with tracer.span("db_write"), self.store.batch():
+            for name, args in batch:
+                if name == "increment":
+                    increments[args[0]] += 1
+                elif name == "save_phrase":
+                    self.store.save_phrase(*args)
+                    changed[args[0]] = None
+                elif name == "delete_phrase":
+                    self.store.delete_phrase(*args)
+                    changed[args[0]] = None
+                elif name == "favorite_phrase":
+                    self.store.favorite_phrase(*args)
+                    changed[args[0]] = None
+                elif name == "unfavorite_phrase":
+                    self.store.unfavorite_phrase(*args)
+                    changed[args[0]] = None
+                elif name == "add_category":
+                    self.store.add_category(*args)
+                    reload_categories = True
+                elif name == "delete_category":
+                    self.store.delete_category(*args)
+                    reload_categories = invalidate = reload_lexicon = True
+                elif name == "save_lexicon":
+                    self.store.save_lexicon_entry(*args)
+                    reload_lexicon = True
+                elif name == "delete_lexicon":
+                    self.store.delete_lexicon_entry(*args)
+                    reload_lexicon = True
+                elif name == "save_settings":
+                    self.store.save_settings(*args)
+                elif name == "load_page":
+                    pages.append(args)
+                elif name == "search":
+                    # Из пачки запросов по мере ввода важен только последний.
+                    search = args
+                elif name == "load_prewarm":
+                    prewarm_limit = args[0]
+            # Инкременты идут последними: фраза могла быть вставлена в этой же пачке.
+            for text, amount in increments.items():
+                self.store.increment_say_count(text, amount)
+        if reload_categories:
+            self.categoriesLoaded.emit(self.store.categories())
+        if reload_lexicon:
+            self.lexiconLoaded.emit(self.store.lexicon_entries())
+        if invalidate:
+            # Фразы удалённой категории переехали — списки проще перечитать.
+            self.phrasesInvalidated.emit()
+        else:
+            for text in changed:
+                row = self.store.phrase_row(text)
+                if row is None:
+                    self.phraseDeleted.emit(text)
+                else:
+                    self.phraseChanged.emit(row)
+            counts = self.store.say_counts(
+                [text for text in increments if text not in changed]
+            )
+            if counts:
+                self.sayCountsChanged.emit(counts)
+        for name, generation, category_id, after, limit in pages:
+            rows = self.store.phrase_page(category_id, after, limit + 1)
+            self.pageLoaded.emit(name, generation, rows[:limit], len(rows) > limit)
+        if search is not None:
+            generation, query, limit = search
+            self.searchResults.emit(generation, self.store.search_phrases(query, limit))
+        if prewarm_limit:
+            self.prewarmPhrasesLoaded.emit(self.store.prewarm_phrases(prewarm_limit))
@@ -0,0 +1,148 @@
+import bisect
+
+from PySide6 import QtCore
+
+_ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
+)
+
+
+def sort_key(text: str) -> tuple[str, str]:
+    # Тот же порядок, что ORDER BY text COLLATE NOCASE, text в SQLite:
+    # NOCASE складывает регистр только у ASCII.
+    return text.translate(_ASCII_LOWER), text
+
+
+class PhraseListModel(QtCore.QAbstractListModel):
+    # generation, текст последней загруженной строки (или None для первой страницы).
+    pageRequested = QtCore.Signal(int, object)
+
+    TextRole = QtCore.Qt.UserRole + 1
+    SayCountRole = QtCore.Qt.UserRole + 2
+    FavoriteRole = QtCore.Qt.UserRole + 3
+    CreatedAtRole = QtCore.Qt.UserRole + 4
+    CategoryIdRole = QtCore.Qt.UserRole + 5
+
+    _ROLE_FIELDS = {
+        QtCore.Qt.DisplayRole: "text",
+        TextRole: "text",
+        SayCountRole: "say_count",
+        FavoriteRole: "favorite",
+        CreatedAtRole: "created_at",
+        CategoryIdRole: "category_id",
+    }
+
+    def __init__(self, page_size: int = 200, ordered: bool = True) -> None:
+        super().__init__()
+        self.page_size = page_size
+        # ordered=False — строки в чужом порядке (выдача поиска): модель их
+        # только обновляет и удаляет, но не вставляет новые.
+        self.ordered = ordered
+        self._rows: list[dict] = []
+        self._keys: list[tuple[str, str]] = []
+        self._has_more = False
+        self._fetching = False
+        self._generation = 0
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        field = self._ROLE_FIELDS.get(role)
+        return self._rows[index.row()][field] if field else None
+
+    def roleNames(self) -> dict[int, bytes]:
+        return {
+            QtCore.Qt.DisplayRole: b"display",
+            self.TextRole: b"text",
+            self.SayCountRole: b"sayCount",
+            self.FavoriteRole: b"favorite",
+            self.CreatedAtRole: b"createdAt",
+            self.CategoryIdRole: b"categoryId",
+        }
+
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and self._has_more and not self._fetching
+
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        after = self._rows[-1]["text"] if self._rows else None
+        self.pageRequested.emit(self._generation, after)
+
+    def reset(self, rows: list[dict] | None = None, has_more: bool = True) -> None:
+        # Без строк модель сама запрашивает первую страницу.
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = list(rows or [])
+        self._keys = [sort_key(row["text"]) for row in self._rows]
+        self._has_more = has_more
+        self._fetching = False
+        self.endResetModel()
+        if rows is None:
+            self.fetchMore()
+
+    def append_page(self, generation: int, rows: list[dict], has_more: bool) -> None:
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self._has_more = has_more
+        # Пока страница шла, точечные вставки могли уже добавить часть строк.
+        rows = [row for row in rows if self._find(row["text"]) < 0]
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self._keys.extend(sort_key(row["text"]) for row in rows)
+            self.endInsertRows()
+
+    def upsert(self, row: dict) -> None:
+        position = self._find(row["text"])
+        if position >= 0:
+            self._rows[position] = row
+            index = self.index(position)
+            self.dataChanged.emit(index, index)
+            return
+        if not self.ordered:
+            return
+        key = sort_key(row["text"])
+        # Строки за последней загруженной придут со следующими страницами.
+        if self._has_more and (not self._keys or key > self._keys[-1]):
+            return
+        position = bisect.bisect_left(self._keys, key)
+        self.beginInsertRows(QtCore.QModelIndex(), position, position)
+        self._rows.insert(position, row)
+        self._keys.insert(position, key)
+        self.endInsertRows()
+
+    def remove(self, text: str) -> None:
+        position = self._find(text)
+        if position < 0:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), position, position)
+        del self._rows[position]
+        del self._keys[position]
+        self.endRemoveRows()
+
+    def update_say_counts(self, counts: dict[str, int]) -> None:
+        for text, count in counts.items():
+            position = self._find(text)
+            if position < 0 or self._rows[position]["say_count"] == count:
+                continue
+            self._rows[position] = {**self._rows[position], "say_count": count}
+            index = self.index(position)
+            self.dataChanged.emit(index, index, [self.SayCountRole])
+
+    def _find(self, text: str) -> int:
+        if not self.ordered:
+            return next(
+                (i for i, row in enumerate(self._rows) if row["text"] == text), -1
+            )
+        key = sort_key(text)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return position
+        return -1
@@ -0,0 +1,483 @@
+import re
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_CATEGORY = "Разговор с Банком"
+
+
+def _migrate_base_schema(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+        """
+    )
+    connection.execute(
+        "INSERT OR IGNORE INTO categories(name) VALUES (?)",
+        (DEFAULT_CATEGORY,),
+    )
+    cursor = connection.execute(
+        "SELECT id FROM categories WHERE name = ?",
+        (DEFAULT_CATEGORY,),
+    )
+    default_category_id = cursor.fetchone()[0]
+    connection.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS phrases (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            say_count INTEGER NOT NULL DEFAULT 0,
+            category_id INTEGER NOT NULL DEFAULT {default_category_id},
+            is_favorite INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    # Базы, созданные до появления версий схемы, могут не иметь этих колонок.
+    cursor = connection.execute("PRAGMA table_info(phrases)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if "say_count" not in columns:
+        connection.execute(
+            "ALTER TABLE phrases ADD COLUMN say_count INTEGER NOT NULL DEFAULT 0"
+        )
+    if "category_id" not in columns:
+        connection.execute(
+            f"ALTER TABLE phrases ADD COLUMN category_id INTEGER NOT NULL DEFAULT {default_category_id}"
+        )
+    if "is_favorite" not in columns:
+        connection.execute(
+            "ALTER TABLE phrases ADD COLUMN is_favorite INTEGER NOT NULL DEFAULT 0"
+        )
+    connection.execute(
+        "UPDATE phrases SET category_id = ? WHERE category_id IS NULL",
+        (default_category_id,),
+    )
+
+
+def _migrate_indexes(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_phrases_category_text
+        ON phrases(category_id, text COLLATE NOCASE)
+        """
+    )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_phrases_favorite_text
+        ON phrases(text COLLATE NOCASE)
+        WHERE is_favorite = 1
+        """
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_phrases_say_count ON phrases(say_count)"
+    )
+
+
+def _migrate_keyset_indexes(connection: sqlite3.Connection) -> None:
+    # Полный порядок (text NOCASE, text) нужен для постраничной выборки по ключу.
+    connection.execute("DROP INDEX IF EXISTS idx_phrases_category_text")
+    connection.execute("DROP INDEX IF EXISTS idx_phrases_favorite_text")
+    connection.execute(
+        """
+        CREATE INDEX idx_phrases_category_text
+        ON phrases(category_id, text COLLATE NOCASE, text)
+        """
+    )
+    connection.execute(
+        """
+        CREATE INDEX idx_phrases_favorite_text
+        ON phrases(text COLLATE NOCASE, text)
+        WHERE is_favorite = 1
+        """
+    )
+
+
+# unicode61 не снимает диакритику с кириллицы, поэтому ё сводится к е явно.
+_FTS_TEXT = "replace(replace({}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _migrate_search_index(connection: sqlite3.Connection) -> None:
+    # Порядок выдачи поиска; он же нужен прогреву (say_count DESC).
+    connection.execute("DROP INDEX IF EXISTS idx_phrases_say_count")
+    connection.execute(
+        """
+        CREATE INDEX idx_phrases_rank
+        ON phrases(say_count DESC, created_at DESC, id DESC)
+        """
+    )
+    # prefix: отдельные индексы для коротких префиксов, которые вводят чаще всего.
+    try:
+        connection.execute(
+            """
+            CREATE VIRTUAL TABLE phrases_fts USING fts5(
+                text,
+                content = 'phrases',
+                content_rowid = 'id',
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '1 2'
+            )
+            """
+        )
+    except sqlite3.OperationalError:
+        # SQLite без FTS5: поиск откатится на LIKE.
+        return
+    new_text = _FTS_TEXT.format("new.text")
+    old_text = _FTS_TEXT.format("old.text")
+    connection.execute(
+        f"""
+        CREATE TRIGGER phrases_fts_insert AFTER INSERT ON phrases BEGIN
+            INSERT INTO phrases_fts(rowid, text) VALUES (new.id, {new_text});
+        END
+        """
+    )
+    connection.execute(
+        f"""
+        CREATE TRIGGER phrases_fts_delete AFTER DELETE ON phrases BEGIN
+            INSERT INTO phrases_fts(phrases_fts, rowid, text)
+            VALUES ('delete', old.id, {old_text});
+        END
+        """
+    )
+    connection.execute(
+        f"""
+        CREATE TRIGGER phrases_fts_update AFTER UPDATE OF text ON phrases BEGIN
+            INSERT INTO phrases_fts(phrases_fts, rowid, text)
+            VALUES ('delete', old.id, {old_text});
+            INSERT INTO phrases_fts(rowid, text) VALUES (new.id, {new_text});
+        END
+        """
+    )
+    # Не 'rebuild': он проиндексировал бы текст без замены ё.
+    connection.execute(
+        f"INSERT INTO phrases_fts(rowid, text) SELECT id, {_FTS_TEXT.format('text')} FROM phrases"
+    )
+
+
+def _migrate_lexicon(connection: sqlite3.Connection) -> None:
+    # category_id NULL — запись действует во всех категориях.
+    connection.execute(
+        """
+        CREATE TABLE lexicon (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            term TEXT NOT NULL,
+            replacement TEXT NOT NULL,
+            is_abbreviation INTEGER NOT NULL DEFAULT 0,
+            category_id INTEGER
+        )
+        """
+    )
+    connection.execute(
+        "CREATE UNIQUE INDEX idx_lexicon_term ON lexicon(term, ifnull(category_id, 0))"
+    )
+
+
+def _migrate_settings(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        "CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+    )
+
+
+# Номер версии схемы = индекс миграции + 1, хранится в PRAGMA user_version.
+MIGRATIONS = (
+    _migrate_base_schema,
+    _migrate_indexes,
+    _migrate_keyset_indexes,
+    _migrate_search_index,
+    _migrate_lexicon,
+    _migrate_settings,
+)
+
+_ROW_COLUMNS = "text, say_count, is_favorite, created_at, category_id"
+_SEARCH_ORDER = "ORDER BY say_count DESC, created_at DESC, id DESC"
+
+
+class PhraseStore:
+    # Начиная с этого числа совпадений дешевле идти по индексу ранга,
+    # чем сортировать все совпадения.
+    SEARCH_SCAN_THRESHOLD = 2000
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._connection = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=256
+        )
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._migrate()
+        self._has_fts = bool(
+            self._query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'phrases_fts'"
+            )
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _migrate(self) -> None:
+        with self._lock:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                with self._connection:
+                    migration(self._connection)
+                    self._connection.execute(f"PRAGMA user_version = {target}")
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            if self._batch_depth:
+                return self._connection.execute(sql, params).rowcount
+            with self._connection:
+                return self._connection.execute(sql, params).rowcount
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        # Все записи внутри блока уходят одной транзакцией.
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                if self._batch_depth > 1:
+                    yield
+                else:
+                    with self._connection:
+                        yield
+            finally:
+                self._batch_depth -= 1
+
+    def categories(self) -> list[tuple[int, str]]:
+        return self._query(
+            "SELECT id, name FROM categories ORDER BY name COLLATE NOCASE ASC"
+        )
+
+    def phrase_page(
+        self, category_id: int | None, after: str | None, limit: int
+    ) -> list[dict]:
+        # category_id=None — избранное. Страницы идут по ключу, а не по OFFSET.
+        where = ["category_id = ?"] if category_id is not None else ["is_favorite = 1"]
+        params: list = [category_id] if category_id is not None else []
+        if after is not None:
+            where.append(
+                "(text COLLATE NOCASE > ? OR (text COLLATE NOCASE = ? AND text > ?))"
+            )
+            params.extend((after, after, after))
+        params.append(limit)
+        rows = self._query(
+            f"""
+            SELECT {_ROW_COLUMNS}
+            FROM phrases
+            WHERE {" AND ".join(where)}
+            ORDER BY text COLLATE NOCASE ASC, text ASC
+            LIMIT ?
+            """,
+            tuple(params),
+        )
+        return [self._row(row) for row in rows]
+
+    def phrase_row(self, text: str) -> dict | None:
+        rows = self._query(
+            f"SELECT {_ROW_COLUMNS} FROM phrases WHERE text = ?", (text,)
+        )
+        return self._row(rows[0]) if rows else None
+
+    def say_counts(self, texts: list[str]) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for text in texts:
+            rows = self._query("SELECT say_count FROM phrases WHERE text = ?", (text,))
+            if rows:
+                counts[text] = rows[0][0]
+        return counts
+
+    @staticmethod
+    def _row(row: tuple) -> dict:
+        return {
+            "text": row[0],
+            "say_count": row[1],
+            "favorite": bool(row[2]),
+            "created_at": row[3] or "",
+            "category_id": row[4],
+        }
+
+    def search_phrases(self, query: str, limit: int = 50) -> list[dict]:
+        # Каждое слово запроса — префикс; выдача по частоте, затем по свежести.
+        words = re.findall(r"\w+", query.replace("ё", "е").replace("Ё", "Е"))
+        if not words:
+            return []
+        if not self._has_fts:
+            condition = " AND ".join("text LIKE ? ESCAPE '\\'" for _ in words)
+            params = tuple("%" + word.replace("_", r"\_") + "%" for word in words)
+            return self._search(condition, params, limit)
+        match = " ".join(f'"{word}"*' for word in words)
+        matches = self._query(
+            "SELECT count(*) FROM (SELECT 1 FROM phrases_fts WHERE phrases_fts MATCH ? LIMIT ?)",
+            (match, self.SEARCH_SCAN_THRESHOLD),
+        )[0][0]
+        condition = "id IN (SELECT rowid FROM phrases_fts WHERE phrases_fts MATCH ?)"
+        indexed_by = "INDEXED BY idx_phrases_rank" if matches >= self.SEARCH_SCAN_THRESHOLD else ""
+        return self._search(condition, (match,), limit, indexed_by)
+
+    def _search(
+        self, condition: str, params: tuple, limit: int, indexed_by: str = ""
+    ) -> list[dict]:
+        rows = self._query(
+            f"""
+            SELECT {_ROW_COLUMNS}
+            FROM phrases {indexed_by}
+            WHERE {condition}
+            {_SEARCH_ORDER}
+            LIMIT ?
+            """,
+            params + (limit,),
+        )
+        return [self._row(row) for row in rows]
+
+    def lexicon_entries(self) -> list[dict]:
+        rows = self._query(
+            """
+            SELECT term, replacement, is_abbreviation, category_id
+            FROM lexicon
+            ORDER BY term COLLATE NOCASE ASC
+            """
+        )
+        return [
+            {
+                "term": row[0],
+                "replacement": row[1],
+                "abbreviation": bool(row[2]),
+                "category_id": row[3],
+            }
+            for row in rows
+        ]
+
+    def save_lexicon_entry(
+        self,
+        term: str,
+        replacement: str,
+        abbreviation: bool = False,
+        category_id: int | None = None,
+    ) -> None:
+        with self.batch():
+            self.delete_lexicon_entry(term, category_id)
+            self._execute(
+                """
+                INSERT INTO lexicon(term, replacement, is_abbreviation, category_id)
+                VALUES (?, ?, ?, ?)
+                """,
+                (term, replacement, int(abbreviation), category_id),
+            )
+
+    def delete_lexicon_entry(self, term: str, category_id: int | None = None) -> None:
+        self._execute(
+            "DELETE FROM lexicon WHERE term = ? AND ifnull(category_id, 0) = ?",
+            (term, category_id or 0),
+        )
+
+    def settings(self) -> dict[str, str]:
+        return dict(self._query("SELECT key, value FROM settings"))
+
+    def save_settings(self, values: dict[str, str]) -> None:
+        with self.batch():
+            for key, value in values.items():
+                self._execute(
+                    "INSERT OR REPLACE INTO settings(key, value) VALUES (?, ?)",
+                    (key, value),
+                )
+
+    def prewarm_phrases(self, limit: int) -> list[str]:
+        favorites = self._query(
+            """
+            SELECT text
+            FROM phrases
+            WHERE is_favorite = 1
+            ORDER BY say_count DESC
+            """
+        )
+        top = self._query(
+            """
+            SELECT text
+            FROM phrases
+            WHERE say_count > 0
+            ORDER BY say_count DESC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        return list(dict.fromkeys(row[0] for row in favorites + top))
+
+    def export_phrases(self, category_id: int | None) -> list[str]:
+        if category_id is None:
+            rows = self._query(
+                "SELECT text FROM phrases WHERE is_favorite = 1 ORDER BY id"
+            )
+        else:
+            rows = self._query(
+                "SELECT text FROM phrases WHERE category_id = ? ORDER BY id",
+                (category_id,),
+            )
+        return [row[0] for row in rows]
+
+    def save_phrase(self, text: str, category_id: int) -> None:
+        self._execute(
+            """
+            INSERT INTO phrases(text, created_at, category_id)
+            VALUES(?, CURRENT_TIMESTAMP, ?)
+            ON CONFLICT(text)
+            DO UPDATE SET created_at = CURRENT_TIMESTAMP, category_id = excluded.category_id
+            """,
+            (text, category_id),
+        )
+
+    def increment_say_count(self, text: str, amount: int = 1) -> None:
+        self._execute(
+            "UPDATE phrases SET say_count = say_count + ? WHERE text = ?",
+            (amount, text),
+        )
+
+    def delete_phrase(self, text: str) -> None:
+        self._execute("DELETE FROM phrases WHERE text = ?", (text,))
+
+    def favorite_phrase(self, text: str, category_id: int) -> None:
+        self._execute(
+            """
+            INSERT INTO phrases(text, created_at, category_id, is_favorite)
+            VALUES(?, CURRENT_TIMESTAMP, ?, 1)
+            ON CONFLICT(text)
+            DO UPDATE SET is_favorite = 1
+            """,
+            (text, category_id),
+        )
+
+    def unfavorite_phrase(self, text: str) -> None:
+        self._execute("UPDATE phrases SET is_favorite = 0 WHERE text = ?", (text,))
+
+    def add_category(self, name: str) -> None:
+        self._execute("INSERT OR IGNORE INTO categories(name) VALUES (?)", (name,))
+
+    def delete_category(self, category_id: int) -> None:
+        with self.batch():
+            cursor = self._connection.execute(
+                "SELECT id FROM categories WHERE name = ?",
+                (DEFAULT_CATEGORY,),
+            )
+            default_category_id = cursor.fetchone()[0]
+            if category_id == default_category_id:
+                return
+            self._connection.execute(
+                "UPDATE phrases SET category_id = ? WHERE category_id = ?",
+                (default_category_id, category_id),
+            )
+            self._connection.execute(
+                "DELETE FROM lexicon WHERE category_id = ?", (category_id,)
+            )
+            self._connection.execute(
+                "DELETE FROM categories WHERE id = ?", (category_id,)
+            )
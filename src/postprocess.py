@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+
+
+class PostConfig:
+    # Обработка каждого синтезированного куска до кэша: обрезка тишины по краям,
+    # громкость к целевому LUFS (0 — выключено) и растяжение по времени без
+    # сдвига высоты, если модель сама не умеет менять темп.
+    DEFAULTS = {
+        "trim_silence": False,
+        "loudness_lufs": 0,
+        "time_stretch": True,
+    }
+    TRIM_THRESHOLD_DB = -50.0
+    TRIM_MARGIN_SECONDS = 0.02
+    PEAK_LIMIT_DB = -1.0
+
+    def __init__(
+        self, trim_silence: bool = False, loudness_lufs: int = 0, time_stretch: bool = True
+    ) -> None:
+        self.trim_silence = trim_silence
+        self.loudness_lufs = min(0, max(-40, loudness_lufs))
+        self.time_stretch = time_stretch
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, str]) -> PostConfig:
+        values = {}
+        for name, default in cls.DEFAULTS.items():
+            try:
+                raw = int(settings[f"post.{name}"])
+            except (KeyError, ValueError):
+                continue
+            values[name] = bool(raw) if isinstance(default, bool) else raw
+        return cls(**values)
+
+    def to_settings(self) -> dict[str, str]:
+        return {f"post.{name}": str(int(getattr(self, name))) for name in self.DEFAULTS}
+
+    def replace(self, **values) -> PostConfig:
+        current = {name: getattr(self, name) for name in self.DEFAULTS}
+        current.update(values)
+        return PostConfig(**current)
+
+    def variant(self, stretching: bool) -> str:
+        # Пустая строка — звук как без обработки: старые записи кэша остаются годными.
+        parts = []
+        if self.trim_silence:
+            parts.append("trim")
+        if self.loudness_lufs:
+            parts.append(f"lufs{self.loudness_lufs}")
+        if stretching:
+            parts.append("stretch")
+        return "post:" + ",".join(parts) if parts else ""
+
+    def process(self, audio: np.ndarray, sample_rate: int, stretch: float = 1.0) -> np.ndarray:
+        if not audio.size:
+            return audio
+        if self.trim_silence:
+            audio = trim_silence(
+                audio, sample_rate, self.TRIM_THRESHOLD_DB, self.TRIM_MARGIN_SECONDS
+            )
+        if stretch != 1.0:
+            audio = time_stretch(audio, stretch, sample_rate)
+        if self.loudness_lufs:
+            audio = normalize_loudness(
+                audio, sample_rate, self.loudness_lufs, self.PEAK_LIMIT_DB
+            )
+        return audio
+
+
+def trim_silence(
+    audio: np.ndarray, sample_rate: int, threshold_db: float, margin_seconds: float
+) -> np.ndarray:
+    # Пики по кадрам 10 мс одним reshape; возвращается вид, без копии.
+    frame = sample_rate // 100
+    count = audio.size // frame
+    if not count:
+        return audio
+    peaks = np.abs(audio[: count * frame]).reshape(count, frame).max(axis=1)
+    loud = np.flatnonzero(peaks > 10 ** (threshold_db / 20))
+    if not loud.size:
+        return audio
+    margin = int(sample_rate * margin_seconds)
+    start = max(0, loud[0] * frame - margin)
+    end = min(audio.size, (loud[-1] + 1) * frame + margin)
+    return audio[start:end]
+
+
+# Коэффициенты K-фильтра ITU-R BS.1770 для 48 кГц: полка + ФВЧ.
+_K_SHELF = (
+    (1.53512485958697, -2.69169618940638, 1.19839281085285),
+    (1.0, -1.69065929318241, 0.73248077421585),
+)
+_K_HIGHPASS = (
+    (1.0, -2.0, 1.0),
+    (1.0, -1.99004745483398, 0.99007225036621),
+)
+
+
+def _fft_size(size: int) -> int:
+    # Ближайшая сверху длина из множителей 2, 3, 5: на длинных кусках до двух
+    # раз быстрее степени двойки. Запас 50 мс не даёт отклику фильтра
+    # завернуться с конца на начало.
+    best = 1 << max(0, int(size - 1).bit_length())
+    fives = 1
+    while fives < best:
+        threes = fives
+        while threes < best:
+            candidate = threes << max(0, int(-(-size // threes) - 1).bit_length())
+            best = min(best, candidate)
+            threes *= 3
+        fives *= 5
+    return best
+
+
+@lru_cache(maxsize=16)
+def _k_weighting(size: int, sample_rate: int) -> np.ndarray:
+    # АЧХ K-фильтра на сетке rfft. Фаза для громкости не важна, поэтому
+    # фильтруем умножением спектра — вместо рекурсивного фильтра по отсчётам.
+    z = np.exp(-1j * np.pi * np.fft.rfftfreq(size, 1.0 / sample_rate) / (sample_rate / 2))
+    response = np.ones_like(z)
+    for b, a in (_K_SHELF, _K_HIGHPASS):
+        response *= np.polyval(b[::-1], z) / np.polyval(a[::-1], z)
+    return np.abs(response).astype(np.float32)
+
+
+def integrated_loudness(audio: np.ndarray, sample_rate: int) -> float:
+    # BS.1770: блоки 400 мс с шагом 100 мс, абсолютный порог -70 LUFS
+    # и относительный на 10 LU ниже средней громкости.
+    size = _fft_size(audio.size + sample_rate // 20)
+    weighted = np.fft.irfft(
+        np.fft.rfft(audio, size) * _k_weighting(size, sample_rate), size
+    )[: audio.size]
+    energy = np.concatenate(([0.0], np.cumsum(np.square(weighted, dtype=np.float64))))
+    block = int(sample_rate * 0.4)
+    if audio.size <= block:
+        powers = np.array([energy[-1] / audio.size])
+    else:
+        starts = np.arange(0, audio.size - block + 1, sample_rate // 10)
+        powers = (energy[starts + block] - energy[starts]) / block
+    powers = powers[powers > 10 ** ((-70 + 0.691) / 10)]
+    if not powers.size:
+        return -70.0
+    relative = -0.691 + 10 * np.log10(powers.mean()) - 10
+    gated = powers[powers > 10 ** ((relative + 0.691) / 10)]
+    return float(-0.691 + 10 * np.log10((gated if gated.size else powers).mean()))
+
+
+def normalize_loudness(
+    audio: np.ndarray, sample_rate: int, target_lufs: float, peak_limit_db: float
+) -> np.ndarray:
+    loudness = integrated_loudness(audio, sample_rate)
+    if loudness <= -70.0:
+        return audio
+    gain = 10 ** ((target_lufs - loudness) / 20)
+    # Усиление не доводит пик до клиппинга — лучше тише цели, чем с хрипом.
+    peak = float(np.abs(audio).max())
+    if peak * gain > 10 ** (peak_limit_db / 20):
+        gain = 10 ** (peak_limit_db / 20) / peak
+    return (audio * np.float32(gain)).astype(np.float32, copy=False)
+
+
+def time_stretch(audio: np.ndarray, speed: float, sample_rate: int) -> np.ndarray:
+    # WSOLA: окна Ханна по 20 мс с перекрытием 50 % берутся из входа с шагом
+    # hop*speed; сдвиг каждого окна в пределах ±10 мс подбирается по корреляции
+    # с естественным продолжением предыдущего — высота голоса не меняется.
+    # Корреляция считается на прореженном в 4 раза сигнале.
+    decimate = 4
+    window = sample_rate // 50 // (2 * decimate) * 2 * decimate
+    hop = window // 2
+    tolerance = sample_rate // 100 // decimate * decimate
+    if audio.size < window or speed <= 0:
+        return audio
+    analysis_hop = hop * speed
+    out_size = int(audio.size / speed)
+    frames = out_size // hop + 1
+    pad = tolerance + window
+    tail = pad + int(analysis_hop) + 2 * window
+    source = np.zeros(pad + audio.size + tail, dtype=np.float32)
+    source[pad : pad + audio.size] = audio
+    coarse = np.ascontiguousarray(source[::decimate])
+    width = window // decimate
+    last = len(coarse) - width
+    fade = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(window) / window)).astype(np.float32)
+    out = np.zeros(frames * hop + window, dtype=np.float32)
+    offset = 0
+    for frame in range(frames):
+        position = pad + int(round(frame * analysis_hop)) + offset
+        out[frame * hop : frame * hop + window] += source[position : position + window] * fade
+        nominal = pad + int(round((frame + 1) * analysis_hop))
+        low = (nominal - tolerance) // decimate
+        high = min((nominal + tolerance) // decimate, last)
+        # Образец — то, что шло бы во входе сразу за только что взятым окном.
+        natural = min((position + hop) // decimate, last)
+        scores = np.correlate(
+            coarse[low : high + width], coarse[natural : natural + width], "valid"
+        )
+        offset = (low + int(np.argmax(scores))) * decimate - nominal
+    return out[:out_size]
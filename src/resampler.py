@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+
+
+class Resampler:
+    # Потоковая передискретизация windowed-sinc фильтром: куски подаются
+    # по мере синтеза, хвост предыдущего куска хранится как история,
+    # поэтому на стыках нет щелчков, а память не растёт с длиной текста.
+    HALF_WIDTH = 16
+    BLOCK = 4096
+
+    def __init__(self, source_rate: int, target_rate: int) -> None:
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        # Позиции считаем в целых долях 1/up входного отсчёта — без накопления ошибки.
+        common = math.gcd(source_rate, target_rate)
+        self._up = target_rate // common
+        self._down = source_rate // common
+        # При понижении частоты срез ниже новой частоты Найквиста — против алиасинга.
+        cutoff = min(1.0, target_rate / source_rate) * 0.94
+        self._half = math.ceil(self.HALF_WIDTH / cutoff)
+        self._offsets = np.arange(1 - self._half, self._half + 1)
+        # Веса для каждой из up дробных фаз считаются один раз.
+        distance = np.arange(self._up)[:, None] / self._up - self._offsets
+        self._weights = (
+            cutoff
+            * np.sinc(cutoff * distance)
+            * (0.5 + 0.5 * np.cos(np.pi * distance / self._half))
+        ).astype(np.float32)
+        self._history = np.zeros(self._half, dtype=np.float32)
+        self._position = self._half * self._up
+
+    @property
+    def passthrough(self) -> bool:
+        return self.source_rate == self.target_rate
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        if self.passthrough:
+            return audio
+        buffer = np.concatenate([self._history, audio.astype(np.float32, copy=False)])
+        # Отсчёт можно посчитать, когда справа от него уже есть half входных.
+        limit = (len(buffer) - self._half) * self._up
+        count = max(0, -(-(limit - self._position) // self._down))
+        out = np.empty(count, dtype=np.float32)
+        for start in range(0, count, self.BLOCK):
+            positions = self._position + np.arange(
+                start, min(count, start + self.BLOCK), dtype=np.int64
+            ) * self._down
+            index = (positions // self._up)[:, None] + self._offsets
+            weights = self._weights[positions % self._up]
+            out[start : start + len(positions)] = np.einsum("ij,ij->i", buffer[index], weights)
+        position = self._position + count * self._down
+        keep_from = max(0, position // self._up - self._half + 1)
+        self._history = buffer[keep_from:].copy()
+        self._position = position - keep_from * self._up
+        return out
+
+    def flush(self) -> np.ndarray:
+        # Досчитывает последние отсчёты, для которых не хватало правого контекста.
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        return self.process(np.zeros(self._half, dtype=np.float32))
+
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    resampler = Resampler(source_rate, target_rate)
+    if resampler.passthrough:
+        return audio
+    return np.concatenate([resampler.process(audio), resampler.flush()])
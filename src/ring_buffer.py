@@ -0,0 +1,41 @@
+import numpy as np
+
+
+class RingBuffer:
+    # Позиции абсолютные (сколько отсчётов записано/прочитано за всё время),
+    # поэтому границы фраз можно хранить как числа и сравнивать без учёта заворота.
+    # Синхронизация — на вызывающей стороне.
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.read_pos = 0
+        self.write_pos = 0
+
+    @property
+    def available(self) -> int:
+        return self.write_pos - self.read_pos
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.available
+
+    def write(self, samples: np.ndarray) -> int:
+        count = min(len(samples), self.free)
+        start = self.write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start : start + first] = samples[:first]
+        self._data[: count - first] = samples[first:count]
+        self.write_pos += count
+        return count
+
+    def read_into(self, out: np.ndarray, limit: int) -> int:
+        count = min(len(out), self.available, limit)
+        start = self.read_pos % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._data[start : start + first]
+        out[first:count] = self._data[: count - first]
+        self.read_pos += count
+        return count
+
+    def skip_to(self, position: int) -> None:
+        self.read_pos = min(max(position, self.read_pos), self.write_pos)
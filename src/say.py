@@ -1,39 +1,61 @@
+import time
+
+_started_at = time.perf_counter()
+
 import sys
 from pathlib import Path
-import torch
-from PySide6 import QtGui, QtQml
+from PySide6 import QtCore, QtGui, QtQml
 
+from model_load_task import ModelLoadTask
+from tracing import tracer
 from tts_bridge import TtsBridge
 
-# 1) Грузим из torch.hub (первый запуск скачает репозиторий/модели)
-loaded = torch.hub.load(
-    repo_or_dir="snakers4/silero-models",
-    model="silero_tts",
-    language="ru",
-    speaker="v3_1_ru",
-    trust_repo=True,  # чтобы не спрашивал в будущем
-)
 
-# 2) torch.hub иногда возвращает tuple: (model, example_text, ...)
-#    Приводим к "model"
-model = loaded[0] if isinstance(loaded, (tuple, list)) else loaded
+def _elapsed_ms(since: float) -> float:
+    return (time.perf_counter() - since) * 1000
+
+
+def _print_startup_timings(bridge: TtsBridge) -> None:
+    # Один раз, когда модель загрузилась, и только с TALKER_TRACE: обычный
+    # запуск stderr не засоряет, а тайминги всё равно видны в startupTimings.
+    if tracer.enabled and not bridge.modelLoading:
+        print(f"startup timings, ms: {bridge.startupTimings}", file=sys.stderr)
+
 
-# 3) Настройки
 def main() -> int:
+    imports_ms = _elapsed_ms(_started_at)
     app = QtGui.QGuiApplication(sys.argv)
     icon_path = Path(__file__).resolve().parent / "app_icon.xpm"
     if icon_path.exists():
         app.setWindowIcon(QtGui.QIcon(str(icon_path)))
     engine = QtQml.QQmlApplicationEngine()
 
-    bridge = TtsBridge(model)
+    phase_started_at = time.perf_counter()
+    bridge = TtsBridge()
+    bridge.record_startup_phase("imports", imports_ms)
+    bridge.record_startup_phase("bridge", _elapsed_ms(phase_started_at))
     engine.rootContext().setContextProperty("tts", bridge)
 
+    phase_started_at = time.perf_counter()
     qml_path = Path(__file__).resolve().parent / "Main.qml"
     engine.load(str(qml_path))
     if not engine.rootObjects():
         return 1
+    bridge.record_startup_phase("qml", _elapsed_ms(phase_started_at))
+    bridge.record_startup_phase("window", _elapsed_ms(_started_at))
+
+    # Модель грузим в фоне: окно уже на экране и показывает modelLoading.
+    load_task = ModelLoadTask(config=bridge.engine_config)
+    load_task.phaseTimed.connect(bridge.record_startup_phase)
+    load_task.loaded.connect(bridge.setModel)
+    load_task.failed.connect(bridge.setModelError)
+    bridge.modelLoadingChanged.connect(lambda: _print_startup_timings(bridge))
+    QtCore.QThreadPool.globalInstance().start(load_task)
+
+    # Прогреваем кэш избранным и частыми фразами, когда модель загрузится.
+    QtCore.QTimer.singleShot(0, bridge.startPrewarm)
 
+    app.aboutToQuit.connect(bridge.shutdown)
     return app.exec()
 
 
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+
+from text_splitter import CLAUSE, CUT, SENTENCE
+
+
+class StitchConfig:
+    # По умолчанию — прежняя склейка: 50 мс тишины после каждого куска.
+    DEFAULTS = {
+        "sentence_pause_ms": 50,
+        "clause_pause_ms": 50,
+        "crossfade_ms": 0,
+    }
+    MAX_MS = 2000
+
+    def __init__(
+        self, sentence_pause_ms: int = 50, clause_pause_ms: int = 50, crossfade_ms: int = 0
+    ) -> None:
+        self.sentence_pause_ms = min(max(0, sentence_pause_ms), self.MAX_MS)
+        self.clause_pause_ms = min(max(0, clause_pause_ms), self.MAX_MS)
+        # Перекрытие кусков, разрезанных посреди предложения по длине.
+        self.crossfade_ms = min(max(0, crossfade_ms), 100)
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, str]) -> StitchConfig:
+        values = {}
+        for name in cls.DEFAULTS:
+            try:
+                values[name] = int(settings[f"audio.{name}"])
+            except (KeyError, ValueError):
+                continue
+        return cls(**values)
+
+    def to_settings(self) -> dict[str, str]:
+        return {f"audio.{name}": str(getattr(self, name)) for name in self.DEFAULTS}
+
+    def replace(self, **values: int) -> StitchConfig:
+        # Конфигурация не меняется на месте: её держат задачи в других потоках.
+        current = {name: getattr(self, name) for name in self.DEFAULTS}
+        current.update(values)
+        return StitchConfig(**current)
+
+    def variant(self) -> str:
+        # Часть ключа кэша: звук с другими паузами — другая запись.
+        if all(getattr(self, name) == value for name, value in self.DEFAULTS.items()):
+            return ""
+        return f"stitch:{self.sentence_pause_ms}/{self.clause_pause_ms}/{self.crossfade_ms}"
+
+
+class Stitcher:
+    # Склеивает куски по мере их готовности: в памяти только хвост
+    # под перекрытие, тишина — виды на один общий нулевой буфер.
+    def __init__(
+        self, write: Callable[[np.ndarray], None], sample_rate: int, config: StitchConfig
+    ) -> None:
+        self._write = write
+        self._pauses = {
+            SENTENCE: sample_rate * config.sentence_pause_ms // 1000,
+            CLAUSE: sample_rate * config.clause_pause_ms // 1000,
+        }
+        self._crossfade = sample_rate * config.crossfade_ms // 1000
+        # Без перекрытия разрез по длине склеивается как граница части предложения.
+        self._pauses[CUT] = 0 if self._crossfade else self._pauses[CLAUSE]
+        self._silence = np.zeros(max(self._pauses.values()), dtype=np.float32)
+        self._ramp = np.linspace(0.0, 1.0, self._crossfade, dtype=np.float32)
+        self._held: np.ndarray | None = None
+
+    def add(self, audio: np.ndarray, boundary: str) -> None:
+        if not audio.size:
+            return
+        start = 0
+        if self._held is not None:
+            held, self._held = self._held, None
+            start = min(held.size, audio.size)
+            ramp = self._ramp[: start]
+            blended = held[:start] * (1.0 - ramp) + audio[:start] * ramp
+            self._write(blended)
+            if held.size > start:
+                self._write(held[start:])
+        if boundary == CUT and self._crossfade and audio.size - start > self._crossfade:
+            end = audio.size - self._crossfade
+            self._write(audio[start:end])
+            self._held = audio[end:]
+            return
+        if start < audio.size:
+            self._write(audio[start:])
+        pause = self._pauses[boundary]
+        if pause:
+            self._write(self._silence[:pause])
+
+    def close(self) -> None:
+        if self._held is not None:
+            self._write(self._held)
+            self._held = None
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import inspect
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from audio_cache import AudioCache
+from engine_config import is_quantized
+from model_loader import DEFAULT_PACKAGE
+from postprocess import PostConfig
+from stitcher import StitchConfig, Stitcher
+from text_splitter import SENTENCE, split_chunks, split_segments
+from tracing import tracer
+
+if TYPE_CHECKING:
+    import torch
+
+SAMPLE_RATE = 48000  # 24000/48000 зависит от модели, 48000 обычно ок
+
+
+def cache_key(
+    text: str, speaker: str, speed: float, variant: str = "", model: str = ""
+) -> str:
+    return AudioCache.make_key(text, speaker, speed, SAMPLE_RATE, variant, model)
+
+
+class SynthesisEngine:
+    # Appended a short silence tail to generated TTS audio to reduce clipped final letters.
+    TAIL_SECONDS = 0.05
+    # Дольше этого потоковая запись не копит звук ради кэша — память не растёт.
+    CACHE_LIMIT_SECONDS = 120
+
+    def __init__(
+        self,
+        tts_model: torch.nn.Module,
+        post: PostConfig | None = None,
+        package: str = DEFAULT_PACKAGE,
+    ) -> None:
+        import torch
+
+        self.tts_model = tts_model
+        # Пакет и int8-веса звучат по-разному — у каждого свои записи в кэше.
+        self.model_id = f"{package}+int8" if is_quantized(tts_model) else package
+        self._apply_tts = tts_model.apply_tts
+        # Сигнатура модели не меняется — смотрим её один раз, а не на каждую фразу.
+        try:
+            parameters = inspect.signature(self._apply_tts).parameters
+        except (TypeError, ValueError):
+            parameters = {}
+        self.supports_speed = "speed" in parameters
+        self._inference_mode = torch.inference_mode
+        self._tail = int(SAMPLE_RATE * self.TAIL_SECONDS)
+        # Заменяется целиком (не правится на месте) — задачи в других потоках
+        # читают её без замков.
+        self.post = post or PostConfig()
+
+    def sample_rate(self, speed: float) -> int:
+        # Без растяжения темп меняется частотой воспроизведения — вместе с высотой.
+        if not self.supports_speed and speed != 1.0 and not self.post.time_stretch:
+            return int(SAMPLE_RATE * speed)
+        return SAMPLE_RATE
+
+    def cache_key(self, text: str, speaker: str, speed: float, variant: str = "") -> str:
+        post = self.post.variant(self._stretch(speed) != 1.0)
+        variant = "+".join(v for v in (post, variant) if v)
+        return cache_key(text, speaker, speed, variant, self.model_id)
+
+    def synthesize(
+        self,
+        text: str,
+        speaker: str,
+        speed: float,
+        cache: AudioCache | None = None,
+    ) -> tuple[np.ndarray, int]:
+        # Любой путь — целиком, потоком, прогрев, запись в файл — режет текст
+        # одинаково (split_chunks, пауза после куска), так что у ключа кэша
+        # всегда один и тот же звук, кто бы его ни положил первым.
+        chunks = split_chunks(text)
+        if len(chunks) > 1:
+            return self.synthesize_chunked(text, speaker, speed, cache)
+        key = self.cache_key(text, speaker, speed)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        chunk = chunks[0] if chunks else text
+        out = self._with_tail(self._process(self._infer(chunk, speaker, speed), speed))
+        sample_rate = self.sample_rate(speed)
+        if cache is not None:
+            cache.put(key, out, sample_rate)
+        return out, sample_rate
+
+    def synthesize_chunked(
+        self,
+        text: str,
+        speaker: str,
+        speed: float,
+        cache: AudioCache | None = None,
+        gate: threading.Event | None = None,
+    ) -> tuple[np.ndarray, int]:
+        key = self.cache_key(text, speaker, speed)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        parts: list[np.ndarray] = []
+        for chunk in split_chunks(text) or [text]:
+            # Фоновая задача уступает модель интерактивной между кусками.
+            if gate is not None:
+                gate.wait()
+            parts.append(self._process(self._infer(chunk, speaker, speed), speed))
+        # Куски пишутся прямо в итоговый массив, хвост тишины — после каждого.
+        tail = self._tail
+        total = sum(part.size + (tail if part.size else 0) for part in parts)
+        out = np.empty(total, dtype=np.float32)
+        position = 0
+        for part in parts:
+            if not part.size:
+                continue
+            out[position : position + part.size] = part
+            position += part.size
+            out[position : position + tail] = 0.0
+            position += tail
+        sample_rate = self.sample_rate(speed)
+        if cache is not None:
+            cache.put(key, out, sample_rate)
+        return out, sample_rate
+
+    def synthesize_into(
+        self,
+        write: Callable[[np.ndarray], None],
+        text: str,
+        speaker: str,
+        speed: float,
+        cache: AudioCache | None = None,
+        gate: threading.Event | None = None,
+        workers: int = 1,
+        stitch: StitchConfig | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> None:
+        # Куски уходят в write по порядку сразу после синтеза; частота — sample_rate(speed).
+        stitch = stitch or StitchConfig()
+        key = self.cache_key(text, speaker, speed, stitch.variant())
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                write(cached[0])
+                return
+        parts: list[np.ndarray] | None = [] if cache is not None else None
+        budget = self.CACHE_LIMIT_SECONDS * SAMPLE_RATE
+
+        def collect(audio: np.ndarray) -> None:
+            nonlocal parts, budget
+            write(audio)
+            if parts is not None:
+                budget -= audio.size
+                if budget >= 0:
+                    parts.append(audio)
+                else:
+                    parts = None
+
+        stitcher = Stitcher(collect, SAMPLE_RATE, stitch)
+        segments = split_segments(text) or [(text, SENTENCE)]
+        for audio, boundary in self._render(segments, speaker, speed, gate, workers, cancelled):
+            with tracer.span("stitch"):
+                stitcher.add(audio, boundary)
+        if cancelled is not None and cancelled.is_set():
+            # Прерванный рендер неполон: в кэш он не идёт.
+            return
+        stitcher.close()
+        if parts:
+            cache.put(key, np.concatenate(parts), self.sample_rate(speed))
+
+    def _render(
+        self,
+        segments: list[tuple[str, str]],
+        speaker: str,
+        speed: float,
+        gate: threading.Event | None,
+        workers: int,
+        cancelled: threading.Event | None = None,
+    ) -> Iterator[tuple[np.ndarray, str]]:
+        def stopped() -> bool:
+            return cancelled is not None and cancelled.is_set()
+
+        def infer(chunk: str) -> np.ndarray:
+            # Фоновая задача уступает модель интерактивной между кусками.
+            if gate is not None:
+                gate.wait()
+            if stopped():
+                return np.zeros(0, dtype=np.float32)
+            return self._process(self._infer(chunk, speaker, speed), speed)
+
+        # Обычная короткая фраза — один кусок и ни одного лишнего потока.
+        workers = min(workers, len(segments))
+        if workers <= 1:
+            for chunk, boundary in segments:
+                if stopped():
+                    return
+                yield infer(chunk), boundary
+            return
+        # Окно из 2*workers кусков: все потоки заняты, а память не растёт
+        # с длиной текста — готовые куски уходят в запись по порядку.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: deque = deque()
+            for chunk, boundary in segments:
+                if stopped():
+                    break
+                pending.append((executor.submit(infer, chunk), boundary))
+                if len(pending) >= 2 * workers:
+                    future, ready = pending.popleft()
+                    yield future.result(), ready
+            while pending:
+                future, ready = pending.popleft()
+                if stopped():
+                    future.cancel()
+                    continue
+                yield future.result(), ready
+
+    def warm_up(self, text: str) -> None:
+        speakers = list(getattr(self.tts_model, "speakers", []))
+        speaker = "aidar" if "aidar" in speakers or not speakers else speakers[0]
+        self._infer(text, speaker, 1.0)
+
+    def _with_tail(self, audio: np.ndarray) -> np.ndarray:
+        # Выход модели копируется ровно один раз — сразу в массив с запасом под тишину.
+        if not audio.size:
+            return audio
+        out = np.empty(audio.size + self._tail, dtype=np.float32)
+        out[: audio.size] = audio
+        out[audio.size :] = 0.0
+        return out
+
+    def _stretch(self, speed: float) -> float:
+        if self.supports_speed or speed == 1.0 or not self.post.time_stretch:
+            return 1.0
+        return speed
+
+    def _process(self, audio: np.ndarray, speed: float) -> np.ndarray:
+        # Один раз после синтеза, до кэша: из кэша звук идёт уже обработанным.
+        with tracer.span("postprocess"):
+            return self.post.process(audio, SAMPLE_RATE, self._stretch(speed))
+
+    def _infer(self, text: str, speaker: str, speed: float) -> np.ndarray:
+        kwargs = {"text": text, "speaker": speaker, "sample_rate": SAMPLE_RATE}
+        if self.supports_speed:
+            kwargs["speed"] = speed
+        with tracer.span("inference"), self._inference_mode():
+            audio = self._apply_tts(**kwargs)
+        # numpy() — вид на память тензора, без копии; astype копирует только не-float32.
+        return audio.numpy().reshape(-1).astype(np.float32, copy=False)
@@ -0,0 +1,191 @@
+import argparse
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+from audio_cache import AudioCache
+from audio_encoders import FORMATS, SAMPLE_RATES, available_formats
+from audio_io import pcm16_view, phrase_file_name
+from engine_config import EngineConfig
+from model_loader import load_model
+from postprocess import PostConfig
+from resampler import Resampler
+from stitcher import StitchConfig
+from synthesis import SAMPLE_RATE, SynthesisEngine
+from text_normalizer import TextNormalizer
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Синтез речи без GUI: одна строка входа — одна фраза."
+    )
+    parser.add_argument("text", nargs="*", help="фразы для озвучки")
+    parser.add_argument(
+        "-f",
+        "--file",
+        help="файл с фразами по одной на строку ('-' — stdin)",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "-d",
+        "--out-dir",
+        type=Path,
+        help="каталог для аудиофайлов, по одному на фразу",
+    )
+    output.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="один аудиофайл со всеми фразами подряд",
+    )
+    output.add_argument(
+        "--raw",
+        action="store_true",
+        help="писать 16-битный mono PCM в stdout",
+    )
+    parser.add_argument(
+        "--format",
+        choices=available_formats(),
+        default="wav",
+        help="формат файлов для --out-dir и --output",
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        choices=SAMPLE_RATES,
+        default=0,
+        help="частота на выходе, Гц (0 — частота модели)",
+    )
+    parser.add_argument("--speaker", default="aidar")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="каталог кэша синтезированного звука (по умолчанию без кэша)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="сколько кусков длинной строки синтезировать параллельно",
+    )
+    parser.add_argument(
+        "--sentence-pause-ms", type=int, default=50, help="пауза после предложения"
+    )
+    parser.add_argument(
+        "--clause-pause-ms", type=int, default=50, help="пауза после части предложения"
+    )
+    parser.add_argument(
+        "--crossfade-ms",
+        type=int,
+        default=0,
+        help="перекрытие кусков, разрезанных по длине посреди предложения",
+    )
+    parser.add_argument(
+        "--trim-silence", action="store_true", help="обрезать тишину в начале и конце кусков"
+    )
+    parser.add_argument(
+        "--loudness-lufs",
+        type=int,
+        default=0,
+        help="привести громкость кусков к этому уровню, LUFS (0 — не менять)",
+    )
+    parser.add_argument(
+        "--no-time-stretch",
+        action="store_true",
+        help="менять темп частотой, как раньше (вместе с высотой голоса)",
+    )
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="не перезаписывать уже существующие файлы в --out-dir",
+    )
+    return parser.parse_args(argv)
+
+
+def iter_lines(args: argparse.Namespace) -> Iterator[str]:
+    yield from args.text
+    if args.file is None and (args.text or sys.stdin.isatty()):
+        return
+    if args.file in (None, "-"):
+        stream = sys.stdin
+        yield from _strip_lines(stream)
+        return
+    with open(args.file, encoding="utf-8") as stream:
+        yield from _strip_lines(stream)
+
+
+def _strip_lines(stream) -> Iterator[str]:
+    # Читаем построчно, чтобы большие файлы не держать в памяти целиком.
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.speed <= 0:
+        print("--speed must be positive", file=sys.stderr)
+        return 2
+    if args.workers > 1:
+        # Потоки torch делятся между параллельными кусками один раз, до синтеза.
+        EngineConfig(export_workers=args.workers).apply_threads()
+    post = PostConfig(args.trim_silence, args.loudness_lufs, not args.no_time_stretch)
+    engine = SynthesisEngine(load_model(), post)
+    normalizer = TextNormalizer()
+    cache = AudioCache(args.cache_dir) if args.cache_dir else None
+    out_dir = args.out_dir
+    if out_dir is None and args.output is None and not args.raw:
+        out_dir = Path("recordings")
+    output_format = FORMATS[args.format]
+    source_rate = engine.sample_rate(args.speed)
+    raw = Resampler(source_rate, args.sample_rate or source_rate)
+    combined = None
+    count = 0
+    stitch = StitchConfig(args.sentence_pause_ms, args.clause_pause_ms, args.crossfade_ms)
+
+    def render(write, spoken_text: str) -> None:
+        engine.synthesize_into(
+            write, spoken_text, args.speaker, args.speed, cache, None, args.workers, stitch
+        )
+
+    def write_raw(audio) -> None:
+        sys.stdout.buffer.write(pcm16_view(raw.process(audio)))
+        sys.stdout.buffer.flush()
+
+    try:
+        for text in iter_lines(args):
+            spoken_text = normalizer.normalize(text)
+            # Все выходы пишутся кусками по мере синтеза.
+            if args.raw:
+                if count == 0 and raw.target_rate != SAMPLE_RATE:
+                    print(f"sample rate: {raw.target_rate}", file=sys.stderr)
+                render(write_raw, spoken_text)
+            elif args.output is not None:
+                if combined is None:
+                    combined = output_format.open(args.output, source_rate, args.sample_rate)
+                render(combined.write, spoken_text)
+            else:
+                suffix = output_format.file_suffix(args.sample_rate)
+                path = out_dir / phrase_file_name(text, args.speaker, args.speed, suffix)
+                if args.skip_existing and path.exists():
+                    continue
+                with output_format.open(path, source_rate, args.sample_rate) as writer:
+                    render(writer.write, spoken_text)
+                print(path)
+            count += 1
+        if args.raw:
+            sys.stdout.buffer.write(pcm16_view(raw.flush()))
+    except BrokenPipeError:
+        return 0
+    finally:
+        if combined is not None:
+            combined.close()
+    if count == 0 and args.output is None and not args.raw:
+        print("nothing to synthesize", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
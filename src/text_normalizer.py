@@ -0,0 +1,74 @@
+import re
+from functools import lru_cache
+
+from lexicon import Lexicon
+from latin_transliterator import LatinTransliterator
+from number_normalizer import NumberNormalizer
+
+
+def _identity(function):
+    return function
+
+
+class TextNormalizer:
+    # Сколько последних фраз помнить: их повторяют и при экспорте, и в интерфейсе.
+    CACHE_SIZE = 4096
+
+    def __init__(self, cache_size: int = CACHE_SIZE) -> None:
+        self._latin_transliterator = LatinTransliterator()
+        self._number_normalizer = NumberNormalizer()
+        # Один проход по тексту с выбором ветви по первому символу. Поиск
+        # начинается с класса символов, и re пропускает обычный текст быстрым
+        # сканом, не заходя в ветви на каждой позиции. Латиница берётся словом
+        # целиком, а числовые шаблоны (даты, суммы, телефоны...) пробуются
+        # только с найденной позиции.
+        self._token_re = re.compile(rf"[A-Za-z{NumberNormalizer.FIRST_CHARS}][A-Za-z]*")
+        self._number_re = re.compile(NumberNormalizer.ALTERNATIVES)
+        self._lexicon_entries: list[dict] = []
+        self._lexicons: dict[int | None, Lexicon] = {}
+        memoize = lru_cache(maxsize=cache_size) if cache_size else _identity
+        self.normalize = memoize(self._normalize)
+        # Латинские слова повторяются и в разных фразах — их тоже помним.
+        self._transliterate = memoize(self._latin_transliterator.transliterate)
+
+    def set_lexicon(self, entries: list[dict]) -> None:
+        # Новый словарь действует сразу: старые результаты из кэша выбрасываются.
+        self._lexicon_entries = list(entries)
+        self._lexicons = {}
+        if hasattr(self.normalize, "cache_clear"):
+            self.normalize.cache_clear()
+
+    def _lexicon(self, category_id: int | None) -> Lexicon:
+        lexicon = self._lexicons.get(category_id)
+        if lexicon is None:
+            # Общие записи плюс записи категории; категорийные перекрывают общие.
+            entries = [e for e in self._lexicon_entries if e["category_id"] is None]
+            if category_id is not None:
+                entries += [e for e in self._lexicon_entries if e["category_id"] == category_id]
+            lexicon = self._lexicons[category_id] = Lexicon(entries)
+        return lexicon
+
+    def _normalize(self, text: str, category_id: int | None = None) -> str:
+        # Словарь идёт раньше транслитерации: «Visa» -> «виза», а не «виса».
+        text = self._lexicon(category_id).apply(text)
+        pieces: list[str] = []
+        position = 0
+        token = self._token_re.search(text)
+        while token is not None:
+            start = token.start()
+            if text[start].isalpha():
+                replacement, end = self._transliterate(token.group()), token.end()
+            else:
+                number = self._number_re.match(text, start)
+                if number is None:
+                    token = self._token_re.search(text, start + 1)
+                    continue
+                replacement, end = self._number_normalizer.verbalize(number), number.end()
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+            token = self._token_re.search(text, end)
+        if not pieces:
+            return text
+        pieces.append(text[position:])
+        return "".join(pieces)
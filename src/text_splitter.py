@@ -0,0 +1,55 @@
+import re
+
+_SENTENCE_RE = re.compile(r".+?(?:[.!?…;]+(?=\s|$)|\n|$)", re.S)
+_CLAUSE_RE = re.compile(r"[^,:—]+(?:[,:—]+|$)")
+
+# Чем кончается кусок: от этого зависит пауза при склейке.
+SENTENCE = "sentence"
+CLAUSE = "clause"
+CUT = "cut"
+
+
+def split_chunks(text: str, max_length: int = 150) -> list[str]:
+    return [chunk for chunk, _ in split_segments(text, max_length)]
+
+
+def split_segments(text: str, max_length: int = 150) -> list[tuple[str, str]]:
+    # Предложения, длинные — по частям предложения, совсем длинные — по словам.
+    segments: list[tuple[str, str]] = []
+    for match in _SENTENCE_RE.finditer(text):
+        sentence = match.group(0).strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_length:
+            segments.append((sentence, SENTENCE))
+            continue
+        parts = _split_long(sentence, max_length)
+        if parts:
+            parts[-1] = (parts[-1][0], SENTENCE)
+        segments.extend(parts)
+    return segments
+
+
+def _split_long(sentence: str, max_length: int) -> list[tuple[str, str]]:
+    parts: list[tuple[str, str]] = []
+    current = ""
+    for match in _CLAUSE_RE.finditer(sentence):
+        clause = match.group(0).strip()
+        if not clause:
+            continue
+        candidate = f"{current} {clause}" if current else clause
+        if len(candidate) <= max_length:
+            current = candidate
+            continue
+        if current:
+            parts.append((current, CLAUSE))
+        current = clause
+        while len(current) > max_length:
+            cut = current.rfind(" ", 0, max_length)
+            if cut <= 0:
+                cut = max_length
+            parts.append((current[:cut].strip(), CUT))
+            current = current[cut:].strip()
+    if current:
+        parts.append((current, CLAUSE))
+    return parts
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+
+class _NullSpan:
+    # Выключенная трассировка: один общий объект, ни часов, ни замков.
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_started")
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self) -> _Span:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._tracer.record(self._name, (time.perf_counter() - self._started) * 1000)
+
+
+class Tracer:
+    # Скользящее окно последних WINDOW замеров на каждый участок.
+    WINDOW = 1000
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+        self._totals: dict[str, int] = {}
+        self._log = None
+
+    def configure(self, enabled: bool, log_path: Path | None = None) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            if enabled and log_path is not None:
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                self._log = open(log_path, "a", encoding="utf-8")
+            self.enabled = enabled
+
+    def span(self, name: str) -> _Span | _NullSpan:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, milliseconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.WINDOW)
+            samples.append(milliseconds)
+            self._totals[name] = self._totals.get(name, 0) + 1
+            if self._log is not None:
+                self._log.write(
+                    json.dumps({"t": round(time.time(), 3), "span": name, "ms": round(milliseconds, 3)})
+                    + "\n"
+                )
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            windows = {name: sorted(samples) for name, samples in self._samples.items()}
+            totals = dict(self._totals)
+        result = []
+        for name, samples in sorted(windows.items()):
+            last = len(samples) - 1
+            result.append(
+                {
+                    "name": name,
+                    "count": totals[name],
+                    "p50": round(samples[last * 50 // 100], 2),
+                    "p95": round(samples[last * 95 // 100], 2),
+                    "p99": round(samples[last * 99 // 100], 2),
+                }
+            )
+        return result
+
+    def dump(self, path: Path) -> None:
+        # Снимок перцентилей одной строкой JSON — удобно копить по дням.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = {"t": round(time.time(), 3), "stats": self.stats()}
+        with open(path, "a", encoding="utf-8") as stream:
+            stream.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+tracer = Tracer()
+
+# TALKER_TRACE=1 включает замеры при старте, TALKER_TRACE=путь.jsonl — ещё и лог участков.
+_trace_env = os.environ.get("TALKER_TRACE", "")
+if _trace_env:
+    tracer.configure(True, None if _trace_env == "1" else Path(_trace_env))
@@ -1,53 +1,166 @@
-import sqlite3
+from __future__ import annotations
+
+import os
+import sys
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import torch
 from PySide6 import QtCore
 
-from latin_transliterator import LatinTransliterator
-from number_normalizer import NumberNormalizer
+from audio_cache import AudioCache
+from audio_encoders import FORMATS, SAMPLE_RATES, available_formats
+from audio_io import safe_name
+from audio_player import AudioPlayer
+from engine_config import EngineConfig
+from model_loader import DEFAULT_PACKAGE
+from model_registry import MODELS, LazyEngine, ModelRegistry
+from persistence_worker import PersistenceWorker
+from phrase_list_model import PhraseListModel
+from phrase_store import DEFAULT_CATEGORY, PhraseStore
+from postprocess import PostConfig
+from stitcher import StitchConfig
+from text_normalizer import TextNormalizer
+from tracing import tracer
+from tts_export_task import TtsExportTask
+from tts_prewarm_task import TtsPrewarmTask
 from tts_save_task import TtsSaveTask
+from tts_scheduler import TtsScheduler
 from tts_task import TtsTask
 
+if TYPE_CHECKING:
+    import torch
+
 
 class TtsBridge(QtCore.QObject):
+    PREWARM_TOP_PHRASES = 50
+    SEARCH_DEBOUNCE_MS = 150
+    SEARCH_LIMIT = 50
+    PERF_REFRESH_MS = 1000
+
+    audioFormatChanged = QtCore.Signal()
     autosaveChanged = QtCore.Signal()
+    cacheStatsChanged = QtCore.Signal()
     categoriesChanged = QtCore.Signal()
     currentCategoryChanged = QtCore.Signal()
+    engineConfigChanged = QtCore.Signal()
+    exportingChanged = QtCore.Signal()
+    exportProgressChanged = QtCore.Signal()
+    modelLoadingChanged = QtCore.Signal()
+    modelErrorChanged = QtCore.Signal()
+    modelsChanged = QtCore.Signal()
+    postProcessingChanged = QtCore.Signal()
+    perfStatsChanged = QtCore.Signal()
+    perfTracingChanged = QtCore.Signal()
     playingChanged = QtCore.Signal()
     preparingChanged = QtCore.Signal()
+    prewarmingChanged = QtCore.Signal()
+    queueChanged = QtCore.Signal()
+    searchQueryChanged = QtCore.Signal()
     savingChanged = QtCore.Signal()
     speakerChanged = QtCore.Signal()
     speedChanged = QtCore.Signal()
+    startupTimingsChanged = QtCore.Signal()
+    storageErrorChanged = QtCore.Signal()
+    streamingChanged = QtCore.Signal()
+    timeToFirstAudioChanged = QtCore.Signal()
 
-    def __init__(self, tts_model: torch.nn.Module) -> None:
+    def __init__(
+        self,
+        tts_model: torch.nn.Module | None = None,
+        audio_output=None,
+        data_dir: Path | None = None,
+    ) -> None:
         super().__init__()
+        # База, кэш и записи — рядом с приложением, если не указано иное.
+        self._data_dir = data_dir or Path(__file__).resolve().parent
         self.tts_model = tts_model
-        self.pool = QtCore.QThreadPool.globalInstance()
-        self.pool.setMaxThreadCount(1)
-        self.mutex = QtCore.QMutex()
+        self._model_error = ""
+        self._storage_error = ""
+        self._deferred: list[tuple] = []
+        self._startup_timings: dict[str, float] = {}
+        self._scheduler = TtsScheduler(QtCore.QThreadPool.globalInstance())
+        self._scheduler.queueChanged.connect(self.queueChanged)
+        self._player = AudioPlayer(audio_output)
+        self._player.started.connect(self._on_utterance_started)
+        self._player.finished.connect(self._on_utterance_finished)
+        self._utterances: dict[int, float] = {}
         self._autosave = False
         self._playing = False
         self._preparing = False
-        self._current_task: TtsTask | None = None
         self._saving = False
-        self._current_save_task: TtsSaveTask | None = None
-        self._db_path = Path(__file__).resolve().parent / "phrases.sqlite3"
-        self._latin_transliterator = LatinTransliterator()
-        self._number_normalizer = NumberNormalizer()
-        self._phrases_model = QtCore.QStringListModel()
-        self._favorites_model = QtCore.QStringListModel()
+        self._pending_saves = 0
+        self._prewarm_enabled = False
+        self._prewarm_cancelled = threading.Event()
+        self._prewarm_pending = 0
+        self._export_task: TtsExportTask | None = None
+        self._export_progress = 0
+        self._export_total = 0
+        self._db_path = self._data_dir / "phrases.sqlite3"
+        self._store = PhraseStore(self._db_path)
+        self._persistence = PersistenceWorker(self._store)
+        settings = self._store.settings()
+        self.engine_config = EngineConfig.from_settings(settings)
+        self._registry = ModelRegistry(self.engine_config)
+        self._registry.set_post(PostConfig.from_settings(settings))
+        self._registry.changed.connect(self.modelsChanged)
+        if tts_model is not None:
+            self._registry.add(DEFAULT_PACKAGE, tts_model)
+        self._audio_formats = available_formats()
+        self._audio_format = settings.get("audio.format", "wav")
+        if self._audio_format not in self._audio_formats:
+            self._audio_format = "wav"
+        self._audio_sample_rate = int(settings.get("audio.sample_rate", "0"))
+        if self._audio_sample_rate not in SAMPLE_RATES:
+            self._audio_sample_rate = 0
+        self._stitch = StitchConfig.from_settings(settings)
+        # Перцентили для панели пересчитываются раз в секунду, только пока замеры включены.
+        self._perf_timer = QtCore.QTimer(self)
+        self._perf_timer.setInterval(self.PERF_REFRESH_MS)
+        self._perf_timer.timeout.connect(self.perfStatsChanged)
+        if settings.get("perf.tracing") == "1":
+            tracer.enabled = True
+        if tracer.enabled:
+            self._perf_timer.start()
+        self._persistence.pageLoaded.connect(self._on_page_loaded)
+        self._persistence.phraseChanged.connect(self._on_phrase_changed)
+        self._persistence.phraseDeleted.connect(self._on_phrase_deleted)
+        self._persistence.sayCountsChanged.connect(self._on_say_counts_changed)
+        self._persistence.phrasesInvalidated.connect(self._reload_phrase_lists)
+        self._persistence.searchResults.connect(self._on_search_results)
+        self._persistence.lexiconLoaded.connect(self._apply_lexicon)
+        self._persistence.categoriesLoaded.connect(self._on_categories_loaded)
+        self._persistence.prewarmPhrasesLoaded.connect(self._on_prewarm_phrases_loaded)
+        self._persistence.failed.connect(self._on_persistence_failed)
+        self._audio_cache = AudioCache(self._data_dir / "cache")
+        self._text_normalizer = TextNormalizer()
+        self._phrases_model = PhraseListModel()
+        self._phrases_model.pageRequested.connect(self._request_phrases_page)
+        self._favorites_model = PhraseListModel()
+        self._favorites_model.pageRequested.connect(self._request_favorites_page)
+        self._search_model = PhraseListModel(ordered=False)
+        self._search_query = ""
+        self._search_generation = 0
+        # Запрос уходит в воркер, когда ввод затих на SEARCH_DEBOUNCE_MS.
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._run_search)
         self._categories_model = QtCore.QStringListModel()
         self._speakers_model = QtCore.QStringListModel()
+        self._lexicon_model = QtCore.QStringListModel()
+        self._lexicon: list[dict] = []
         self._speaker = ""
         self._speed = 1.0
+        self._streaming = True
+        self._time_to_first_audio = 0.0
         self._categories: list[dict[str, int | str]] = []
         self._current_category = ""
-        self._init_db()
-        self._load_categories()
-        self._load_phrases()
-        self._load_favorites()
+        # Первичная загрузка синхронная: окна ещё нет, а дальше всё идёт через воркер.
+        self._apply_categories(self._store.categories())
+        self._load_first_pages()
+        self._apply_lexicon(self._store.lexicon_entries())
         self._load_speakers()
 
     @QtCore.Property(QtCore.QObject, constant=True)
@@ -58,6 +171,66 @@ class TtsBridge(QtCore.QObject):
     def favoritesModel(self) -> QtCore.QObject:
         return self._favorites_model
 
+    @QtCore.Property(QtCore.QObject, constant=True)
+    def searchModel(self) -> QtCore.QObject:
+        return self._search_model
+
+    @QtCore.Property(str, notify=searchQueryChanged)
+    def searchQuery(self) -> str:
+        return self._search_query
+
+    @QtCore.Slot(str)
+    def search(self, query: str) -> None:
+        if query == self._search_query:
+            return
+        self._search_query = query
+        self.searchQueryChanged.emit()
+        self._search_generation += 1
+        if not query.strip():
+            self._search_timer.stop()
+            self._search_model.reset([], False)
+            return
+        self._search_timer.start()
+
+    @QtCore.Property(QtCore.QObject, constant=True)
+    def lexiconModel(self) -> QtCore.QObject:
+        return self._lexicon_model
+
+    @QtCore.Slot(list)
+    def _apply_lexicon(self, entries: list) -> None:
+        self._lexicon = entries
+        self._text_normalizer.set_lexicon(entries)
+        self._refresh_lexicon_model()
+
+    def _refresh_lexicon_model(self) -> None:
+        # Видны общие записи и записи текущей категории.
+        category_id = self._find_category_id(self._current_category)
+        terms = {e["term"] for e in self._lexicon if e["category_id"] in (None, category_id)}
+        self._lexicon_model.setStringList(sorted(terms, key=str.lower))
+
+    @QtCore.Slot(str, result=str)
+    def lexiconReplacement(self, term: str) -> str:
+        category_id = self._find_category_id(self._current_category)
+        matches = [e for e in self._lexicon if e["term"] == term]
+        matches.sort(key=lambda e: e["category_id"] != category_id)
+        return matches[0]["replacement"] if matches else ""
+
+    @QtCore.Slot(str, str, bool, bool)
+    def addLexiconEntry(
+        self, term: str, replacement: str, abbreviation: bool, category_only: bool
+    ) -> None:
+        term = term.strip()
+        replacement = replacement.strip()
+        if not term or not replacement:
+            return
+        category_id = self._find_category_id(self._current_category) if category_only else None
+        self._persistence.save_lexicon_entry(term, replacement, abbreviation, category_id)
+
+    @QtCore.Slot(str, bool)
+    def removeLexiconEntry(self, term: str, category_only: bool) -> None:
+        category_id = self._find_category_id(self._current_category) if category_only else None
+        self._persistence.delete_lexicon_entry(term.strip(), category_id)
+
     @QtCore.Property(QtCore.QObject, constant=True)
     def categoriesModel(self) -> QtCore.QObject:
         return self._categories_model
@@ -66,6 +239,79 @@ class TtsBridge(QtCore.QObject):
     def speakersModel(self) -> QtCore.QObject:
         return self._speakers_model
 
+    @QtCore.Property(bool, notify=modelLoadingChanged)
+    def modelLoading(self) -> bool:
+        return self.tts_model is None and not self._model_error
+
+    @QtCore.Property(str, notify=modelErrorChanged)
+    def modelError(self) -> str:
+        return self._model_error
+
+    @QtCore.Property(str, notify=storageErrorChanged)
+    def storageError(self) -> str:
+        return self._storage_error
+
+    @QtCore.Slot()
+    def dismissStorageError(self) -> None:
+        self._storage_error = ""
+        self.storageErrorChanged.emit()
+
+    @QtCore.Slot(str)
+    def _on_persistence_failed(self, message: str) -> None:
+        # Пакет записей откатился целиком: списки перечитываются из базы,
+        # чтобы не показывать то, чего в ней нет.
+        print(f"database write failed: {message}", file=sys.stderr)
+        self._storage_error = message
+        self.storageErrorChanged.emit()
+        self._reload_phrase_lists()
+
+    @QtCore.Property("QVariantMap", notify=startupTimingsChanged)
+    def startupTimings(self) -> dict[str, float]:
+        return dict(self._startup_timings)
+
+    @QtCore.Slot()
+    def shutdown(self) -> None:
+        # Дописывает очередь записей в базу и закрывает звуковой поток.
+        self.stop()
+        self.stopPrewarm()
+        self.cancelExport()
+        self._persistence.shutdown()
+        self._player.shutdown()
+        self._store.close()
+        tracer.flush()
+
+    @QtCore.Slot(str, float)
+    def record_startup_phase(self, name: str, milliseconds: float) -> None:
+        self._startup_timings[name] = round(milliseconds, 1)
+        self.startupTimingsChanged.emit()
+
+    @QtCore.Slot(object, float)
+    def setModel(self, tts_model: torch.nn.Module, load_ms: float = 0.0) -> None:
+        self.tts_model = tts_model
+        self._registry.add(DEFAULT_PACKAGE, tts_model)
+        if load_ms:
+            self.record_startup_phase("model", load_ms)
+        self._load_speakers()
+        self.speakerChanged.emit()
+        self.modelLoadingChanged.emit()
+        deferred, self._deferred = self._deferred, []
+        for method, args in deferred:
+            method(*args)
+
+    @QtCore.Slot(str)
+    def setModelError(self, message: str) -> None:
+        self._model_error = message
+        self._deferred.clear()
+        self.modelErrorChanged.emit()
+        self.modelLoadingChanged.emit()
+
+    def _defer_until_model(self, method, *args) -> bool:
+        if self.tts_model is not None:
+            return False
+        if not self._model_error:
+            self._deferred.append((method, args))
+        return True
+
     @QtCore.Property(bool, notify=autosaveChanged)
     def autosave(self) -> bool:
         return self._autosave
@@ -77,6 +323,15 @@ class TtsBridge(QtCore.QObject):
         self._autosave = value
         self.autosaveChanged.emit()
 
+    @QtCore.Property("QVariantMap", notify=cacheStatsChanged)
+    def cacheStats(self) -> dict[str, int]:
+        return self._audio_cache.stats()
+
+    @QtCore.Slot()
+    def clearCache(self) -> None:
+        self._audio_cache.clear()
+        self.cacheStatsChanged.emit()
+
     @QtCore.Property(bool, notify=playingChanged)
     def playing(self) -> bool:
         return self._playing
@@ -85,10 +340,46 @@ class TtsBridge(QtCore.QObject):
     def preparing(self) -> bool:
         return self._preparing
 
+    @QtCore.Property(bool, notify=prewarmingChanged)
+    def prewarming(self) -> bool:
+        return self._prewarm_pending > 0
+
     @QtCore.Property(bool, notify=savingChanged)
     def saving(self) -> bool:
         return self._saving
 
+    @QtCore.Property(bool, notify=exportingChanged)
+    def exporting(self) -> bool:
+        return self._export_task is not None
+
+    @QtCore.Property(int, notify=exportProgressChanged)
+    def exportProgress(self) -> int:
+        return self._export_progress
+
+    @QtCore.Property(int, notify=exportProgressChanged)
+    def exportTotal(self) -> int:
+        return self._export_total
+
+    # Сколько рабочих экспорт запустит на самом деле: при ручном числе
+    # intra-op потоков их может быть меньше заданного.
+    @QtCore.Property(int, notify=engineConfigChanged)
+    def exportWorkers(self) -> int:
+        return self.engine_config.render_workers()
+
+    @exportWorkers.setter
+    def exportWorkers(self, value: int) -> None:
+        value = max(1, min(value, os.cpu_count() or 1))
+        if self._set_engine_option("export_workers", value) and self.tts_model is not None:
+            self.engine_config.apply_threads()
+
+    @QtCore.Property(int, notify=queueChanged)
+    def queueDepth(self) -> int:
+        return self._scheduler.depth
+
+    @QtCore.Property(float, notify=queueChanged)
+    def queueWaitMs(self) -> float:
+        return self._scheduler.average_wait_ms
+
     @QtCore.Property(str, notify=currentCategoryChanged)
     def currentCategory(self) -> str:
         return self._current_category
@@ -102,7 +393,8 @@ class TtsBridge(QtCore.QObject):
             return
         self._current_category = name
         self.currentCategoryChanged.emit()
-        self._load_phrases()
+        self._phrases_model.reset()
+        self._refresh_lexicon_model()
 
     @QtCore.Property(str, notify=speakerChanged)
     def speaker(self) -> str:
@@ -115,6 +407,7 @@ class TtsBridge(QtCore.QObject):
             return
         self._speaker = value
         self.speakerChanged.emit()
+        self._restart_prewarm()
 
     @QtCore.Property(float, notify=speedChanged)
     def speed(self) -> float:
@@ -126,6 +419,230 @@ class TtsBridge(QtCore.QObject):
             return
         self._speed = value
         self.speedChanged.emit()
+        self._restart_prewarm()
+
+    @QtCore.Property(bool, notify=streamingChanged)
+    def streaming(self) -> bool:
+        return self._streaming
+
+    @streaming.setter
+    def streaming(self, value: bool) -> None:
+        if self._streaming == value:
+            return
+        self._streaming = value
+        self.streamingChanged.emit()
+
+    # Формат и частота для «В файл» и экспорта; список — только доступные кодеры.
+    @QtCore.Property(list, constant=True)
+    def audioFormats(self) -> list[str]:
+        return list(self._audio_formats)
+
+    @QtCore.Property(str, notify=audioFormatChanged)
+    def audioFormat(self) -> str:
+        return self._audio_format
+
+    @audioFormat.setter
+    def audioFormat(self, value: str) -> None:
+        if value == self._audio_format or value not in self._audio_formats:
+            return
+        self._audio_format = value
+        self._persistence.save_settings({"audio.format": value})
+        self.audioFormatChanged.emit()
+
+    @QtCore.Property(list, constant=True)
+    def audioSampleRates(self) -> list[int]:
+        return list(SAMPLE_RATES)
+
+    @QtCore.Property(int, notify=audioFormatChanged)
+    def audioSampleRate(self) -> int:
+        return self._audio_sample_rate
+
+    @audioSampleRate.setter
+    def audioSampleRate(self, value: int) -> None:
+        if value == self._audio_sample_rate or value not in SAMPLE_RATES:
+            return
+        self._audio_sample_rate = value
+        self._persistence.save_settings({"audio.sample_rate": str(value)})
+        self.audioFormatChanged.emit()
+
+    # Паузы между кусками при записи в файл, мс.
+    @QtCore.Property(int, notify=audioFormatChanged)
+    def sentencePauseMs(self) -> int:
+        return self._stitch.sentence_pause_ms
+
+    @sentencePauseMs.setter
+    def sentencePauseMs(self, value: int) -> None:
+        self._set_stitch(sentence_pause_ms=value)
+
+    @QtCore.Property(int, notify=audioFormatChanged)
+    def clausePauseMs(self) -> int:
+        return self._stitch.clause_pause_ms
+
+    @clausePauseMs.setter
+    def clausePauseMs(self, value: int) -> None:
+        self._set_stitch(clause_pause_ms=value)
+
+    @QtCore.Property(int, notify=audioFormatChanged)
+    def crossfadeMs(self) -> int:
+        return self._stitch.crossfade_ms
+
+    @crossfadeMs.setter
+    def crossfadeMs(self, value: int) -> None:
+        self._set_stitch(crossfade_ms=value)
+
+    def _set_stitch(self, **values: int) -> None:
+        stitch = self._stitch.replace(**values)
+        if stitch.to_settings() == self._stitch.to_settings():
+            return
+        self._stitch = stitch
+        self._persistence.save_settings(stitch.to_settings())
+        self.audioFormatChanged.emit()
+
+    # Обработка после синтеза; новые настройки — новые ключи кэша.
+    @QtCore.Property(bool, notify=postProcessingChanged)
+    def trimSilence(self) -> bool:
+        return self._registry.post.trim_silence
+
+    @trimSilence.setter
+    def trimSilence(self, value: bool) -> None:
+        self._set_post(trim_silence=value)
+
+    @QtCore.Property(int, notify=postProcessingChanged)
+    def loudnessLufs(self) -> int:
+        return self._registry.post.loudness_lufs
+
+    @loudnessLufs.setter
+    def loudnessLufs(self, value: int) -> None:
+        self._set_post(loudness_lufs=value)
+
+    @QtCore.Property(bool, notify=postProcessingChanged)
+    def timeStretch(self) -> bool:
+        return self._registry.post.time_stretch
+
+    @timeStretch.setter
+    def timeStretch(self, value: bool) -> None:
+        self._set_post(time_stretch=value)
+
+    def _set_post(self, **values) -> None:
+        post = self._registry.post.replace(**values)
+        if post.to_settings() == self._registry.post.to_settings():
+            return
+        self._registry.set_post(post)
+        self._persistence.save_settings(post.to_settings())
+        self.postProcessingChanged.emit()
+        self._restart_prewarm()
+
+    @QtCore.Property(int, constant=True)
+    def maxThreads(self) -> int:
+        return os.cpu_count() or 1
+
+    # Потоки intra-op применяются сразу, остальное — при следующей загрузке модели.
+    @QtCore.Property(int, notify=engineConfigChanged)
+    def intraOpThreads(self) -> int:
+        return self.engine_config.intra_threads
+
+    @intraOpThreads.setter
+    def intraOpThreads(self, value: int) -> None:
+        if self._set_engine_option("intra_threads", max(0, value)) and self.tts_model is not None:
+            self.engine_config.apply_threads()
+
+    @QtCore.Property(int, notify=engineConfigChanged)
+    def interOpThreads(self) -> int:
+        return self.engine_config.interop_threads
+
+    @interOpThreads.setter
+    def interOpThreads(self, value: int) -> None:
+        self._set_engine_option("interop_threads", max(0, value))
+
+    @QtCore.Property(bool, notify=engineConfigChanged)
+    def warmUp(self) -> bool:
+        return self.engine_config.warmup
+
+    @warmUp.setter
+    def warmUp(self, value: bool) -> None:
+        self._set_engine_option("warmup", value)
+
+    @QtCore.Property(bool, notify=engineConfigChanged)
+    def quantizeModel(self) -> bool:
+        return self.engine_config.quantize
+
+    @quantizeModel.setter
+    def quantizeModel(self, value: bool) -> None:
+        self._set_engine_option("quantize", value)
+
+    @QtCore.Property(int, notify=engineConfigChanged)
+    def modelBudgetMb(self) -> int:
+        return self.engine_config.model_budget_mb
+
+    @modelBudgetMb.setter
+    def modelBudgetMb(self, value: int) -> None:
+        if self._set_engine_option("model_budget_mb", max(0, value)):
+            self._registry.evict()
+
+    # Модели грузятся при первой фразе для их голоса или письменности.
+    @QtCore.Property(list, notify=modelsChanged)
+    def models(self) -> list[dict]:
+        return self._registry.status()
+
+    @QtCore.Slot(str, bool)
+    def setModelEnabled(self, name: str, enabled: bool) -> None:
+        if name not in MODELS or name == DEFAULT_PACKAGE:
+            return
+        extra = [p for p in self.engine_config.extra_models.split(",") if p and p != name]
+        if enabled:
+            extra.append(name)
+            self._registry.retry(name)
+        if not self._set_engine_option("extra_models", ",".join(sorted(extra))):
+            return
+        self._registry.evict()
+        self._load_speakers()
+        self.speakerChanged.emit()
+        self.modelsChanged.emit()
+
+    def _set_engine_option(self, name: str, value) -> bool:
+        if getattr(self.engine_config, name) == value:
+            return False
+        setattr(self.engine_config, name, value)
+        self._persistence.save_settings(self.engine_config.to_settings())
+        self.engineConfigChanged.emit()
+        return True
+
+    @QtCore.Property(float, notify=timeToFirstAudioChanged)
+    def timeToFirstAudio(self) -> float:
+        return self._time_to_first_audio
+
+    @QtCore.Property(bool, notify=perfTracingChanged)
+    def perfTracing(self) -> bool:
+        return tracer.enabled
+
+    @perfTracing.setter
+    def perfTracing(self, value: bool) -> None:
+        if tracer.enabled == value:
+            return
+        tracer.enabled = value
+        if value:
+            self._perf_timer.start()
+        else:
+            self._perf_timer.stop()
+        self._persistence.save_settings({"perf.tracing": "1" if value else "0"})
+        self.perfTracingChanged.emit()
+        self.perfStatsChanged.emit()
+
+    @QtCore.Property(list, notify=perfStatsChanged)
+    def perfStats(self) -> list[dict]:
+        return tracer.stats()
+
+    @QtCore.Slot(result=str)
+    def dumpPerfStats(self) -> str:
+        path = self._data_dir / "perf_stats.jsonl"
+        tracer.dump(path)
+        tracer.flush()
+        return str(path)
+
+    @QtCore.Slot()
+    def resetPerfStats(self) -> None:
+        tracer.reset()
+        self.perfStatsChanged.emit()
 
     def _set_playing(self, value: bool) -> None:
         if self._playing == value:
@@ -145,104 +662,28 @@ class TtsBridge(QtCore.QObject):
         self._saving = value
         self.savingChanged.emit()
 
+    def _recordings_dir(self) -> Path:
+        return self._data_dir / "recordings"
+
     def _next_audio_path(self) -> Path:
-        base_dir = Path(__file__).resolve().parent / "recordings"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return base_dir / f"tts_{timestamp}.wav"
-
-    def _init_db(self) -> None:
-        with sqlite3.connect(self._db_path) as connection:
-            connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL
-                )
-                """
-            )
-            connection.execute(
-                "INSERT OR IGNORE INTO categories(name) VALUES (?)",
-                ("Разговор с Банком",),
-            )
-            cursor = connection.execute(
-                "SELECT id FROM categories WHERE name = ?",
-                ("Разговор с Банком",),
-            )
-            default_category_id = cursor.fetchone()[0]
-            connection.execute(
-                f"""
-                CREATE TABLE IF NOT EXISTS phrases (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    text TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    say_count INTEGER NOT NULL DEFAULT 0,
-                    category_id INTEGER NOT NULL DEFAULT {default_category_id},
-                    is_favorite INTEGER NOT NULL DEFAULT 0
-                )
-                """
-            )
-            cursor = connection.execute("PRAGMA table_info(phrases)")
-            columns = {row[1] for row in cursor.fetchall()}
-            if "say_count" not in columns:
-                connection.execute(
-                    "ALTER TABLE phrases ADD COLUMN say_count INTEGER NOT NULL DEFAULT 0"
-                )
-            if "category_id" not in columns:
-                connection.execute(
-                    f"ALTER TABLE phrases ADD COLUMN category_id INTEGER NOT NULL DEFAULT {default_category_id}"
-                )
-            if "is_favorite" not in columns:
-                connection.execute(
-                    "ALTER TABLE phrases ADD COLUMN is_favorite INTEGER NOT NULL DEFAULT 0"
-                )
-            connection.execute(
-                "UPDATE phrases SET category_id = ? WHERE category_id IS NULL",
-                (default_category_id,),
-            )
-            connection.commit()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        suffix = FORMATS[self._audio_format].file_suffix(self._audio_sample_rate)
+        return self._recordings_dir() / f"tts_{timestamp}{suffix}"
 
-    def _load_phrases(self) -> None:
-        category_id = self._find_category_id(self._current_category)
-        if not category_id:
-            self._phrases_model.setStringList([])
-            return
-        with sqlite3.connect(self._db_path) as connection:
-            cursor = connection.execute(
-                """
-                SELECT text
-                FROM phrases
-                WHERE category_id = ?
-                ORDER BY text COLLATE NOCASE ASC
-                """,
-                (category_id,),
-            )
-            rows = [row[0] for row in cursor.fetchall()]
-        self._phrases_model.setStringList(rows)
-
-    def _load_favorites(self) -> None:
-        with sqlite3.connect(self._db_path) as connection:
-            cursor = connection.execute(
-                """
-                SELECT text
-                FROM phrases
-                WHERE is_favorite = 1
-                ORDER BY text COLLATE NOCASE ASC
-                """
-            )
-            rows = [row[0] for row in cursor.fetchall()]
-        self._favorites_model.setStringList(rows)
+    def _load_first_pages(self) -> None:
+        for model, category_id in (
+            (self._phrases_model, self._find_category_id(self._current_category) or 0),
+            (self._favorites_model, None),
+        ):
+            rows = self._store.phrase_page(category_id, None, model.page_size + 1)
+            model.reset(rows[: model.page_size], len(rows) > model.page_size)
 
-    def _load_categories(self) -> None:
-        with sqlite3.connect(self._db_path) as connection:
-            cursor = connection.execute(
-                "SELECT id, name FROM categories ORDER BY name COLLATE NOCASE ASC"
-            )
-            rows = cursor.fetchall()
+    def _apply_categories(self, rows: list) -> None:
         self._categories = [{"id": row[0], "name": row[1]} for row in rows]
         names = [row["name"] for row in self._categories]
         self._categories_model.setStringList(names)
         if not self._current_category:
-            default = "Разговор с Банком"
+            default = DEFAULT_CATEGORY
             self._current_category = (
                 default if default in names else names[0] if names else ""
             )
@@ -251,6 +692,73 @@ class TtsBridge(QtCore.QObject):
         self.categoriesChanged.emit()
         self.currentCategoryChanged.emit()
 
+    @QtCore.Slot(list)
+    def _on_categories_loaded(self, rows: list) -> None:
+        previous = self._current_category
+        self._apply_categories(rows)
+        if self._current_category != previous:
+            self._phrases_model.reset()
+
+    @QtCore.Slot(int, object)
+    def _request_phrases_page(self, generation: int, after: str | None) -> None:
+        category_id = self._find_category_id(self._current_category) or 0
+        self._persistence.load_page(
+            "phrases", generation, category_id, after, self._phrases_model.page_size
+        )
+
+    @QtCore.Slot(int, object)
+    def _request_favorites_page(self, generation: int, after: str | None) -> None:
+        self._persistence.load_page(
+            "favorites", generation, None, after, self._favorites_model.page_size
+        )
+
+    @QtCore.Slot(str, int, list, bool)
+    def _on_page_loaded(self, name: str, generation: int, rows: list, has_more: bool) -> None:
+        model = self._phrases_model if name == "phrases" else self._favorites_model
+        model.append_page(generation, rows, has_more)
+
+    @QtCore.Slot(dict)
+    def _on_phrase_changed(self, row: dict) -> None:
+        if row["category_id"] == self._find_category_id(self._current_category):
+            self._phrases_model.upsert(row)
+        else:
+            self._phrases_model.remove(row["text"])
+        if row["favorite"]:
+            self._favorites_model.upsert(row)
+        else:
+            self._favorites_model.remove(row["text"])
+        self._search_model.upsert(row)
+
+    @QtCore.Slot(str)
+    def _on_phrase_deleted(self, text: str) -> None:
+        self._phrases_model.remove(text)
+        self._favorites_model.remove(text)
+        self._search_model.remove(text)
+
+    @QtCore.Slot(dict)
+    def _on_say_counts_changed(self, counts: dict) -> None:
+        self._phrases_model.update_say_counts(counts)
+        self._favorites_model.update_say_counts(counts)
+        self._search_model.update_say_counts(counts)
+
+    def _run_search(self) -> None:
+        self._persistence.search(
+            self._search_generation, self._search_query, self.SEARCH_LIMIT
+        )
+
+    @QtCore.Slot(int, list)
+    def _on_search_results(self, generation: int, rows: list) -> None:
+        # Ответ на уже устаревший запрос не показываем.
+        if generation == self._search_generation:
+            self._search_model.reset(rows, False)
+
+    @QtCore.Slot()
+    def _reload_phrase_lists(self) -> None:
+        self._phrases_model.reset()
+        self._favorites_model.reset()
+        if self._search_query.strip():
+            self._search_timer.start()
+
     def _find_category_id(self, name: str) -> int | None:
         for category in self._categories:
             if category["name"] == name:
@@ -258,10 +766,9 @@ class TtsBridge(QtCore.QObject):
         return None
 
     def _load_speakers(self) -> None:
-        speakers = list(getattr(self.tts_model, "speakers", []))
-        speakers = sorted(speakers)
+        speakers = self._registry.all_speakers() if self.tts_model is not None else []
         self._speakers_model.setStringList(speakers)
-        if not self._speaker and speakers:
+        if speakers and self._speaker not in speakers:
             default_speaker = "aidar" if "aidar" in speakers else speakers[0]
             self._speaker = default_speaker
 
@@ -269,94 +776,163 @@ class TtsBridge(QtCore.QObject):
         category_id = self._find_category_id(self._current_category)
         if not category_id:
             return
-        with sqlite3.connect(self._db_path) as connection:
-            connection.execute(
-                """
-                INSERT INTO phrases(text, created_at, category_id)
-                VALUES(?, CURRENT_TIMESTAMP, ?)
-                ON CONFLICT(text)
-                DO UPDATE SET created_at = CURRENT_TIMESTAMP, category_id = excluded.category_id
-                """,
-                (text, category_id),
-            )
-            connection.commit()
-        self._load_phrases()
+        self._persistence.save_phrase(text, category_id)
 
     def _increment_phrase_count(self, text: str) -> None:
-        with sqlite3.connect(self._db_path) as connection:
-            connection.execute(
-                "UPDATE phrases SET say_count = say_count + 1 WHERE text = ?",
-                (text,),
-            )
-            connection.commit()
+        self._persistence.increment_say_count(text)
 
     def _delete_phrase(self, text: str) -> None:
-        with sqlite3.connect(self._db_path) as connection:
-            connection.execute("DELETE FROM phrases WHERE text = ?", (text,))
-            connection.commit()
-        self._load_phrases()
-        self._load_favorites()
+        self._persistence.delete_phrase(text)
 
     def _favorite_phrase(self, text: str) -> None:
         category_id = self._find_category_id(self._current_category)
         if not category_id:
             return
-        with sqlite3.connect(self._db_path) as connection:
-            connection.execute(
-                """
-                INSERT INTO phrases(text, created_at, category_id, is_favorite)
-                VALUES(?, CURRENT_TIMESTAMP, ?, 1)
-                ON CONFLICT(text)
-                DO UPDATE SET is_favorite = 1
-                """,
-                (text, category_id),
-            )
-            connection.commit()
-        self._load_phrases()
-        self._load_favorites()
+        self._persistence.favorite_phrase(text, category_id)
 
     def _unfavorite_phrase(self, text: str) -> None:
-        with sqlite3.connect(self._db_path) as connection:
-            connection.execute(
-                "UPDATE phrases SET is_favorite = 0 WHERE text = ?",
-                (text,),
-            )
-            connection.commit()
-        self._load_favorites()
+        self._persistence.unfavorite_phrase(text)
 
     def _add_category(self, name: str) -> None:
-        with sqlite3.connect(self._db_path) as connection:
-            connection.execute("INSERT OR IGNORE INTO categories(name) VALUES (?)", (name,))
-            connection.commit()
-        self._load_categories()
+        self._persistence.add_category(name)
 
     def _delete_category(self, name: str) -> None:
-        if name == "Разговор с Банком":
+        if name == DEFAULT_CATEGORY:
             return
         category_id = self._find_category_id(name)
         if not category_id:
             return
-        with sqlite3.connect(self._db_path) as connection:
-            cursor = connection.execute(
-                "SELECT id FROM categories WHERE name = ?",
-                ("Разговор с Банком",),
-            )
-            default_category_id = cursor.fetchone()[0]
-            connection.execute(
-                "UPDATE phrases SET category_id = ? WHERE category_id = ?",
-                (default_category_id, category_id),
-            )
-            connection.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-            connection.commit()
         if self._current_category == name:
-            self._current_category = "Разговор с Банком"
+            self._current_category = DEFAULT_CATEGORY
             self.currentCategoryChanged.emit()
-        self._load_categories()
-        self._load_phrases()
+        # Списки перечитаются по phrasesInvalidated после удаления.
+        self._persistence.delete_category(category_id)
+
+    def _route(
+        self, text: str, speaker: str, category_id: int | None
+    ) -> tuple[LazyEngine, str, str]:
+        # Модель выбирается по исходному тексту: после нормализации латиница
+        # уже транслитерирована. Нормализатор русский — только для русской модели.
+        spec, speaker = self._registry.route(text, speaker)
+        spoken_text = text
+        if spec.language == "ru":
+            with tracer.span("normalize"):
+                spoken_text = self._text_normalizer.normalize(text, category_id)
+        return self._registry.handle(spec.package), spoken_text, speaker
+
+    def _restart_prewarm(self) -> None:
+        if self._prewarm_enabled:
+            self.startPrewarm()
 
-    def _normalize_text(self, text: str) -> str:
-        text = self._latin_transliterator.normalize(text)
-        return self._number_normalizer.normalize(text)
+    @QtCore.Slot()
+    def startPrewarm(self) -> None:
+        if self._defer_until_model(self.startPrewarm):
+            return
+        self.stopPrewarm()
+        self._prewarm_enabled = True
+        self._persistence.load_prewarm_phrases(self.PREWARM_TOP_PHRASES)
+
+    @QtCore.Slot(list)
+    def _on_prewarm_phrases_loaded(self, texts: list) -> None:
+        if not self._prewarm_enabled:
+            return
+        self._cancel_prewarm_tasks()
+        self._prewarm_cancelled = threading.Event()
+        category_id = self._find_category_id(self._current_category)
+        for text in texts:
+            engine, spoken_text, speaker = self._route(text, self._speaker, category_id)
+            task = TtsPrewarmTask(
+                engine,
+                spoken_text,
+                speaker,
+                self._speed,
+                self._audio_cache,
+                self._prewarm_cancelled,
+                self._scheduler.interactive_idle,
+            )
+            task.finished.connect(self._on_prewarm_finished)
+            self._prewarm_pending += 1
+            self._scheduler.submit(
+                task, TtsScheduler.BACKGROUND, TtsScheduler.PRIORITY_PREWARM
+            )
+        self.prewarmingChanged.emit()
+
+    @QtCore.Slot()
+    def stopPrewarm(self) -> None:
+        self._prewarm_enabled = False
+        self._cancel_prewarm_tasks()
+
+    def _cancel_prewarm_tasks(self) -> None:
+        self._prewarm_cancelled.set()
+        removed = self._scheduler.remove(
+            TtsScheduler.BACKGROUND, lambda task: isinstance(task, TtsPrewarmTask)
+        )
+        if removed:
+            self._prewarm_pending -= len(removed)
+            self.prewarmingChanged.emit()
+
+    def _start_export(self, category_id: int | None, output_dir: Path) -> None:
+        if self._defer_until_model(self._start_export, category_id, output_dir):
+            return
+        if self._export_task is not None:
+            return
+        speaker = self._speaker
+        task = TtsExportTask(
+            lambda text: self._route(text, speaker, category_id),
+            lambda: self._store.export_phrases(category_id),
+            self._speed,
+            output_dir,
+            FORMATS[self._audio_format],
+            self._audio_sample_rate,
+            self.engine_config.render_workers(),
+            self._audio_cache,
+            self._scheduler.interactive_idle,
+            self._stitch,
+        )
+        task.progress.connect(self._on_export_progress)
+        task.finished.connect(self._on_export_done)
+        task.failed.connect(self._on_export_done)
+        self._export_task = task
+        self._export_progress = 0
+        self._export_total = 0
+        self.exportingChanged.emit()
+        self.exportProgressChanged.emit()
+        self._scheduler.submit(task, TtsScheduler.BACKGROUND, TtsScheduler.PRIORITY_SAVE)
+
+    @QtCore.Slot(str)
+    def exportCategory(self, name: str) -> None:
+        name = name.strip()
+        category_id = self._find_category_id(name)
+        if not category_id:
+            return
+        self._start_export(category_id, self._recordings_dir() / safe_name(name))
+
+    @QtCore.Slot()
+    def exportFavorites(self) -> None:
+        self._start_export(None, self._recordings_dir() / "favorites")
+
+    @QtCore.Slot()
+    def cancelExport(self) -> None:
+        task = self._export_task
+        if task is None:
+            return
+        task.cancel()
+        if task in self._scheduler.remove(
+            TtsScheduler.BACKGROUND, lambda pending: pending is task
+        ):
+            self._on_export_done("Export cancelled")
+
+    @QtCore.Slot()
+    def skip(self) -> None:
+        self._player.skip()
+
+    @QtCore.Slot()
+    def stop(self) -> None:
+        for task in self._scheduler.remove(TtsScheduler.INTERACTIVE):
+            self._utterances.pop(task.utterance_id, None)
+        for utterance_id in self._utterances:
+            self._player.cancel(utterance_id)
+        self._update_playback_state()
 
     @QtCore.Slot(str)
     def save(self, text: str) -> None:
@@ -405,65 +981,108 @@ class TtsBridge(QtCore.QObject):
         text = text.strip()
         if not text:
             return
-        spoken_text = self._normalize_text(text)
+        if self._defer_until_model(self.say, text):
+            return
+        engine, spoken_text, speaker = self._route(
+            text, self._speaker, self._find_category_id(self._current_category)
+        )
         if self._autosave:
             self._save_phrase(text)
         self._increment_phrase_count(text)
-        if not self.mutex.tryLock():
-            return
-        self._set_preparing(True)
-        self._set_playing(False)
         task = TtsTask(
-            self.tts_model, spoken_text, self._speaker, self._speed, self.mutex
+            engine,
+            spoken_text,
+            speaker,
+            self._speed,
+            self._player,
+            self._audio_cache,
+            self._streaming,
         )
-        task.ready.connect(self._on_task_ready)
-        task.finished.connect(self._on_task_finished)
-        self._current_task = task
-        self.pool.start(task)
+        self._utterances[task.utterance_id] = task.requested_at
+        self._scheduler.submit(task, TtsScheduler.INTERACTIVE)
+        self._update_playback_state()
 
     @QtCore.Slot(str)
     def saveAudio(self, text: str) -> None:
         text = text.strip()
         if not text:
             return
-        spoken_text = self._normalize_text(text)
+        if self._defer_until_model(self.saveAudio, text):
+            return
+        engine, spoken_text, speaker = self._route(
+            text, self._speaker, self._find_category_id(self._current_category)
+        )
         if self._autosave:
             self._save_phrase(text)
         self._increment_phrase_count(text)
-        if not self.mutex.tryLock():
-            return
         output_path = self._next_audio_path()
-        self._set_saving(True)
         task = TtsSaveTask(
-            self.tts_model,
+            engine,
             spoken_text,
-            self._speaker,
+            speaker,
             self._speed,
             output_path,
-            self.mutex,
+            FORMATS[self._audio_format],
+            self._audio_sample_rate,
+            self._audio_cache,
+            self._scheduler.interactive_idle,
+            self.engine_config.render_workers(),
+            self._stitch,
         )
         task.finished.connect(self._on_save_finished)
         task.failed.connect(self._on_save_failed)
-        self._current_save_task = task
-        self.pool.start(task)
+        self._pending_saves += 1
+        self._set_saving(True)
+        self._scheduler.submit(task, TtsScheduler.BACKGROUND, TtsScheduler.PRIORITY_SAVE)
 
-    @QtCore.Slot()
-    def _on_task_finished(self) -> None:
-        self._set_playing(False)
-        self._set_preparing(False)
-        self._current_task = None
+    def _update_playback_state(self) -> None:
+        current = self._player.current
+        playing = current in self._utterances
+        self._set_playing(playing)
+        self._set_preparing(any(uid != current for uid in self._utterances))
+
+    @QtCore.Slot(int, float)
+    def _on_utterance_started(self, utterance_id: int, played_at: float) -> None:
+        # От клика до выхода первого отсчёта из динамика, с задержкой устройства.
+        requested_at = self._utterances.get(utterance_id)
+        if requested_at is not None:
+            self._time_to_first_audio = (played_at - requested_at) * 1000
+            tracer.record("first_audio", self._time_to_first_audio)
+            self.timeToFirstAudioChanged.emit()
+        self._update_playback_state()
+
+    @QtCore.Slot(int)
+    def _on_utterance_finished(self, utterance_id: int) -> None:
+        self._utterances.pop(utterance_id, None)
+        self._update_playback_state()
+        self.cacheStatsChanged.emit()
 
     @QtCore.Slot()
-    def _on_task_ready(self) -> None:
-        self._set_preparing(False)
-        self._set_playing(True)
+    def _on_prewarm_finished(self) -> None:
+        self._prewarm_pending -= 1
+        if self._prewarm_pending == 0:
+            self.prewarmingChanged.emit()
+            self.cacheStatsChanged.emit()
+
+    @QtCore.Slot(int, int)
+    def _on_export_progress(self, completed: int, total: int) -> None:
+        self._export_progress = completed
+        self._export_total = total
+        self.exportProgressChanged.emit()
+
+    @QtCore.Slot(str)
+    def _on_export_done(self, _: str) -> None:
+        self._export_task = None
+        self.exportingChanged.emit()
+        self.cacheStatsChanged.emit()
 
     @QtCore.Slot(str)
     def _on_save_finished(self, _: str) -> None:
-        self._set_saving(False)
-        self._current_save_task = None
+        self._pending_saves -= 1
+        self._set_saving(self._pending_saves > 0)
+        self.cacheStatsChanged.emit()
 
     @QtCore.Slot(str)
     def _on_save_failed(self, _: str) -> None:
-        self._set_saving(False)
-        self._current_save_task = None
+        self._pending_saves -= 1
+        self._set_saving(self._pending_saves > 0)
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import struct
+import sys
+import time
+from urllib.parse import urlencode
+
+_WS_TEXT = 0x1
+_WS_BINARY = 0x2
+_WS_CLOSE = 0x8
+
+
+async def synthesize(host: str, port: int, text: str, **params) -> bytes:
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps({"text": text, **params}, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        (
+            "POST /synthesize HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+    status, _, payload = await _read_response(reader)
+    writer.close()
+    if status != 200:
+        raise RuntimeError(f"HTTP {status}: {payload.decode('utf-8', 'replace')}")
+    return payload
+
+
+async def fetch_stats(host: str, port: int) -> dict[str, int]:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /stats HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    _, _, payload = await _read_response(reader)
+    writer.close()
+    return json.loads(payload)
+
+
+async def stream(host: str, port: int, text: str, **params) -> tuple[int, bytes, float]:
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write(
+        (
+            "GET /stream HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode("latin-1")
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 101"):
+        raise RuntimeError(head.decode("latin-1").splitlines()[0])
+    started_at = time.perf_counter()
+    _ws_write(writer, _WS_TEXT, json.dumps({"text": text, **params}).encode("utf-8"))
+    await writer.drain()
+    sample_rate = 0
+    first_audio = 0.0
+    pcm = bytearray()
+    while True:
+        opcode, payload = await _ws_read(reader)
+        if opcode == _WS_BINARY:
+            if not pcm:
+                first_audio = time.perf_counter() - started_at
+            pcm += payload
+            continue
+        if opcode != _WS_TEXT:
+            break
+        message = json.loads(payload)
+        if message.get("event") == "start":
+            sample_rate = int(message["sample_rate"])
+        elif message.get("event") == "end":
+            break
+        elif message.get("event") == "error":
+            raise RuntimeError(message.get("message"))
+    _ws_write(writer, _WS_CLOSE, struct.pack("!H", 1000))
+    await writer.drain()
+    writer.close()
+    return sample_rate, bytes(pcm), first_audio
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, dict[str, str], bytes]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    return status, headers, await reader.readexactly(length)
+
+
+async def _ws_read(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    return first & 0x0F, await reader.readexactly(length)
+
+
+def _ws_write(writer: asyncio.StreamWriter, opcode: int, payload: bytes) -> None:
+    # Клиент обязан маскировать кадры.
+    mask = os.urandom(4)
+    masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    length = len(payload)
+    if length < 126:
+        head = struct.pack("!BB", 0x80 | opcode, 0x80 | length)
+    elif length < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, length)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, length)
+    writer.write(head + mask + masked)
+
+
+async def check(host: str, port: int, text: str, concurrency: int) -> int:
+    before = await fetch_stats(host, port)
+    started_at = time.perf_counter()
+    bodies = await asyncio.gather(
+        *(synthesize(host, port, text) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started_at
+    after = await fetch_stats(host, port)
+    failures = 0
+    if len(set(bodies)) != 1 or not bodies[0].startswith(b"RIFF"):
+        print("FAIL: concurrent responses differ or are not WAV")
+        failures += 1
+    inferences = after["inferences"] - before["inferences"]
+    coalesced = after["coalesced"] - before["coalesced"]
+    print(
+        f"synthesize x{concurrency}: {elapsed * 1000:.1f} ms, "
+        f"{inferences} inferences, {coalesced} coalesced"
+    )
+    if coalesced == 0 and inferences >= concurrency:
+        print("FAIL: identical concurrent requests were not coalesced")
+        failures += 1
+    sample_rate, pcm, first_audio = await stream(host, port, text)
+    print(
+        f"stream: {sample_rate} Hz, {len(pcm) // 2} samples, "
+        f"first audio after {first_audio * 1000:.1f} ms"
+    )
+    if not sample_rate or not pcm:
+        print("FAIL: stream returned no audio")
+        failures += 1
+    missing = await asyncio.gather(
+        _expect_status(host, port, "/missing", 404),
+        _expect_status(host, port, "/synthesize?" + urlencode({"text": ""}), 400),
+    )
+    failures += sum(1 for ok in missing if not ok)
+    print("OK" if failures == 0 else f"{failures} check(s) failed")
+    return 1 if failures else 0
+
+
+async def _expect_status(host: str, port: int, target: str, expected: int) -> bool:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status, _, _ = await _read_response(reader)
+    writer.close()
+    if status != expected:
+        print(f"FAIL: GET {target} returned {status}, expected {expected}")
+    return status == expected
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Проверка локального сервера синтеза (tts_server.py)."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("text", nargs="?", default="Проверка связи. Второе предложение!")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(check(args.host, args.port, args.text, args.concurrency))
+    except (ConnectionError, RuntimeError) as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
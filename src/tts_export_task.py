@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from audio_cache import AudioCache
+from audio_encoders import OutputFormat
+from audio_io import phrase_file_name
+from stitcher import StitchConfig
+from synthesis import SynthesisEngine
+
+
+class TtsExportTask(QtCore.QObject, QtCore.QRunnable):
+    progress = QtCore.Signal(int, int)
+    finished = QtCore.Signal(str)
+    failed = QtCore.Signal(str)
+    done = QtCore.Signal()
+
+    def __init__(
+        self,
+        route: Callable[[str], tuple[SynthesisEngine, str, str]],
+        load_texts: Callable[[], list[str]],
+        speed: float,
+        output_dir: Path,
+        output_format: OutputFormat,
+        sample_rate: int,
+        workers: int,
+        cache: AudioCache | None = None,
+        gate: threading.Event | None = None,
+        stitch: StitchConfig | None = None,
+    ) -> None:
+        QtCore.QObject.__init__(self)
+        QtCore.QRunnable.__init__(self)
+        # Текст -> (движок, нормализованный текст, голос): фразы категории
+        # могут уйти разным моделям.
+        self.route = route
+        self.load_texts = load_texts
+        self.speed = speed
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.sample_rate = sample_rate
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.gate = gate
+        self.stitch = stitch
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def run(self) -> None:
+        try:
+            # Чтение из базы и нормализация тоже здесь, а не в GUI-потоке.
+            phrases = [(text, *self.route(text)) for text in self.load_texts()]
+            total = len(phrases)
+            completed = 0
+            self.progress.emit(completed, total)
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(self._export_one, *phrase)
+                    for phrase in phrases
+                ]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception:
+                        self._cancelled.set()
+                        raise
+                    completed += 1
+                    self.progress.emit(completed, total)
+            if self._cancelled.is_set():
+                self.failed.emit("Export cancelled")
+            else:
+                self.finished.emit(str(self.output_dir))
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        finally:
+            self.done.emit()
+
+    def _export_one(
+        self, text: str, engine: SynthesisEngine, spoken_text: str, speaker: str
+    ) -> None:
+        if self._cancelled.is_set():
+            return
+        suffix = self.output_format.file_suffix(self.sample_rate)
+        path = self.output_dir / phrase_file_name(text, speaker, self.speed, suffix)
+        if path.exists():
+            return
+        tmp_path = path.with_suffix(".part")
+        source_rate = engine.sample_rate(self.speed)
+        try:
+            with self.output_format.open(tmp_path, source_rate, self.sample_rate) as writer:
+                # Отмена прерывает и текущую фразу — между её кусками.
+                engine.synthesize_into(
+                    writer.write,
+                    spoken_text,
+                    speaker,
+                    self.speed,
+                    self.cache,
+                    self.gate,
+                    stitch=self.stitch,
+                    cancelled=self._cancelled,
+                )
+            if not self._cancelled.is_set():
+                os.replace(tmp_path, path)
+        finally:
+            # Недописанный файл не остаётся ни после ошибки, ни после отмены.
+            tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+
+from PySide6 import QtCore
+
+from audio_cache import AudioCache
+from synthesis import SynthesisEngine
+
+
+class TtsPrewarmTask(QtCore.QObject, QtCore.QRunnable):
+    finished = QtCore.Signal()
+    failed = QtCore.Signal(str)
+    done = QtCore.Signal()
+
+    def __init__(
+        self,
+        engine: SynthesisEngine,
+        text: str,
+        speaker: str,
+        speed: float,
+        cache: AudioCache,
+        cancelled: threading.Event,
+        gate: threading.Event | None = None,
+    ) -> None:
+        QtCore.QObject.__init__(self)
+        QtCore.QRunnable.__init__(self)
+        self.engine = engine
+        self.text = text
+        self.speaker = speaker
+        self.speed = speed
+        self.cache = cache
+        self.cancelled = cancelled
+        self.gate = gate
+
+    def run(self) -> None:
+        try:
+            if self.cancelled.is_set():
+                return
+            if self.cache.contains(self.engine.cache_key(self.text, self.speaker, self.speed)):
+                return
+            self.engine.synthesize_chunked(
+                self.text,
+                self.speaker,
+                self.speed,
+                self.cache,
+                self.gate,
+            )
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        finally:
+            self.finished.emit()
+            self.done.emit()
@@ -1,71 +1,70 @@
-import inspect
-import wave
+from __future__ import annotations
+
+import threading
 from pathlib import Path
 
-import numpy as np
-import torch
 from PySide6 import QtCore
 
-SAMPLE_RATE = 48000  # 24000/48000 зависит от модели, 48000 обычно ок
+from audio_cache import AudioCache
+from audio_encoders import OutputFormat
+from stitcher import StitchConfig
+from synthesis import SynthesisEngine
 
 
 class TtsSaveTask(QtCore.QObject, QtCore.QRunnable):
     finished = QtCore.Signal(str)
     failed = QtCore.Signal(str)
+    done = QtCore.Signal()
 
     def __init__(
         self,
-        tts_model: torch.nn.Module,
+        engine: SynthesisEngine,
         text: str,
         speaker: str,
         speed: float,
         output_path: Path,
-        mutex: QtCore.QMutex,
+        output_format: OutputFormat,
+        sample_rate: int = 0,
+        cache: AudioCache | None = None,
+        gate: threading.Event | None = None,
+        workers: int = 1,
+        stitch: StitchConfig | None = None,
     ) -> None:
         QtCore.QObject.__init__(self)
         QtCore.QRunnable.__init__(self)
-        self.tts_model = tts_model
+        self.engine = engine
         self.text = text
         self.speaker = speaker
         self.speed = speed
         self.output_path = output_path
-        self.mutex = mutex
+        self.output_format = output_format
+        self.sample_rate = sample_rate
+        self.cache = cache
+        self.gate = gate
+        # Куски длинного текста рендерятся параллельно и пишутся по порядку;
+        # текст из одного куска синтезируется в этом же потоке.
+        self.workers = max(1, workers)
+        self.stitch = stitch
 
     def run(self) -> None:
         try:
-            audio, sample_rate = self._synthesize()
-            self._write_wav(audio, sample_rate)
+            self._write_audio()
             self.finished.emit(str(self.output_path))
         except Exception as exc:
             self.failed.emit(str(exc))
         finally:
-            self.mutex.unlock()
-
-    def _synthesize(self) -> tuple[np.ndarray, int]:
-        apply_tts = self.tts_model.apply_tts
-        kwargs = {
-            "text": self.text,
-            "speaker": self.speaker,
-            "sample_rate": SAMPLE_RATE,
-        }
-        if "speed" in inspect.signature(apply_tts).parameters:
-            kwargs["speed"] = self.speed
-        audio = apply_tts(**kwargs)
-        audio = audio.numpy().astype(np.float32)
-        if audio.size:
-            tail_silence = np.zeros(int(SAMPLE_RATE * 0.05), dtype=np.float32)
-            audio = np.concatenate([audio, tail_silence])
-        sample_rate = SAMPLE_RATE
-        if "speed" not in kwargs and self.speed != 1.0:
-            sample_rate = int(SAMPLE_RATE * self.speed)
-        return audio, sample_rate
+            self.done.emit()
 
-    def _write_wav(self, audio: np.ndarray, sample_rate: int) -> None:
-        audio = np.clip(audio, -1.0, 1.0)
-        pcm = (audio * 32767).astype(np.int16)
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        with wave.open(str(self.output_path), "wb") as wave_file:
-            wave_file.setnchannels(1)
-            wave_file.setsampwidth(2)
-            wave_file.setframerate(sample_rate)
-            wave_file.writeframes(pcm.tobytes())
+    def _write_audio(self) -> None:
+        source_rate = self.engine.sample_rate(self.speed)
+        with self.output_format.open(self.output_path, source_rate, self.sample_rate) as writer:
+            self.engine.synthesize_into(
+                writer.write,
+                self.text,
+                self.speaker,
+                self.speed,
+                self.cache,
+                self.gate,
+                self.workers,
+                self.stitch,
+            )
@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import threading
+import time
+
+from PySide6 import QtCore
+
+
+class TtsScheduler(QtCore.QObject):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+    PRIORITY_SAVE = 0
+    PRIORITY_PREWARM = 1
+
+    queueChanged = QtCore.Signal()
+
+    _WAIT_SMOOTHING = 0.2
+
+    def __init__(self, pool: QtCore.QThreadPool) -> None:
+        super().__init__()
+        self.pool = pool
+        self.pool.setMaxThreadCount(max(self.pool.maxThreadCount(), 2))
+        # Закрыт, пока есть интерактивная работа: фоновые задачи ждут его между кусками.
+        self.interactive_idle = threading.Event()
+        self.interactive_idle.set()
+        self._pending: dict[int, list[tuple[int, int, float, QtCore.QRunnable]]] = {
+            self.INTERACTIVE: [],
+            self.BACKGROUND: [],
+        }
+        self._running: dict[int, QtCore.QRunnable | None] = {
+            self.INTERACTIVE: None,
+            self.BACKGROUND: None,
+        }
+        self._seq = itertools.count()
+        self._average_wait_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+    @property
+    def average_wait_ms(self) -> float:
+        return self._average_wait_ms
+
+    def submit(self, task: QtCore.QRunnable, lane: int, priority: int = 0) -> None:
+        task.setAutoDelete(False)
+        if lane == self.INTERACTIVE:
+            task.done.connect(self._on_interactive_done)
+            self.interactive_idle.clear()
+        else:
+            task.done.connect(self._on_background_done)
+        heapq.heappush(
+            self._pending[lane], (priority, next(self._seq), time.perf_counter(), task)
+        )
+        self._dispatch(lane)
+        self.queueChanged.emit()
+
+    def remove(self, lane: int, predicate=None) -> list[QtCore.QRunnable]:
+        kept: list[tuple[int, int, float, QtCore.QRunnable]] = []
+        removed: list[QtCore.QRunnable] = []
+        for entry in self._pending[lane]:
+            if predicate is None or predicate(entry[3]):
+                removed.append(entry[3])
+            else:
+                kept.append(entry)
+        heapq.heapify(kept)
+        self._pending[lane] = kept
+        if removed:
+            self._update_gate()
+            self.queueChanged.emit()
+        return removed
+
+    def _dispatch(self, lane: int) -> None:
+        if self._running[lane] is not None or not self._pending[lane]:
+            return
+        _, _, queued_at, task = heapq.heappop(self._pending[lane])
+        wait_ms = (time.perf_counter() - queued_at) * 1000
+        self._average_wait_ms += self._WAIT_SMOOTHING * (wait_ms - self._average_wait_ms)
+        self._running[lane] = task
+        self.pool.start(task)
+
+    def _finish(self, lane: int) -> None:
+        self._running[lane] = None
+        self._dispatch(lane)
+        self._update_gate()
+        self.queueChanged.emit()
+
+    def _update_gate(self) -> None:
+        busy = self._running[self.INTERACTIVE] is not None or bool(
+            self._pending[self.INTERACTIVE]
+        )
+        if busy:
+            self.interactive_idle.clear()
+        else:
+            self.interactive_idle.set()
+
+    @QtCore.Slot()
+    def _on_interactive_done(self) -> None:
+        self._finish(self.INTERACTIVE)
+
+    @QtCore.Slot()
+    def _on_background_done(self) -> None:
+        self._finish(self.BACKGROUND)
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from audio_cache import AudioCache
+from audio_io import encode_wav, to_pcm16
+from model_loader import load_model
+from synthesis import SynthesisEngine
+from text_normalizer import TextNormalizer
+from text_splitter import split_chunks
+
+if TYPE_CHECKING:
+    import torch
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_WS_TEXT = 0x1
+_WS_BINARY = 0x2
+_WS_CLOSE = 0x8
+_WS_PING = 0x9
+_WS_PONG = 0xA
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, reason: str) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+class TtsServer:
+    MAX_BODY = 1024 * 1024
+
+    def __init__(
+        self,
+        tts_model: torch.nn.Module,
+        cache: AudioCache | None = None,
+        default_speaker: str = "aidar",
+    ) -> None:
+        self.tts_model = tts_model
+        self._engine = SynthesisEngine(tts_model)
+        self.cache = cache
+        self.default_speaker = default_speaker
+        self._normalizer = TextNormalizer()
+        # Одна модель — один поток инференса.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = {"requests": 0, "inferences": 0, "coalesced": 0}
+
+    async def render(self, text: str, speaker: str, speed: float) -> tuple[np.ndarray, int]:
+        key = self._engine.cache_key(text, speaker, speed)
+        future = self._inflight.get(key)
+        if future is not None:
+            # Такой же запрос уже считается: ждём его результат.
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor,
+            self._engine.synthesize,
+            text,
+            speaker,
+            speed,
+            self.cache,
+        )
+        self._inflight[key] = future
+        self._stats["inferences"] += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, target, headers = await self._read_head(reader)
+            self._stats["requests"] += 1
+            url = urlsplit(target)
+            if url.path == "/stream" and headers.get("upgrade", "").lower() == "websocket":
+                await self._handle_stream(reader, writer, headers)
+                return
+            if url.path == "/synthesize" and method in ("GET", "POST"):
+                request = await self._read_request(reader, method, url.query, headers)
+                body = await self._synthesize_wav(request)
+                await self._respond(writer, 200, "OK", body, "audio/wav")
+            elif url.path == "/stats" and method == "GET":
+                body = json.dumps(self.stats()).encode("utf-8")
+                await self._respond(writer, 200, "OK", body, "application/json")
+            else:
+                raise HttpError(404, "Not Found")
+        except HttpError as exc:
+            await self._respond(writer, exc.status, exc.reason, exc.reason.encode(), "text/plain")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as exc:
+            message = f"Internal Server Error: {exc}"
+            try:
+                await self._respond(writer, 500, "Internal Server Error", message.encode(), "text/plain")
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    def stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["inflight"] = len(self._inflight)
+        if self.cache is not None:
+            stats.update({f"cache_{k}": v for k, v in self.cache.stats().items()})
+        return stats
+
+    def _parse_request(self, payload: dict) -> tuple[str, str, float]:
+        text = str(payload.get("text", "")).strip()
+        if not text:
+            raise HttpError(400, "Bad Request: empty text")
+        speaker = str(payload.get("speaker") or self.default_speaker)
+        try:
+            speed = float(payload.get("speed", 1.0))
+        except (TypeError, ValueError):
+            raise HttpError(400, "Bad Request: invalid speed") from None
+        if speed <= 0:
+            raise HttpError(400, "Bad Request: invalid speed")
+        return self._normalizer.normalize(text), speaker, speed
+
+    async def _read_head(self, reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HttpError(431, "Request Header Fields Too Large") from None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Bad Request") from None
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        return method, target, headers
+
+    async def _read_request(
+        self,
+        reader: asyncio.StreamReader,
+        method: str,
+        query: str,
+        headers: dict[str, str],
+    ) -> tuple[str, str, float]:
+        if method == "GET":
+            params = {key: values[-1] for key, values in parse_qs(query).items()}
+            return self._parse_request(params)
+        length = int(headers.get("content-length", "0") or 0)
+        if length > self.MAX_BODY:
+            raise HttpError(413, "Payload Too Large")
+        body = await reader.readexactly(length)
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Bad Request: invalid JSON") from None
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Bad Request: expected object")
+        return self._parse_request(payload)
+
+    async def _synthesize_wav(self, request: tuple[str, str, float]) -> bytes:
+        text, speaker, speed = request
+        parts: list[np.ndarray] = []
+        sample_rate = 0
+        for chunk in split_chunks(text) or [text]:
+            audio, sample_rate = await self.render(chunk, speaker, speed)
+            parts.append(audio)
+        return encode_wav(np.concatenate(parts), sample_rate)
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        reason: str,
+        body: bytes,
+        content_type: str,
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _handle_stream(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        headers: dict[str, str],
+    ) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key:
+            raise HttpError(400, "Bad Request: missing Sec-WebSocket-Key")
+        accept = base64.b64encode(
+            hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()
+        ).decode("ascii")
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+        while True:
+            opcode, payload = await _ws_read(reader)
+            if opcode == _WS_CLOSE:
+                _ws_write(writer, _WS_CLOSE, payload[:2])
+                await writer.drain()
+                return
+            if opcode == _WS_PING:
+                _ws_write(writer, _WS_PONG, payload)
+                continue
+            if opcode != _WS_TEXT:
+                continue
+            try:
+                text, speaker, speed = self._parse_request(json.loads(payload))
+            except (HttpError, ValueError, AttributeError) as exc:
+                _ws_send_json(writer, {"event": "error", "message": str(exc)})
+                await writer.drain()
+                continue
+            started = False
+            for chunk in split_chunks(text) or [text]:
+                audio, sample_rate = await self.render(chunk, speaker, speed)
+                if not started:
+                    _ws_send_json(writer, {"event": "start", "sample_rate": sample_rate})
+                    started = True
+                _ws_write(writer, _WS_BINARY, to_pcm16(audio))
+                await writer.drain()
+            _ws_send_json(writer, {"event": "end"})
+            await writer.drain()
+
+
+async def _ws_read(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    message = bytearray()
+    message_opcode = 0
+    while True:
+        first, second = await reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await reader.readexactly(8))
+        if length > TtsServer.MAX_BODY:
+            raise ConnectionError("websocket frame too large")
+        mask = await reader.readexactly(4) if second & 0x80 else b""
+        payload = await reader.readexactly(length)
+        if mask:
+            data = np.frombuffer(payload, dtype=np.uint8)
+            key = np.resize(np.frombuffer(mask, dtype=np.uint8), len(data))
+            payload = (data ^ key).tobytes()
+        if opcode >= 0x8:
+            # Управляющие кадры могут приходить между фрагментами.
+            return opcode, payload
+        if opcode:
+            message_opcode = opcode
+        message += payload
+        if first & 0x80:
+            return message_opcode, bytes(message)
+
+
+def _ws_write(writer: asyncio.StreamWriter, opcode: int, payload: bytes) -> None:
+    length = len(payload)
+    if length < 126:
+        head = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    writer.write(head + payload)
+
+
+def _ws_send_json(writer: asyncio.StreamWriter, message: dict) -> None:
+    _ws_write(writer, _WS_TEXT, json.dumps(message, ensure_ascii=False).encode("utf-8"))
+
+
+async def serve(server: TtsServer, host: str, port: int) -> None:
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"listening on http://{host}:{port}", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Локальный сервер синтеза речи.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speaker", default="aidar")
+    parser.add_argument("--cache-dir", type=Path)
+    args = parser.parse_args(argv)
+    cache = AudioCache(args.cache_dir) if args.cache_dir else None
+    server = TtsServer(load_model(), cache, args.speaker)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
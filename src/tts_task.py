@@ -1,54 +1,77 @@
-import inspect
+from __future__ import annotations
+
+import time
 
 import numpy as np
-import sounddevice as sd
-import torch
 from PySide6 import QtCore
-SAMPLE_RATE = 48000  # 24000/48000 зависит от модели, 48000 обычно ок
+
+from audio_cache import AudioCache
+from audio_player import AudioPlayer
+from synthesis import SynthesisEngine
+from text_splitter import split_chunks
+from tracing import tracer
 
 
 class TtsTask(QtCore.QObject, QtCore.QRunnable):
-    ready = QtCore.Signal()
-    finished = QtCore.Signal()
+    done = QtCore.Signal()
 
     def __init__(
         self,
-        tts_model: torch.nn.Module,
+        engine: SynthesisEngine,
         text: str,
         speaker: str,
         speed: float,
-        mutex: QtCore.QMutex,
+        player: AudioPlayer,
+        cache: AudioCache | None = None,
+        streaming: bool = False,
     ) -> None:
         QtCore.QObject.__init__(self)
         QtCore.QRunnable.__init__(self)
-        self.tts_model = tts_model
+        self.engine = engine
         self.text = text
         self.speaker = speaker
         self.speed = speed
-        self.mutex = mutex
+        self.player = player
+        self.cache = cache
+        self.streaming = streaming
+        self.utterance_id = player.begin()
+        self.requested_at = time.perf_counter()
+
+    def cancel(self) -> None:
+        self.player.cancel(self.utterance_id)
 
     def run(self) -> None:
+        # Только синтез: воспроизведение идёт в потоке AudioPlayer,
+        # поэтому следующая фраза рендерится, пока играет текущая.
+        tracer.record("queue_wait", (time.perf_counter() - self.requested_at) * 1000)
         try:
-            apply_tts = self.tts_model.apply_tts
-            kwargs = {
-                "text": self.text,
-                "speaker": self.speaker,
-                "sample_rate": SAMPLE_RATE,
-            }
-            if "speed" in inspect.signature(apply_tts).parameters:
-                kwargs["speed"] = self.speed
-            audio = apply_tts(**kwargs)
-            audio = audio.numpy().astype(np.float32)
-            # Appended a short silence tail to generated TTS audio to reduce clipped final letters.
-            if audio.size:
-                tail_silence = np.zeros(int(SAMPLE_RATE * 0.05), dtype=np.float32)
-                audio = np.concatenate([audio, tail_silence])
-            sample_rate = SAMPLE_RATE
-            if "speed" not in kwargs and self.speed != 1.0:
-                sample_rate = int(SAMPLE_RATE * self.speed)
-            self.ready.emit()
-            sd.play(audio, sample_rate)
-            sd.wait()
+            if self.player.is_cancelled(self.utterance_id):
+                return
+            chunks = split_chunks(self.text) if self.streaming else []
+            if len(chunks) > 1 and not self._is_cached():
+                self._render_streaming(chunks)
+            else:
+                audio, sample_rate = self.engine.synthesize(
+                    self.text, self.speaker, self.speed, self.cache
+                )
+                self.player.feed(self.utterance_id, audio, sample_rate)
         finally:
-            self.mutex.unlock()
-            self.finished.emit()
+            self.player.end(self.utterance_id)
+            self.done.emit()
+
+    def _is_cached(self) -> bool:
+        if self.cache is None:
+            return False
+        return self.cache.contains(self.engine.cache_key(self.text, self.speaker, self.speed))
+
+    def _render_streaming(self, chunks: list[str]) -> None:
+        parts: list[np.ndarray] = []
+        sample_rate = 0
+        for chunk in chunks:
+            audio, sample_rate = self.engine.synthesize(chunk, self.speaker, self.speed)
+            parts.append(audio)
+            if not self.player.feed(self.utterance_id, audio, sample_rate):
+                return
+        if self.cache is not None:
+            key = self.engine.cache_key(self.text, self.speaker, self.speed)
+            self.cache.put(key, np.concatenate(parts), sample_rate)